@@ -0,0 +1,69 @@
+"""
+원본/교정 텍스트 오프셋 정렬
+교정된 텍스트(checked)의 위치를 원본 텍스트(original)의 위치로 바꾸는 대응표를
+두 텍스트를 한 번만 순차 비교하여 만들고, 이후에는 위치 하나를 O(1)로 조회합니다.
+오류마다 텍스트 앞부분부터 다시 비교하던 방식(오류 수 × 텍스트 길이)을 대체합니다.
+"""
+
+
+class OffsetMap:
+    """
+    교정된 텍스트 위치 → 원본 텍스트 위치 대응표
+
+    한 글자씩 비교하는 규칙은 기존 순차 비교와 같습니다.
+    - 같은 글자: 양쪽 모두 전진
+    - 교정 텍스트에만 공백: 교정 텍스트만 전진 (공백 추가)
+    - 원본에만 공백: 원본만 전진 (공백 제거)
+    - 서로 다른 공백 문자: skip_original_newlines가 True이고 원본 글자가 줄바꿈이면 원본만,
+      아니면 양쪽 모두 전진
+    - 그 밖의 다른 글자: 양쪽 모두 전진 (교정된 글자)
+    """
+
+    def __init__(self, original: str, checked: str, skip_original_newlines: bool = True):
+        self.original = original
+        self.checked = checked
+        self._to_original = self._build(original, checked, skip_original_newlines)
+
+    @staticmethod
+    def _build(original: str, checked: str, skip_original_newlines: bool) -> list:
+        original_len = len(original)
+        checked_len = len(checked)
+        to_original = [0] * (checked_len + 1)
+        orig_idx = 0
+        check_idx = 0
+
+        while check_idx < checked_len and orig_idx < original_len:
+            checked_char = checked[check_idx]
+            original_char = original[orig_idx]
+
+            if checked_char == original_char:
+                orig_idx += 1
+                check_idx += 1
+            elif checked_char.isspace() and not original_char.isspace():
+                check_idx += 1
+            elif original_char.isspace() and not checked_char.isspace():
+                orig_idx += 1
+                continue
+            elif skip_original_newlines and (original_char == '\n' or original_char == '\r'):
+                orig_idx += 1
+                continue
+            else:
+                orig_idx += 1
+                check_idx += 1
+
+            # 교정 텍스트 위치에 처음 도달했을 때의 원본 위치를 기록
+            to_original[check_idx] = orig_idx
+
+        # 원본을 모두 소비한 뒤의 위치는 원본 끝에 대응
+        for idx in range(check_idx + 1, checked_len + 1):
+            to_original[idx] = orig_idx
+        return to_original
+
+    def to_original(self, checked_pos: int) -> int:
+        """교정된 텍스트의 위치에 대응하는 원본 텍스트 위치"""
+        if checked_pos <= 0:
+            return 0
+        if checked_pos >= len(self._to_original):
+            return self._to_original[-1]
+        return self._to_original[checked_pos]
+
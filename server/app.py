@@ -4,6 +4,12 @@
 """
 import sys
 import os
+import re
+import json
+import time
+import contextlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 
 # py-hanspell-master2 폴더를 Python 경로에 추가
@@ -14,115 +20,198 @@ py_hanspell_path = project_root / 'py-hanspell-master2'
 
 if py_hanspell_path.exists():
     sys.path.insert(0, str(py_hanspell_path))
-    print(f"✅ py-hanspell-master2 폴더를 경로에 추가했습니다: {py_hanspell_path}")
+    _hanspell_source = f'로컬 py-hanspell-master2 폴더 ({py_hanspell_path})'
 else:
-    print(f"⚠️  py-hanspell-master2 폴더를 찾을 수 없습니다: {py_hanspell_path}")
-    print("   설치된 py-hanspell 패키지를 사용합니다.")
+    _hanspell_source = '설치된 py-hanspell 패키지'
 
-from flask import Flask, request, jsonify
+import requests
+from flask import Blueprint, Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 
-# 로컬 py-hanspell-master2 폴더에서 직접 import
+from alignment import OffsetMap
+from candidates import find_original
+from chunking import pack_chunks, split_sentences, merge_results
+from circuit_breaker import CLOSED, HALF_OPEN, CircuitOpenError, upstream_breaker
+from engines import Engine, EngineRegistry, UnknownEngineError, local_engine
+from http_client import UPSTREAM_TIMEOUT, get_session, get_connection_stats
+from local_rules import check_locally, find_errors
+from log import debug_sampled, get_logger, get_logging_stats
+from metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    CHECKS,
+    IN_FLIGHT,
+    PARSE_LATENCY,
+    REQUEST_LATENCY,
+    REQUESTS,
+    UPSTREAM_ERRORS,
+    UPSTREAM_LATENCY,
+    UPSTREAM_QUEUE_LATENCY,
+    registry as metrics_registry,
+)
+from passport import passport_key_manager
+from profiling import is_admin, profile_store, profiling, propagate as propagate_profile, should_profile
+from result_cache import ResultCache
+from result_store import result_store
+from results import SpellResult
+from speller_html import parse_speller_html
+from timing import add_stage, propagate as propagate_timings, recording as record_timings, stage
+from upstream_scheduler import UpstreamQueueFull, upstream_coalescer, upstream_rate_limiter
+from word_index import WordIndex
+
+logger = get_logger('app')
+
+# py-hanspell 모듈과 상수는 시작 시 한 번만 가져옴 (요청 처리 중에는 다시 import하지 않음)
 # py-hanspell의 올바른 사용법: from hanspell import spell_checker
 try:
     from hanspell import spell_checker
+    from hanspell.constants import CheckResult, base_url as HANSPELL_BASE_URL
+    from hanspell.response import Checked
     hanspell_check = spell_checker.check
-    print("✅ 로컬 py-hanspell-master2 파일을 사용합니다.")
-    print(f"   spell_checker 모듈: {spell_checker}")
-    print(f"   check 함수: {hanspell_check}")
+    logger.info("py-hanspell 사용: %s", _hanspell_source)
 except ImportError as e:
-    # 폴백: 설치된 패키지 사용
-    try:
-        from hanspell import spell_checker
-        hanspell_check = spell_checker.check
-        print("⚠️  설치된 py-hanspell 패키지를 사용합니다.")
-    except ImportError:
-        print(f"❌ py-hanspell을 찾을 수 없습니다: {e}")
-        hanspell_check = None
+    logger.warning("py-hanspell을 찾을 수 없어 내장 상수를 사용합니다: %s", e)
+    hanspell_check = None
+    
+    # 폴백: py-hanspell과 같은 값으로 직접 정의
+    class CheckResult:
+        PASSED = 0
+        WRONG_SPELLING = 1
+        WRONG_SPACING = 2
+        AMBIGUOUS = 3
+        STATISTICAL_CORRECTION = 4
+    
+    Checked = namedtuple('Checked', ['result', 'original', 'checked', 'errors', 'words', 'time'],
+                         defaults=(False, '', '', 0, None, 0.0))
+    HANSPELL_BASE_URL = 'https://m.search.naver.com/p/csearch/ocontent/util/SpellerProxy'
+
+# 오류 유형 매핑 (HTML 태그 class 기준 / CheckResult 값 기준)
+ERROR_TYPE_BY_CLASS = {
+    'red_text': "맞춤법",
+    'green_text': "띄어쓰기",
+    'violet_text': "표준어",
+    'blue_text': "통계적교정"
+}
+ERROR_TYPE_BY_RESULT = {
+    CheckResult.WRONG_SPELLING: "맞춤법",
+    CheckResult.WRONG_SPACING: "띄어쓰기",
+    CheckResult.AMBIGUOUS: "표준어",
+    CheckResult.STATISTICAL_CORRECTION: "통계적교정"
+}
+CHECK_RESULT_BY_CLASS = {
+    'red_text': CheckResult.WRONG_SPELLING,
+    'green_text': CheckResult.WRONG_SPACING,
+    'violet_text': CheckResult.AMBIGUOUS,
+    'blue_text': CheckResult.STATISTICAL_CORRECTION
+}
+
+# 자주 쓰는 정규식은 미리 컴파일
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_WORD_PATTERN = re.compile(r'\S+')
+
+# 모든 라우트는 블루프린트에 등록하고 create_app()에서 앱에 연결
+api = Blueprint('api', __name__)
+
+# 네이버 맞춤법 검사기가 한 번에 받을 수 있는 최대 글자 수
+UPSTREAM_MAX_LENGTH = 500
+# 긴 텍스트 모드에서 허용하는 최대 글자 수 (청크로 나누어 검사)
+MAX_TEXT_LENGTH = int(os.environ.get('SPELL_CHECK_MAX_TEXT_LENGTH', '10000'))
+# 청크 병렬 검사용 워커 풀 (모든 요청이 공유하여 동시 업스트림 호출 수를 제한)
+_chunk_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('SPELL_CHECK_CHUNK_WORKERS', '16')),
+    thread_name_prefix='spell-chunk'
+)
+
+# 배치 검사: 한 요청당 최대 항목 수와 동시에 검사할 최대 개수
+BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', '1000'))
+BATCH_MAX_CONCURRENCY = int(os.environ.get('BATCH_MAX_CONCURRENCY', '8'))
+# 배치 항목 검사용 워커 풀 (항목 내부의 청크 검사는 _chunk_executor를 사용하므로 분리)
+_batch_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('BATCH_WORKERS', '32')),
+    thread_name_prefix='spell-batch'
+)
+
+# 오류 추출 로직이 바뀌면 올려서 이전에 캐시된 결과를 무효화
+PARSER_VERSION = 3
+# 검사 결과 캐시 (동일한 텍스트를 다시 검사할 때 네이버 호출 생략)
+RESULT_CACHE_ENABLED = os.environ.get('RESULT_CACHE_ENABLED', '1') == '1'
+# 메모리에 없는 결과는 디스크 저장소(RESULT_STORE_PATH를 지정한 경우)에서 찾음 (워커/재시작 사이에 공유)
+_store = result_store if result_store.enabled else None
+_result_cache = ResultCache(
+    max_entries=int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', '10000')),
+    ttl=float(os.environ.get('RESULT_CACHE_TTL', '3600')),
+    store=_store
+)
+# 문장 단위 캐시 (증분 검사에서 바뀌지 않은 문장은 네이버 호출 생략)
+_segment_cache = ResultCache(
+    max_entries=int(os.environ.get('SEGMENT_CACHE_MAX_ENTRIES', '50000')),
+    ttl=float(os.environ.get('RESULT_CACHE_TTL', '3600')),
+    store=_store
+)
+
+# 캐시, passport key, 업스트림 연결, 로그 큐 현황은 /metrics 조회 시점에 각 객체의 집계 값을 읽음
+_CACHES = {'result': _result_cache, 'segment': _segment_cache}
+if _store is not None:
+    _CACHES['store'] = _store
 
-app = Flask(__name__)
-CORS(app)  # CORS 허용
 
-# passport key를 메모리에 저장 (실제 운영 환경에서는 Redis 등 사용 권장)
-_passport_key_cache = None
+def _hit_ratio(cache) -> float:
+    """메모리에 집계한 적중/미적중 수로 계산한 적중률 (저장소 현황을 조회하지 않음)"""
+    lookups = cache.hits + cache.misses
+    return round(cache.hits / lookups, 4) if lookups else 0.0
 
-@app.route('/passportKey', methods=['GET'])
+
+metrics_registry.callback('spellcheck_cache_hits_total', '캐시 적중 수', 'counter',
+                          lambda: {(name,): cache.hits for name, cache in _CACHES.items()}, ('cache',))
+metrics_registry.callback('spellcheck_cache_misses_total', '캐시 미적중 수', 'counter',
+                          lambda: {(name,): cache.misses for name, cache in _CACHES.items()}, ('cache',))
+metrics_registry.callback('spellcheck_cache_hit_ratio', '캐시 적중률 (프로세스 시작 후 누적)', 'gauge',
+                          lambda: {(name,): _hit_ratio(cache) for name, cache in _CACHES.items()}, ('cache',))
+metrics_registry.callback('spellcheck_cache_entries', '캐시 항목 수', 'gauge',
+                          lambda: {(name,): cache.stats()['size'] for name, cache in _CACHES.items()}, ('cache',))
+metrics_registry.callback('spellcheck_passport_refresh_total', 'passport key 발급 시도 수', 'counter',
+                          lambda: passport_key_manager.refreshes)
+metrics_registry.callback('spellcheck_passport_refresh_failures_total', 'passport key 발급 실패 수', 'counter',
+                          lambda: passport_key_manager.refresh_failures)
+metrics_registry.callback('spellcheck_upstream_requests_total', '업스트림 HTTP 요청 수 (passport key 발급 포함)', 'counter',
+                          lambda: get_connection_stats()['requests'])
+metrics_registry.callback('spellcheck_upstream_new_connections_total', '새로 연 업스트림 연결 수', 'counter',
+                          lambda: get_connection_stats()['newConnections'])
+metrics_registry.callback('spellcheck_upstream_circuit_state', '업스트림 서킷 상태 (0: closed, 1: half-open, 2: open)', 'gauge',
+                          lambda: {CLOSED: 0, HALF_OPEN: 1}.get(upstream_breaker.state, 2))
+metrics_registry.callback('spellcheck_upstream_circuit_opened_total', '업스트림 서킷이 열린 횟수', 'counter',
+                          lambda: upstream_breaker.opened)
+metrics_registry.callback('spellcheck_upstream_circuit_rejected_total', '서킷이 열려 있어 바로 거부한 업스트림 호출 수', 'counter',
+                          lambda: upstream_breaker.rejected)
+metrics_registry.callback('spellcheck_upstream_queue_waiting', '속도 제한으로 대기 중인 네이버 호출 수', 'gauge',
+                          lambda: upstream_rate_limiter.waiting)
+metrics_registry.callback('spellcheck_upstream_queue_rejected_total', '대기열이 가득 차서 거부한 네이버 호출 수', 'counter',
+                          lambda: upstream_rate_limiter.rejected)
+metrics_registry.callback('spellcheck_upstream_coalesced_total', '진행 중인 같은 검사의 결과를 함께 사용한 요청 수', 'counter',
+                          lambda: upstream_coalescer.coalesced)
+metrics_registry.callback('spellcheck_log_records_dropped_total', '로그 큐가 가득 차서 버린 로그 레코드 수', 'counter',
+                          lambda: get_logging_stats()['dropped'])
+
+@api.route('/passportKey', methods=['GET'])
 def get_passport_key():
     """
     네이버 맞춤법 검사기 passport key 발급 엔드포인트
-    제공된 코드 방식: 네이버 검색 페이지에서 맞춤법검사기 검색 후 passport key 추출
+    네이버 검색 페이지에서 맞춤법검사기 검색 후 passport key 추출 (passport.py 참고)
     """
-    global _passport_key_cache
-    
     try:
-        import requests
-        import re
-        from urllib.parse import unquote
-        
-        # 네이버 검색 페이지에서 맞춤법검사기 검색하여 passport key 획득
-        # 제공된 코드 방식 사용
-        headers = {
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-        }
-        
-        session = requests.Session()
-        
-        # 네이버 검색 페이지에서 맞춤법검사기 검색
-        # 제공된 코드의 URL 형식 사용
-        search_url = 'https://search.naver.com/search.naver?where=nexearch&sm=top_hty&fbm=1&ie=utf8&query=맞춤법검사기'
-        response = session.get(search_url, headers=headers, timeout=10)
-        
-        if response.status_code != 200:
-            raise Exception(f"네이버 검색 페이지 접근 실패: HTTP {response.status_code}")
-        
-        # 응답 데이터에서 passport key 추출
-        # 제공된 코드의 정규식 패턴 사용: /passportKey=([a-zA-Z0-9]+)/
-        response_data = response.text
-        match = re.search(r'passportKey=([a-zA-Z0-9]+)', response_data)
-        
-        passport_key = None
-        if match:
-            # URI 디코딩하여 passport key 추출
-            passport_key = unquote(match.group(1))
-            print(f"✅ passport key 발급 성공: {passport_key[:20]}...")
-        else:
-            print("⚠️  passport key를 찾지 못했습니다.")
-            # 다른 패턴도 시도
-            alternative_patterns = [
-                r'passportKey["\']?\s*[:=]\s*["\']([^"\']+)["\']',
-                r'passportKey=([^&\s"\']+)',
-            ]
-            
-            for pattern in alternative_patterns:
-                alt_match = re.search(pattern, response_data, re.IGNORECASE)
-                if alt_match:
-                    passport_key = alt_match.group(1)
-                    print(f"✅ passport key 발급 성공 (대체 패턴): {passport_key[:20]}...")
-                    break
-        
-        # passport key를 찾지 못한 경우, 빈 문자열 사용
-        if not passport_key:
-            passport_key = ''
-            print("⚠️  passport key를 찾지 못해 빈 문자열을 반환합니다.")
-        
-        # 캐시에 저장
-        _passport_key_cache = passport_key
+        # 프로세스 내 passport key 관리자에서 발급 (동시 요청은 하나의 발급을 공유)
+        passport_key = passport_key_manager.refresh()
         
         return jsonify({
             'passportKey': passport_key
         })
         
     except Exception as e:
-        print(f"⚠️  passport key 발급 실패: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("passport key 발급 실패: %s", e)
         return jsonify({
             'error': str(e)
         }), 500
 
-@app.route('/api/spell-check', methods=['POST'])
+@api.route('/api/spell-check', methods=['POST'])
 def spell_check_api():
     """
     맞춤법 검사 API 엔드포인트
@@ -130,9 +219,16 @@ def spell_check_api():
     Request Body:
     {
         "text": "검사할 텍스트",
-        "engine": "네이버" (선택사항, 기본값: 네이버)
+        "engine": "네이버" (선택사항, 네이버/hanspell/로컬, 기본값: 네이버),
+        "cache": false (선택사항, 디버깅용으로 결과 캐시를 사용하지 않음),
+        "incremental": true (선택사항, 문장 단위로 나누어 바뀐 문장만 검사),
+        "timings": true (선택사항, 단계별 소요 시간을 timings 필드와 Server-Timing 헤더로 반환)
     }
     
+    `Cache-Control: no-cache` 요청 헤더로도 결과 캐시를 끌 수 있습니다.
+    `X-Server-Timing: 1` 요청 헤더로도 단계별 소요 시간을 요청할 수 있습니다.
+    `X-Profile: 1`과 `X-Admin-Token` 헤더를 함께 보내면 요청을 프로파일링하고 X-Profile-Id 응답 헤더로 ID를 알려 줍니다.
+    
     Response:
     {
         "success": true,
@@ -153,181 +249,110 @@ def spell_check_api():
         data = request.get_json()
         text = data.get('text', '')
         engine = data.get('engine', '네이버')
+        with profiling(_wants_profile(), '/api/spell-check', textLength=len(text) if isinstance(text, str) else 0,
+                       engine=str(engine)) as profile, \
+                record_timings(_wants_timings(data)) as timings:
+            payload, status = _run_spell_check(
+                text,
+                engine=engine,
+                use_cache=_should_use_cache(data),
+                incremental=bool(data.get('incremental', False))
+            )
+        if timings is not None:
+            # 단계별 소요 시간 (passport, upstream, decode, parse, extract 등, 단위 ms)
+            payload['timings'] = timings.as_dict()
+        response = jsonify(payload)
+        if timings is not None:
+            response.headers['Server-Timing'] = timings.header()
+        if profile is not None:
+            response.headers['X-Profile-Id'] = str(profile.id)
+        return response, status
         
-        if not text:
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api.route('/api/spell-check/batch', methods=['POST'])
+def spell_check_batch_api():
+    """
+    여러 텍스트를 한 번에 검사하는 배치 API 엔드포인트
+    
+    Request Body:
+    {
+        "texts": ["검사할 텍스트1", "검사할 텍스트2"],
+        "engine": "네이버" (선택사항, 네이버/hanspell/로컬, 기본값: 네이버),
+        "concurrency": 4 (선택사항, 동시에 검사할 최대 개수, 서버 상한 BATCH_MAX_CONCURRENCY),
+        "cache": false, "incremental": true (선택사항, 단일 API와 동일)
+    }
+    
+    Response:
+    {
+        "success": true,
+        "count": 2,
+        "results": [
+            {"success": true, "original": ..., "checked": ..., "errors": [...], "errorCount": 1},
+            {"success": false, "error": "텍스트가 제공되지 않았습니다."}
+        ]
+    }
+    
+    results는 입력 순서를 따르며, 각 항목은 단일 API(/api/spell-check)의 응답과 같은 형식입니다.
+    같은 텍스트는 한 번만 검사하고, 한 항목이 실패해도 나머지 항목은 정상적으로 반환됩니다.
+    """
+    try:
+        data = request.get_json()
+        texts = data.get('texts')
+        
+        if not isinstance(texts, list) or not texts:
             return jsonify({
                 'success': False,
-                'error': '텍스트가 제공되지 않았습니다.'
+                'error': 'texts 배열이 제공되지 않았습니다.'
             }), 400
         
-        # 네이버 API를 직접 호출하여 HTML 응답 받기
-        # py-hanspell의 words 딕셔너리가 부정확할 수 있으므로 HTML을 직접 파싱
-        import requests
-        import json
-        import time
-        import xml.etree.ElementTree as ET
+        if len(texts) > BATCH_MAX_ITEMS:
+            return jsonify({
+                'success': False,
+                'error': f'한 번에 최대 {BATCH_MAX_ITEMS}개까지 검사할 수 있습니다.'
+            }), 400
         
         try:
-            from hanspell.constants import CheckResult, base_url
-        except ImportError:
-            class CheckResult:
-                PASSED = 0
-                WRONG_SPELLING = 1
-                WRONG_SPACING = 2
-                AMBIGUOUS = 3
-                STATISTICAL_CORRECTION = 4
-            # 네이버 검색 페이지의 맞춤법 검사기 엔드포인트 사용
-            # 네이버 검색 페이지에서 직접 사용하는 맞춤법 검사기 API
-            base_url = 'https://search.naver.com/p/csearch/ocontent/util/SpellerProxy'
-        
-        if len(text) > 500:
+            engine = engines.get(data.get('engine', '네이버'))
+        except UnknownEngineError as e:
             return jsonify({
                 'success': False,
-                'error': '텍스트는 500자 이하여야 합니다.'
+                'error': str(e)
             }), 400
-        
-        # passport key 가져오기 (캐시에서 또는 새로 발급)
-        global _passport_key_cache
-        passport_key = _passport_key_cache
-        
-        if not passport_key:
-            # passport key 발급 요청
-            try:
-                passport_response = requests.get('http://localhost:5001/passportKey', timeout=5)
-                if passport_response.status_code == 200:
-                    passport_data = passport_response.json()
-                    passport_key = passport_data.get('passportKey', '')
-                    _passport_key_cache = passport_key
-                    print(f"✅ passport key 발급 성공")
-                else:
-                    print(f"⚠️  passport key 발급 실패: HTTP {passport_response.status_code}")
-                    passport_key = ''
-            except Exception as e:
-                print(f"⚠️  passport key 발급 실패: {e}")
-                passport_key = ''
-        
-        # 네이버 맞춤법 검사기 API 호출 (passport key 포함)
-        # 제공된 코드 형식에 맞춰 파라미터 설정
-        import time as time_module
-        timestamp = int(time_module.time() * 1000)  # 밀리초 타임스탬프
-        
-        payload = {
-            'passportKey': passport_key,
-            '_callback': 'mycallback',
-            'q': text,
-            'where': 'nexearch',
-            'color_blindness': '0',
-            '_': str(timestamp)
-        }
-        
-        # 네이버 검색 페이지를 시뮬레이션하는 헤더 설정
-        headers = {
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'referer': 'https://search.naver.com/',
-            'accept': 'application/json, text/javascript, */*; q=0.01',
-            'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-        }
-        
-        url = 'https://m.search.naver.com/p/csearch/ocontent/util/SpellerProxy'
-        start_time = time.time()
-        
-        # 세션을 사용하여 쿠키 유지
-        session = requests.Session()
-        
-        # 맞춤법 검사 API 호출 (JSONP 형식)
-        r = session.get(url, params=payload, headers=headers, timeout=10)
-        passed_time = time.time() - start_time
-        
-        if r.status_code != 200:
-            raise Exception(f"네이버 API 호출 실패: HTTP {r.status_code}")
-        
-        # JSONP 응답 파싱 (mycallback({...}) 형식)
-        response_text = r.text
-        if response_text.startswith('mycallback(') and response_text.endswith(');'):
-            # JSONP 형식 제거
-            json_data = response_text.replace('mycallback(', '').replace(');', '')
-            data = json.loads(json_data)
-        else:
-            # 일반 JSON 응답
-            data = json.loads(response_text)
-        
-        # API 오류 응답 확인
-        if 'message' in data and 'error' in data.get('message', {}):
-            error_msg = data['message']['error']
-            print(f"⚠️  네이버 API 오류: {error_msg}")
-            
-            # "유효한 키가 아닙니다" 오류인 경우, passport key 재발급 후 재시도
-            if '유효한 키' in error_msg:
-                print("   passport key 재발급 중...")
-                # 캐시 초기화
-                _passport_key_cache = None
-                
-                # passport key 재발급
-                try:
-                    passport_response = requests.get('http://localhost:5001/passportKey', timeout=5)
-                    if passport_response.status_code == 200:
-                        passport_data = passport_response.json()
-                        passport_key = passport_data.get('passportKey', '')
-                        _passport_key_cache = passport_key
-                        
-                        # 새로운 passport key로 재시도
-                        payload['passportKey'] = passport_key
-                        timestamp = int(time_module.time() * 1000)
-                        payload['_'] = str(timestamp)
-                        
-                        r = session.get(url, params=payload, headers=headers, timeout=10)
-                        if r.status_code != 200:
-                            raise Exception(f"네이버 API 호출 실패: HTTP {r.status_code}")
-                        
-                        # JSONP 응답 파싱
-                        response_text = r.text
-                        if response_text.startswith('mycallback(') and response_text.endswith(');'):
-                            json_data = response_text.replace('mycallback(', '').replace(');', '')
-                            data = json.loads(json_data)
-                        else:
-                            data = json.loads(response_text)
-                        
-                        # 재시도 후에도 오류가 있으면 예외 발생
-                        if 'message' in data and 'error' in data.get('message', {}):
-                            raise Exception(f"네이버 API 오류: {data['message']['error']}")
-                    else:
-                        raise Exception(f"passport key 재발급 실패: HTTP {passport_response.status_code}")
-                except Exception as e:
-                    print(f"⚠️  passport key 재발급 실패: {e}")
-                    raise Exception(f"네이버 API 오류: {error_msg}")
+        use_cache = _should_use_cache(data)
+        incremental = bool(data.get('incremental', False))
+        concurrency = _batch_concurrency(data)
+        
+        # 같은 텍스트는 한 번만 검사
+        unique_texts = list(dict.fromkeys(text for text in texts if isinstance(text, str)))
+        
+        def check(text):
+            payload, _ = _run_spell_check(text, engine=engine, use_cache=use_cache, incremental=incremental)
+            return payload
+        
+        unique_results = [None] * len(unique_texts)
+        for index, payload in _iter_checks(engine, check, unique_texts, concurrency):
+            unique_results[index] = payload
+        by_text = dict(zip(unique_texts, unique_results))
+        
+        results = []
+        for text in texts:
+            if isinstance(text, str):
+                results.append(by_text[text])
             else:
-                raise Exception(f"네이버 API 오류: {error_msg}")
-        
-        if 'message' not in data or 'result' not in data.get('message', {}):
-            print(f"⚠️  예상치 못한 API 응답 구조: {json.dumps(data, ensure_ascii=False)}")
-            raise Exception(f"예상치 못한 API 응답 구조: {data}")
-        
-        html = data['message']['result']['html']
-        error_count = data['message']['result'].get('errata_count', 0)
-        
-        # 디버깅: API 응답 로그 출력
-        print(f"✅ 네이버 API 호출 성공")
-        print(f"   오류 개수: {error_count}")
-        print(f"   HTML 길이: {len(html)}")
-        
-        def _remove_tags(text):
-            # <br> 태그를 줄바꿈 문자로 변환
-            text = text.replace('<br>', '\n')
-            text = f'<content>{text}</content>'
-            result = ''.join(ET.fromstring(text).itertext())
-            return result
-        
-        checked = _remove_tags(html)
-        
-        # HTML을 직접 파싱하여 오류 추출 (더 정확한 방법)
-        errors = _extract_errors_from_html(original=text, checked=checked, html=html, error_count=error_count)
+                results.append({
+                    'success': False,
+                    'error': '텍스트는 문자열이어야 합니다.'
+                })
         
         return jsonify({
             'success': True,
-            'original': text,
-            'checked': checked,
-            'errors': errors,
-            'errorCount': error_count
+            'count': len(results),
+            'results': results
         })
         
     except Exception as e:
@@ -336,32 +361,563 @@ def spell_check_api():
             'error': str(e)
         }), 500
 
-def _call_naver_api_directly(text: str):
-    """네이버 API를 직접 호출하여 맞춤법 검사"""
-    import requests
-    import json
-    import time
-    from collections import OrderedDict
-    import xml.etree.ElementTree as ET
+@api.route('/api/spell-check/stream', methods=['POST'])
+def spell_check_stream_api():
+    """
+    여러 텍스트를 검사하여 결과를 NDJSON(줄마다 JSON 하나)으로 스트리밍하는 API 엔드포인트
+    
+    Request Body (둘 중 하나):
+    - Content-Type: application/x-ndjson
+      줄마다 "검사할 텍스트" 또는 {"text": "검사할 텍스트"}
+      옵션은 쿼리 문자열로 전달: ?engine=네이버&concurrency=4&cache=0&incremental=1
+    - Content-Type: application/json
+      {"texts": [...], "engine", "concurrency", "cache", "incremental"} (배치 API와 동일)
+    
+    Response (application/x-ndjson, 검사가 끝나는 순서대로):
+    {"index": 1, "success": true, "original": ..., "checked": ..., "errors": [...], "errorCount": 0}
+    {"index": 0, "success": false, "error": "텍스트가 제공되지 않았습니다."}
+    
+    입력은 필요한 만큼만 읽고 동시에 최대 concurrency개만 검사하므로,
+    항목 수와 관계없이 서버 메모리 사용량이 일정합니다.
+    """
+    if request.is_json:
+        options = request.get_json()
+        texts = options.get('texts')
+        if not isinstance(texts, list):
+            return jsonify({
+                'success': False,
+                'error': 'texts 배열이 제공되지 않았습니다.'
+            }), 400
+        items = iter(texts)
+    else:
+        args = request.args
+        options = {
+            'engine': args.get('engine', '네이버'),
+            'concurrency': args.get('concurrency', BATCH_MAX_CONCURRENCY),
+            'cache': args.get('cache', '1') not in ('0', 'false'),
+            'incremental': args.get('incremental', '0') in ('1', 'true'),
+        }
+        items = _iter_ndjson_texts(request.stream)
+    
+    try:
+        engine = engines.get(options.get('engine', '네이버'))
+    except UnknownEngineError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    use_cache = _should_use_cache(options)
+    incremental = bool(options.get('incremental', False))
+    concurrency = _batch_concurrency(options)
+    
+    def check(item):
+        if isinstance(item, ValueError):
+            return {
+                'success': False,
+                'error': f'잘못된 JSON 줄입니다: {item}'
+            }
+        if not isinstance(item, str):
+            return {
+                'success': False,
+                'error': '텍스트는 문자열이어야 합니다.'
+            }
+        payload, _ = _run_spell_check(item, engine=engine, use_cache=use_cache, incremental=incremental)
+        return payload
+    
+    def generate():
+        for index, payload in _iter_checks(engine, check, items, concurrency):
+            payload['index'] = index
+            yield json.dumps(payload, ensure_ascii=False) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def _iter_ndjson_texts(stream):
+    """
+    NDJSON 요청 본문에서 검사할 텍스트를 한 줄씩 읽기
+    줄마다 JSON 문자열 또는 {"text": ...} 객체이며, 해석할 수 없는 줄은 ValueError를 그대로 내보냅니다.
+    """
+    for raw_line in stream:
+        line = raw_line.decode('utf-8').strip() if isinstance(raw_line, bytes) else raw_line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            yield ValueError(str(e))
+            continue
+        if isinstance(item, dict):
+            item = item.get('text', '')
+        yield item
+
+def _run_spell_check(text, engine='네이버', use_cache=True, incremental=False) -> tuple:
+    """
+    텍스트 하나를 검사하여 (응답 딕셔너리, HTTP 상태 코드) 반환
+    단일/배치 API가 공유하며, 검사 실패는 예외 대신 success=False 응답으로 돌려줍니다.
+    engine은 엔진 이름(별칭) 또는 engines.get()으로 얻은 엔진입니다.
+    요청 확인, 검사 방식 결정, 실패 응답은 ASGI 서버(asgi.py)와 같은 함수를 사용합니다.
+    """
+    engine, invalid = _resolve_check(text, engine, engines)
+    if invalid:
+        return invalid
     
+    use_cache = use_cache and engine.cacheable
     try:
-        from hanspell.response import Checked
-        from hanspell.constants import CheckResult, base_url
-    except ImportError:
-        # 폴백: 직접 정의
-        from collections import namedtuple
-        Checked = namedtuple('Checked', ['result', 'original', 'checked', 'errors', 'words', 'time'])
-        class CheckResult:
-            PASSED = 0
-            WRONG_SPELLING = 1
-            WRONG_SPACING = 2
-            AMBIGUOUS = 3
-            STATISTICAL_CORRECTION = 4
-        base_url = 'https://m.search.naver.com/p/csearch/ocontent/util/SpellerProxy'
+        cache_key = _check_cache_key(text, engine, incremental)
+        with stage('cache'):
+            result = _result_cache.get(cache_key) if use_cache else None
+        
+        if result is None:
+            spans = _plan_spans(text, engine, incremental)
+            if spans is None:
+                result = engine.check(text)
+            else:
+                result = _check_spans(text, spans, engine, use_cache)
+            
+            if use_cache:
+                _result_cache.set(cache_key, result)
+        
+        return _ok_response(result)
+        
+    except Exception as e:
+        return _failed_response(text, e)
+
+def _resolve_check(text, engine, registry: EngineRegistry) -> tuple:
+    """
+    검사 요청 확인: (엔진, None), 잘못된 요청이면 (None, (응답 딕셔너리, 400))
+    engine은 엔진 이름(별칭) 또는 엔진이며, registry에서 찾습니다 (서버마다 엔진 목록이 다를 수 있음).
+    """
+    try:
+        engine = registry.get(engine)
+    except UnknownEngineError as e:
+        return None, _invalid_response(str(e))
+    
+    if not text:
+        return None, _invalid_response('텍스트가 제공되지 않았습니다.')
+    
+    if len(text) > MAX_TEXT_LENGTH:
+        return None, _invalid_response(f'텍스트는 {MAX_TEXT_LENGTH}자 이하여야 합니다.')
+    
+    return engine, None
+
+def _invalid_response(message: str) -> tuple:
+    CHECKS.labels('invalid').inc()
+    return {
+        'success': False,
+        'error': message
+    }, 400
+
+def _plan_spans(text: str, engine: Engine, incremental: bool):
+    """
+    검사 방식 결정: 텍스트 전체를 한 번에 검사하면 None, 나누어 검사하면 구간 (start, end) 목록
+    - 길이 제한이 없는 엔진: 나누지 않고 한 번에 검사
+    - 증분 검사: 문장/줄 단위로 나누어 캐시에 없는 문장만 검사
+    - 긴 텍스트: 문장/줄 단위 청크로 나누어 병렬 검사
+    """
+    if engine.max_length is None:
+        return None
+    if incremental:
+        return split_sentences(text, engine.max_length)
+    if len(text) > engine.max_length:
+        return pack_chunks(text, engine.max_length)
+    return None
+
+def _ok_response(result: SpellResult) -> tuple:
+    CHECKS.labels('ok').inc()
+    return {'success': True, **result.as_dict()}, 200
+
+def _failed_response(text: str, error: Exception) -> tuple:
+    """
+    검사 중 발생한 예외의 응답
+    업스트림 차단 중이거나 대기열이 가득 차면 기다리지 않고 로컬 규칙으로 기본 검사만 수행하고 (결과는 캐시하지 않음),
+    그 밖의 오류는 success=False, HTTP 500입니다.
+    """
+    if isinstance(error, (CircuitOpenError, UpstreamQueueFull)):
+        return _degraded_response(text), 200
+    CHECKS.labels('error').inc()
+    return {
+        'success': False,
+        'error': str(error)
+    }, 500
+
+def _degraded_response(text: str) -> dict:
+    """업스트림을 사용할 수 없을 때 로컬 규칙으로 검사한 응답 (degraded: true로 표시)"""
+    CHECKS.labels('degraded').inc()
+    return {'success': True, 'degraded': True, **check_locally(text).as_dict()}
+
+def _batch_concurrency(data: dict) -> int:
+    """요청의 concurrency 값을 1 ~ BATCH_MAX_CONCURRENCY 범위로 보정"""
+    try:
+        concurrency = int(data.get('concurrency', BATCH_MAX_CONCURRENCY))
+    except (TypeError, ValueError):
+        concurrency = BATCH_MAX_CONCURRENCY
+    return max(1, min(concurrency, BATCH_MAX_CONCURRENCY))
+
+def _iter_bounded(executor, func, items, limit: int):
+    """
+    items의 각 항목에 func를 실행하되 동시에 최대 limit개까지만 실행
+    완료되는 순서대로 (입력 인덱스, 결과)를 반환하며, items는 필요할 때만 읽습니다.
+    """
+    items = iter(enumerate(items))
+    in_flight = {}
+    
+    while True:
+        while len(in_flight) < limit:
+            try:
+                index, item = next(items)
+            except StopIteration:
+                break
+            in_flight[executor.submit(func, item)] = index
+        
+        if not in_flight:
+            return
+        
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield in_flight.pop(future), future.result()
+
+def _iter_checks(engine: Engine, func, items, limit: int):
+    """
+    배치/스트리밍 항목 검사 (입력 인덱스, 결과)
+    업스트림을 호출하는 엔진은 워커 풀에서 동시에 최대 limit개씩, 로컬 엔진은 현재 스레드에서 순서대로 검사합니다.
+    """
+    if engine.remote:
+        return _iter_bounded(_batch_executor, func, items, limit)
+    return ((index, func(item)) for index, item in enumerate(items))
+
+def _should_use_cache(data: dict, headers=None) -> bool:
+    """
+    요청이 결과 캐시를 사용할지 여부 (본문 "cache": false 또는 Cache-Control: no-cache면 사용 안 함)
+    headers를 주지 않으면 현재 Flask 요청의 헤더를 사용합니다.
+    """
+    if not RESULT_CACHE_ENABLED:
+        return False
+    if data.get('cache', True) is False:
+        return False
+    headers = request.headers if headers is None else headers
+    return 'no-cache' not in headers.get('Cache-Control', '').lower()
+
+def _wants_timings(data: dict, headers=None) -> bool:
+    """요청이 단계별 소요 시간을 원하는지 여부 (본문 "timings": true 또는 X-Server-Timing: 1)"""
+    headers = request.headers if headers is None else headers
+    return data.get('timings') is True or headers.get('X-Server-Timing') == '1'
+
+def _wants_profile() -> bool:
+    """요청을 프로파일링할지 여부 (X-Profile: 1과 관리자 토큰, 또는 PROFILE_SAMPLE_RATE 확률)"""
+    return should_profile(request.headers.get('X-Profile') == '1', request.headers.get('X-Admin-Token'))
+
+def _cache_key(text: str, engine, mode: str = 'full') -> tuple:
+    """
+    결과 캐시 키: (텍스트, 엔진, 파서 버전, 검사 방식)
+    오류 위치가 원본 문자 기준이므로 텍스트는 그대로 사용하고, 엔진 이름만 정규화합니다.
+    """
+    engine = (engine or '').strip() or '네이버'
+    return (text, engine, PARSER_VERSION, mode)
+
+def _check_cache_key(text: str, engine: Engine, incremental: bool) -> tuple:
+    """요청 전체 결과의 캐시 키 (증분 검사 결과는 따로 저장)"""
+    return _cache_key(text, engine.name, 'incremental' if incremental else 'full')
+
+def _check_spans(text: str, spans: list, engine: Engine, use_cache: bool) -> SpellResult:
+    """
+    텍스트를 구간(청크/문장)별로 engine으로 검사한 뒤 하나의 결과로 병합
+    구간 결과는 문장 캐시에 저장되어, 캐시에 없는 구간만 공용 워커 풀에서 동시에 검사합니다.
+    내용이 같은 구간은 한 번만 검사하며, 오류 위치는 원본 텍스트 기준으로 보정됩니다.
+    """
+    plan = _SpanPlan(text, spans, engine, use_cache)
+    plan.load_stored()
+    # 하나라도 실패하면 예외 전파
+    result = plan.merge(_chunk_executor.map(propagate_profile(propagate_timings(engine.check)), plan.pending))
+    plan.save_stored()
+    return result
+
+class _SpanPlan:
+    """
+    구간별 검사의 캐시 조회와 병합 (Flask/ASGI 서버 공통, 실제 검사 호출만 서버마다 다름)
+    pending은 문장 캐시에 없어 새로 검사해야 하는 구간 텍스트 목록이며, 내용이 같은 구간은 한 번만 들어 있습니다.
+    생성할 때는 메모리 캐시만 조회하며, 디스크 저장소 조회/저장(load_stored/save_stored)은 따로 호출합니다
+    (비동기 서버는 이벤트 루프를 막지 않도록 스레드에서 호출).
+    """
+    
+    def __init__(self, text: str, spans: list, engine: Engine, use_cache: bool):
+        self.text = text
+        self.spans = spans
+        self.engine = engine
+        self.use_cache = use_cache
+        self.segments = [text[start:end] for start, end in spans]
+        self.results = {}
+        self.pending = []
+        self._checked = []
+        
+        for segment in dict.fromkeys(self.segments):
+            cached = _segment_cache.get_local(self._key(segment)) if use_cache else None
+            if cached is None:
+                self.pending.append(segment)
+            else:
+                self.results[segment] = cached
+    
+    @property
+    def uses_store(self) -> bool:
+        """디스크 저장소를 조회/저장해야 하는지 여부"""
+        return self.use_cache and _segment_cache.store is not None
+    
+    def _key(self, segment: str) -> tuple:
+        return _cache_key(segment, self.engine.name, 'segment')
+    
+    def load_stored(self):
+        """메모리 캐시에 없던 구간을 디스크 저장소에서 찾아 pending에서 제외"""
+        if not (self.uses_store and self.pending):
+            return
+        pending = []
+        for segment in self.pending:
+            stored = _segment_cache.load(self._key(segment))
+            if stored is None:
+                pending.append(segment)
+            else:
+                self.results[segment] = stored
+        self.pending = pending
+    
+    def save_stored(self):
+        """merge()에서 새로 검사한 구간 결과를 디스크 저장소에 저장"""
+        if self.uses_store:
+            for segment, result in self._checked:
+                _segment_cache.save(self._key(segment), result)
+    
+    def merge(self, checked) -> SpellResult:
+        """pending 순서대로 검사한 결과를 문장 캐시(메모리)에 저장하고, 모든 구간 결과를 원본 텍스트 기준으로 병합"""
+        for segment, result in zip(self.pending, checked):
+            self.results[segment] = result
+            self._checked.append((segment, result))
+            if self.use_cache:
+                _segment_cache.set_local(self._key(segment), result)
+        
+        with stage('merge'):
+            return merge_results(self.text, self.spans, [self.results[segment] for segment in self.segments])
+
+# 네이버 맞춤법 검사기 API (JSONP 형식, 벤치마크에서는 benchmarks/mock_upstream.py 주소로 바꿈)
+SPELLER_URL = os.environ.get('SPELLER_URL', 'https://m.search.naver.com/p/csearch/ocontent/util/SpellerProxy')
+
+# 네이버 검색 페이지를 시뮬레이션하는 헤더 설정
+SPELLER_HEADERS = {
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'referer': 'https://search.naver.com/',
+    'accept': 'application/json, text/javascript, */*; q=0.01',
+    'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+}
+
+def _check_text(text: str) -> SpellResult:
+    """
+    500자 이하 텍스트 하나를 네이버 맞춤법 검사기로 검사
+    같은 텍스트를 이미 검사 중이면 네이버를 다시 호출하지 않고 그 결과를 함께 사용합니다.
+    
+    Returns:
+        SpellResult (results.py 참고)
+    """
+    return upstream_coalescer.run(('speller', text), _request_check, text)
+
+def _request_check(text: str) -> SpellResult:
+    """_check_text의 실제 네이버 호출 (passport key 조회, 호출, 응답 변환)"""
+    # 네이버 API를 직접 호출하여 HTML 응답 받기
+    # py-hanspell의 words 딕셔너리가 부정확할 수 있으므로 HTML을 직접 파싱
+    # 업스트림 차단 중이면 passport key 발급이나 호출을 기다리지 않고 바로 실패
+    upstream_breaker.fail_fast()
+    
+    # passport key 가져오기 (만료 전에는 백그라운드에서 미리 갱신됨)
+    with stage('passport'):
+        passport_key = passport_key_manager.get_key()
+    
+    # 공유 세션을 사용하여 쿠키와 연결(keep-alive) 유지
+    session = get_session()
     
+    # 맞춤법 검사 API 호출 (JSONP 형식)
+    data = _speller_data(_speller_get(session, _speller_payload(text, passport_key)))
+    
+    # "유효한 키가 아닙니다" 오류인 경우, passport key 재발급 후 한 번 재시도
+    if _needs_new_passport_key(data):
+        with _passport_key_retry(data):
+            # 거부된 키를 버리고 재발급 (다른 요청이 이미 재발급했다면 그 키 사용)
+            with stage('passport'):
+                passport_key = passport_key_manager.invalidate(passport_key)
+            data = _speller_data(_speller_get(session, _speller_payload(text, passport_key)))
+            _raise_for_speller_error(data)
+    
+    return _build_check_result(text, data)
+
+def _speller_data(response) -> dict:
+    """네이버 맞춤법 검사기 응답(requests/httpx) 본문 해석"""
+    with stage('decode'):
+        return _parse_speller_response(response.text)
+
+def _needs_new_passport_key(data: dict) -> bool:
+    """
+    API 오류 응답 확인 (Flask/ASGI 서버 공통)
+    passport key가 거부된 경우 True (재발급 후 재시도), 그 밖의 API 오류는 예외 발생, 정상 응답은 False
+    """
+    error_msg = _speller_error(data)
+    if not error_msg:
+        return False
+    UPSTREAM_ERRORS.labels('api').inc()
+    logger.warning("네이버 API 오류: %s", error_msg)
+    if '유효한 키' not in error_msg:
+        raise Exception(f"네이버 API 오류: {error_msg}")
+    logger.info("passport key 재발급 중...")
+    return True
+
+def _raise_for_speller_error(data: dict):
+    """API 오류 응답이면 예외 발생 (passport key 재발급 후 재시도한 응답 확인용)"""
+    error_msg = _speller_error(data)
+    if error_msg:
+        UPSTREAM_ERRORS.labels('api').inc()
+        raise Exception(f"네이버 API 오류: {error_msg}")
+
+@contextlib.contextmanager
+def _passport_key_retry(data: dict):
+    """
+    passport key 재발급 후 재시도하는 with 블록 (Flask/ASGI 서버 공통)
+    블록 안의 실패는 처음 받은 API 오류로 바꾸어 발생시키되, 업스트림 차단/대기열 초과는
+    로컬 규칙 응답으로 대체하도록 그대로 전파합니다.
+    """
+    error_msg = _speller_error(data)
+    try:
+        yield
+    except (CircuitOpenError, UpstreamQueueFull):
+        raise
+    except Exception as e:
+        logger.warning("passport key 재발급 실패: %s", e)
+        raise Exception(f"네이버 API 오류: {error_msg}")
+
+def _speller_get(session, payload: dict):
+    """네이버 맞춤법 검사기 호출 (속도 제한, 서킷 브레이커, 지표는 _upstream_call 참고)"""
+    return _upstream_call(
+        lambda: session.get(SPELLER_URL, params=payload, headers=SPELLER_HEADERS, timeout=UPSTREAM_TIMEOUT))
+
+def _upstream_call(send):
+    """
+    네이버 호출 하나를 속도 제한과 서킷 브레이커를 거쳐 실행 (네이버 엔진과 hanspell 엔진 공통)
+    send()가 HTTP 응답을 돌려주면 상태 코드가 200이 아닐 때 실패로 기록하고 예외를 발생시킵니다.
+    """
+    _wait_for_upstream_slot()
+    with _guarded_upstream_call(requests.Timeout, requests.RequestException) as call:
+        result = send()
+        call.status_code = getattr(result, 'status_code', 200)
+    return result
+
+class _UpstreamCall:
+    """_guarded_upstream_call 블록 안에서 받은 응답의 상태 코드를 기록"""
+    
+    status_code = None
+
+@contextlib.contextmanager
+def _guarded_upstream_call(timeout_errors, connection_errors):
+    """
+    네이버 호출 하나를 서킷 브레이커와 지표로 감싸는 with 블록 (Flask/ASGI 서버, 모든 엔진 공통)
+    서킷 브레이커가 열려 있으면 호출하지 않고 CircuitOpenError를 발생시키며, 호출 결과는 브레이커에,
+    호출 시간과 시간 초과/연결/HTTP 실패는 지표에 기록합니다. 예외 종류는 HTTP 클라이언트마다 다르므로 인자로 받습니다.
+    블록은 받은 응답의 상태 코드를 call.status_code에 넣어야 하며, 200이 아니면 블록이 끝난 뒤 예외가 발생합니다.
+    """
+    token = upstream_breaker.before_call()
+    call = _UpstreamCall()
+    start_time = time.perf_counter()
+    try:
+        yield call
+    except timeout_errors:
+        UPSTREAM_ERRORS.labels('timeout').inc()
+        raise
+    except connection_errors:
+        UPSTREAM_ERRORS.labels('connection').inc()
+        raise
+    finally:
+        elapsed = time.perf_counter() - start_time
+        upstream_breaker.record(token, call.status_code == 200, elapsed)
+        UPSTREAM_LATENCY.observe(elapsed)
+        add_stage('upstream', elapsed)
+    
+    if call.status_code != 200:
+        UPSTREAM_ERRORS.labels('http').inc()
+        raise Exception(f"네이버 API 호출 실패: HTTP {call.status_code}")
+
+def _wait_for_upstream_slot():
+    """속도 제한에 따라 네이버 호출 차례를 기다림 (대기열이 가득 차면 UpstreamQueueFull)"""
+    _record_queue_wait(upstream_rate_limiter.acquire())
+
+def _record_queue_wait(waited: float):
+    """속도 제한으로 기다린 시간 기록 (Flask/ASGI 서버 공통)"""
+    UPSTREAM_QUEUE_LATENCY.observe(waited)
+    add_stage('queue', waited)
+
+def _speller_payload(text: str, passport_key: str) -> dict:
+    """네이버 맞춤법 검사기 API 요청 파라미터 (passport key 포함)"""
+    timestamp = int(time.time() * 1000)  # 밀리초 타임스탬프
+    
+    return {
+        'passportKey': passport_key,
+        '_callback': 'mycallback',
+        'q': text,
+        'where': 'nexearch',
+        'color_blindness': '0',
+        '_': str(timestamp)
+    }
+
+def _parse_speller_response(response_text: str) -> dict:
+    """JSONP 응답 파싱 (mycallback({...}) 형식)"""
+    if response_text.startswith('mycallback(') and response_text.endswith(');'):
+        # JSONP 형식 제거
+        json_data = response_text.replace('mycallback(', '').replace(');', '')
+        return json.loads(json_data)
+    # 일반 JSON 응답
+    return json.loads(response_text)
+
+def _speller_error(data: dict):
+    """API 오류 응답이면 오류 메시지, 아니면 None 반환"""
+    if 'message' in data and 'error' in data.get('message', {}):
+        return data['message']['error']
+    return None
+
+def _build_check_result(text: str, data: dict) -> SpellResult:
+    """
+    네이버 API 응답을 검사 결과로 변환
+    HTML에서 교정된 텍스트를 추출하고, HTML을 직접 파싱하여 오류 위치를 찾습니다.
+    """
+    if 'message' not in data or 'result' not in data.get('message', {}):
+        logger.error("예상치 못한 API 응답 구조: %s", json.dumps(data, ensure_ascii=False))
+        raise Exception(f"예상치 못한 API 응답 구조: {data}")
+    
+    html = data['message']['result']['html']
+    error_count = data['message']['result'].get('errata_count', 0)
+    
+    # 디버깅: API 응답 로그 (DEBUG 수준에서만 기록)
+    logger.debug("네이버 API 호출 성공 (오류 개수: %s, HTML 길이: %d)", error_count, len(html))
+    
+    with PARSE_LATENCY.time():
+        # HTML을 한 번만 훑어 교정된 텍스트와 오류 태그 위치를 함께 추출
+        with stage('parse'):
+            parsed = parse_speller_html(html)
+        checked = parsed.checked
+        
+        # HTML을 직접 파싱하여 오류 추출 (더 정확한 방법)
+        with stage('extract'):
+            errors = _extract_errors_from_html(original=text, checked=checked, spans=parsed.spans, error_count=error_count)
+    
+    return SpellResult.from_errors(text, checked, errors, error_count)
+
+def _remove_tags(text):
+    """네이버 응답 HTML에서 태그를 제거하여 교정된 텍스트 추출 (<br> 태그는 줄바꿈 문자로 변환)"""
+    return parse_speller_html(text).checked
+
+def _find_from(text: str, word: str, start: int) -> int:
+    """start 위치부터 word를 찾고, 없으면 텍스트 처음부터 찾기"""
+    pos = text.find(word, start)
+    if pos == -1:
+        pos = text.find(word)
+    return pos
+
+def _call_naver_api_directly(text: str):
+    """네이버 API를 직접 호출하여 맞춤법 검사 (같은 텍스트를 이미 검사 중이면 그 결과를 함께 사용)"""
     if len(text) > 500:
         return Checked(result=False)
-    
+    return upstream_coalescer.run(('hanspell', text), _request_hanspell_check, text)
+
+def _request_hanspell_check(text: str):
+    """_call_naver_api_directly의 실제 네이버 호출"""
     payload = {
         'color_blindness': '0',
         'q': text
@@ -373,13 +929,10 @@ def _call_naver_api_directly(text: str):
     }
     
     start_time = time.time()
-    session = requests.Session()
-    r = session.get(base_url, params=payload, headers=headers, timeout=10)
+    session = get_session()
+    r = _upstream_call(lambda: session.get(HANSPELL_BASE_URL, params=payload, headers=headers, timeout=UPSTREAM_TIMEOUT))
     passed_time = time.time() - start_time
     
-    if r.status_code != 200:
-        raise Exception(f"네이버 API 호출 실패: HTTP {r.status_code}")
-    
     data = json.loads(r.text)
     
     # 응답 구조 확인 및 처리
@@ -388,116 +941,84 @@ def _call_naver_api_directly(text: str):
     
     if 'error' in data.get('message', {}):
         error_msg = data['message']['error']
+        UPSTREAM_ERRORS.labels('api').inc()
         raise Exception(f"네이버 API 오류: {error_msg}")
     
     if 'result' not in data.get('message', {}):
         raise Exception(f"API 응답에 result가 없습니다: {data}")
     
-    html = data['message']['result']['html']
-    
-    def _remove_tags(text):
-        # <br> 태그를 줄바꿈 문자로 변환
-        text = text.replace('<br>', '\n')
-        text = f'<content>{text}</content>'
-        result = ''.join(ET.fromstring(text).itertext())
-        return result
+    # HTML을 한 번만 훑어 교정된 텍스트와 단어별 오류 종류를 함께 추출
+    parsed = parse_speller_html(data['message']['result']['html'], with_words=True)
     
     result = {
         'result': True,
         'original': text,
-        'checked': _remove_tags(html),
+        'checked': parsed.checked,
         'errors': data['message']['result'].get('errata_count', 0),
         'time': passed_time,
-        'words': OrderedDict(),
+        'words': {},
     }
     
-    # HTML 파싱하여 words 딕셔너리 생성
-    html = html.replace('<em class=\'green_text\'>', '<green>') \
-               .replace('<em class=\'red_text\'>', '<red>') \
-               .replace('<em class=\'violet_text\'>', '<violet>') \
-               .replace('<em class=\'blue_text\'>', '<blue>') \
-               .replace('</em>', '<end>')
-    items = html.split(' ')
-    words = []
-    tmp = ''
-    for word in items:
-        if tmp == '' and word[:1] == '<':
-            pos = word.find('>') + 1
-            tmp = word[:pos]
-        elif tmp != '':
-            word = f'{tmp}{word}'
-        
-        if word[-5:] == '<end>':
-            word = word.replace('<end>', '')
-            tmp = ''
-        
-        words.append(word)
-    
-    for word in words:
-        check_result = CheckResult.PASSED
-        if word[:5] == '<red>':
-            check_result = CheckResult.WRONG_SPELLING
-            word = word.replace('<red>', '')
-        elif word[:7] == '<green>':
-            check_result = CheckResult.WRONG_SPACING
-            word = word.replace('<green>', '')
-        elif word[:8] == '<violet>':
-            check_result = CheckResult.AMBIGUOUS
-            word = word.replace('<violet>', '')
-        elif word[:6] == '<blue>':
-            check_result = CheckResult.STATISTICAL_CORRECTION
-            word = word.replace('<blue>', '')
-        result['words'][word] = check_result
+    for word, error_class in parsed.words:
+        result['words'][word] = CHECK_RESULT_BY_CLASS.get(error_class, CheckResult.PASSED)
     
     return Checked(**result)
 
-def _create_mock_errors(text: str) -> list:
-    """모의 오류 데이터 생성 (py-hanspell 실패 시 사용)"""
-    errors = []
+def _hanspell_checked(text: str):
+    """py-hanspell로 검사한 Checked (설치되어 있지 않으면 같은 요청을 직접 호출)"""
+    if hanspell_check is None:
+        return _call_naver_api_directly(text)
+    return upstream_coalescer.run(('hanspell', text), _request_hanspell_library, text)
+
+def _request_hanspell_library(text: str):
+    """py-hanspell 호출 (다른 네이버 호출과 같은 속도 제한, 서킷 브레이커, 지표를 따름)"""
+    return _upstream_call(lambda: hanspell_check(text))
+
+class NaverEngine(Engine):
+    """네이버 맞춤법 검사기 SpellerProxy를 직접 호출하고 응답 HTML에서 오류 위치 추출 (기본 엔진)"""
     
-    # 간단한 패턴 매칭으로 오류 찾기
-    if '되요' in text:
-        idx = text.find('되요')
-        errors.append({
-            'start': idx,
-            'end': idx + 2,
-            'original': '되요',
-            'suggestions': ['돼요', '되어요'],
-            'errorType': '맞춤법'
-        })
+    name = '네이버'
+    aliases = ('naver',)
+    max_length = UPSTREAM_MAX_LENGTH
+    remote = True
     
-    if '안되' in text:
-        idx = text.find('안되')
-        errors.append({
-            'start': idx,
-            'end': idx + 2,
-            'original': '안되',
-            'suggestions': ['안 돼', '안 되어'],
-            'errorType': '띄어쓰기'
-        })
+    def check(self, text: str) -> SpellResult:
+        return _check_text(text)
+
+class HanspellEngine(Engine):
+    """py-hanspell로 검사하고 단어별 검사 결과(words)로 오류 위치 추출"""
     
-    return errors
+    name = 'hanspell'
+    aliases = ('py-hanspell', '한스펠')
+    max_length = UPSTREAM_MAX_LENGTH
+    remote = True
+    
+    def check(self, text: str) -> SpellResult:
+        # 업스트림 차단 중이면 호출을 기다리지 않고 바로 실패
+        upstream_breaker.fail_fast()
+        checked = _hanspell_checked(text)
+        if not checked.result:
+            raise Exception("py-hanspell 검사 실패")
+        with stage('extract'):
+            errors = _extract_errors(text, checked.checked, checked.words or {})
+        return SpellResult.from_errors(text, checked.checked, errors, checked.errors)
+
+# 요청의 engine 값으로 고를 수 있는 엔진 (첫 번째가 기본값)
+engines = EngineRegistry((NaverEngine(), HanspellEngine(), local_engine))
+
+def _create_mock_errors(text: str) -> list:
+    """로컬 규칙으로 찾은 오류 목록 (업스트림을 사용할 수 없을 때 사용, local_rules.py 참고)"""
+    return find_errors(text)
 
 def _extract_errors_from_words(original: str, words: dict) -> list:
     """words 딕셔너리에서 직접 오류 정보 추출 (네이버 API 오류 시 사용)"""
     errors = []
-    try:
-        from hanspell.constants import CheckResult
-    except ImportError:
-        class CheckResult:
-            PASSED = 0
-            WRONG_SPELLING = 1
-            WRONG_SPACING = 2
-            AMBIGUOUS = 3
-            STATISTICAL_CORRECTION = 4
-    
     # 원본 텍스트에서 단어 위치 찾기
     word_positions = {}
     current_pos = 0
     
     # 원본 텍스트를 단어 단위로 분리하여 위치 저장
-    import re
-    words_list = re.findall(r'\S+', original)
+    words_list = _WORD_PATTERN.findall(original)
     
     for word in words_list:
         word_start = original.find(word, current_pos)
@@ -522,15 +1043,7 @@ def _extract_errors_from_words(original: str, words: dict) -> list:
                 continue
             word_end = word_start + len(word_clean)
         
-        # 오류 유형 매핑
-        error_type_map = {
-            CheckResult.WRONG_SPELLING: "맞춤법",
-            CheckResult.WRONG_SPACING: "띄어쓰기",
-            CheckResult.AMBIGUOUS: "표준어",
-            CheckResult.STATISTICAL_CORRECTION: "통계적교정"
-        }
-        
-        error_type = error_type_map.get(check_result, "기타")
+        error_type = ERROR_TYPE_BY_RESULT.get(check_result, "기타")
         
         errors.append({
             'start': word_start,
@@ -542,65 +1055,37 @@ def _extract_errors_from_words(original: str, words: dict) -> list:
     
     return errors
 
-def _extract_errors_from_html(original: str, checked: str, html: str, error_count: int) -> list:
+def _extract_errors_from_html(original: str, checked: str, spans: list, error_count: int) -> list:
     """
-    HTML 응답을 직접 파싱하여 오류 정보 추출
+    HTML 응답에서 찾은 오류 태그 구간(spans)으로 오류 정보 추출
     줄바꿈이 있는 경우에도 정확하게 오류를 찾을 수 있습니다.
     """
     errors = []
-    import re
-    import xml.etree.ElementTree as ET
     
-    try:
-        from hanspell.constants import CheckResult
-    except ImportError:
-        class CheckResult:
-            PASSED = 0
-            WRONG_SPELLING = 1
-            WRONG_SPACING = 2
-            AMBIGUOUS = 3
-            STATISTICAL_CORRECTION = 4
-    
-    error_type_map = {
-        'red': "맞춤법",
-        'green': "띄어쓰기",
-        'violet': "표준어",
-        'blue': "통계적교정"
-    }
+    # 상세 로그는 요청마다 한 번만 판단 (꺼져 있으면 로그 메시지를 만들지 않음)
+    detail = debug_sampled(logger)
+    if detail:
+        logger.debug("HTML에서 찾은 오류 태그 개수: %d", len(spans))
+        logger.debug("원본 텍스트: %s", original)
+        logger.debug("교정된 텍스트: %s", checked)
     
-    # HTML을 파싱하여 오류 위치와 텍스트 추출
-    # <em class='green_text'>텍스트</em> 형식의 태그 찾기
-    pattern = r"<em class='(red_text|green_text|violet_text|blue_text)'>(.*?)</em>"
-    matches = list(re.finditer(pattern, html))
+    # 교정된 텍스트 → 원본 위치 대응표 (오류마다 처음부터 비교하지 않도록 한 번만 계산)
+    offset_map = OffsetMap(original, checked)
+    # 원본 단어 색인 (오류마다 원본을 다시 나누지 않도록 한 번만 생성)
+    word_index = WordIndex(original)
+    # 후보별 편집 거리 (같은 교정이 여러 번 나오면 재사용)
+    ranking_cache = {}
     
-    print(f"   HTML에서 찾은 오류 태그 개수: {len(matches)}")
-    print(f"   원본 텍스트: {original}")
-    print(f"   교정된 텍스트: {checked}")
-    
-    for match in matches:
-        error_class = match.group(1)  # red_text, green_text 등
-        corrected_text = match.group(2)  # 교정된 텍스트
-        
-        # 오류 유형 결정
-        if 'red' in error_class:
-            error_type = "맞춤법"
-        elif 'green' in error_class:
-            error_type = "띄어쓰기"
-        elif 'violet' in error_class:
-            error_type = "표준어"
-        elif 'blue' in error_class:
-            error_type = "통계적교정"
-        else:
-            error_type = "기타"
+    for span in spans:
+        # 오류 유형 결정 (red_text, green_text 등)
+        error_type = ERROR_TYPE_BY_CLASS.get(span.error_class, "기타")
         
-        # HTML 태그 제거
-        corrected_text_clean = re.sub(r'<[^>]+>', '', corrected_text).strip()
-        corrected_text = corrected_text_clean
+        # 교정된 텍스트 (태그 구간의 내용)
+        corrected_text = checked[span.start:span.end].strip()
         
         # 교정된 텍스트가 여러 단어로 구성된 경우, 실제로 변경된 단어만 추출
         # 원본과 교정된 텍스트를 비교하여 다른 부분만 찾기
-        corrected_words = re.findall(r'\S+', corrected_text)
-        original_words_list = re.findall(r'\S+', original)
+        corrected_words = _WORD_PATTERN.findall(corrected_text)
         
         # 교정된 텍스트의 각 단어가 원본에 있는지 확인
         # 원본에 없는 단어 또는 원본과 다른 단어를 찾기
@@ -610,13 +1095,7 @@ def _extract_errors_from_html(original: str, checked: str, html: str, error_coun
         if corrected_text not in original:
             # 교정된 텍스트 전체가 원본에 없으면, 각 단어를 확인
             for cw in corrected_words:
-                # 원본에서 해당 단어 찾기
-                found_in_original = False
-                for ow in original_words_list:
-                    if ow == cw:
-                        found_in_original = True
-                        break
-                if not found_in_original:
+                if cw not in word_index:
                     # 원본에 없는 단어 = 교정된 단어
                     actual_corrected_word = cw
                     break
@@ -627,12 +1106,7 @@ def _extract_errors_from_html(original: str, checked: str, html: str, error_coun
         else:
             # 교정된 텍스트가 원본에 포함된 경우, 단어 단위로 비교
             for cw in corrected_words:
-                found_in_original = False
-                for ow in original_words_list:
-                    if ow == cw:
-                        found_in_original = True
-                        break
-                if not found_in_original:
+                if cw not in word_index:
                     actual_corrected_word = cw
                     break
             
@@ -641,165 +1115,35 @@ def _extract_errors_from_html(original: str, checked: str, html: str, error_coun
                 actual_corrected_word = corrected_words[-1]
         
         # 교정된 텍스트에서 위치 찾기
+        # (같은 단어가 여러 번 나올 수 있으므로 해당 오류 태그 위치부터 찾기)
         if actual_corrected_word:
-            corrected_pos = checked.find(actual_corrected_word)
+            corrected_pos = _find_from(checked, actual_corrected_word, span.start)
             if corrected_pos == -1:
                 # 정확히 찾지 못하면 부분 일치로 찾기 시도
-                corrected_pos = checked.find(corrected_text)
+                corrected_pos = _find_from(checked, corrected_text, span.start)
                 if corrected_pos == -1:
-                    print(f"   ⚠️  교정된 텍스트를 찾을 수 없음: {actual_corrected_word}")
+                    if detail:
+                        logger.debug("교정된 텍스트를 찾을 수 없음: %s", actual_corrected_word)
                     continue
                 actual_corrected_word = corrected_text
             else:
                 corrected_text = actual_corrected_word
-            print(f"   ✅ 교정된 단어: {corrected_text} (위치: {corrected_pos})")
+            if detail:
+                logger.debug("교정된 단어: %s (위치: %d)", corrected_text, corrected_pos)
         else:
-            corrected_pos = checked.find(corrected_text)
+            corrected_pos = _find_from(checked, corrected_text, span.start)
             if corrected_pos == -1:
-                print(f"   ⚠️  교정된 텍스트를 찾을 수 없음: {corrected_text}")
+                if detail:
+                    logger.debug("교정된 텍스트를 찾을 수 없음: %s", corrected_text)
                 continue
-            print(f"   ✅ 교정된 텍스트: {corrected_text} (위치: {corrected_pos})")
+            if detail:
+                logger.debug("교정된 텍스트: %s (위치: %d)", corrected_text, corrected_pos)
         
         # 교정된 텍스트 위치를 원본 위치로 매핑
-        orig_idx = 0
-        check_idx = 0
-        
-        while check_idx < corrected_pos and orig_idx < len(original) and check_idx < len(checked):
-            checked_char = checked[check_idx] if check_idx < len(checked) else ''
-            original_char = original[orig_idx] if orig_idx < len(original) else ''
-            
-            if checked_char == original_char:
-                orig_idx += 1
-                check_idx += 1
-            elif checked_char.isspace() and not original_char.isspace():
-                check_idx += 1
-            elif original_char.isspace() and not checked_char.isspace():
-                orig_idx += 1
-            elif original_char == '\n' or original_char == '\r':
-                orig_idx += 1
-            else:
-                orig_idx += 1
-                check_idx += 1
+        estimated_start = offset_map.to_original(corrected_pos)
         
-        estimated_start = orig_idx
-        
-        # 원본에서 해당 위치 근처의 단어 찾기
-        original_words = []
-        for word_match in re.finditer(r'\S+', original):
-            word = word_match.group()
-            start = word_match.start()
-            end = word_match.end()
-            original_words.append({
-                'word': word,
-                'start': start,
-                'end': end
-            })
-        
-        found_original = None
-        
-        # 띄어쓰기 오류: 여러 단어가 합쳐진 경우
-        if error_type == "띄어쓰기":
-            corrected_no_space = corrected_text.replace(' ', '').replace('?', '').replace('.', '').replace('!', '')
-            
-            start_idx = 0
-            for i, ow in enumerate(original_words):
-                if ow['start'] <= estimated_start < ow['end'] or abs(ow['start'] - estimated_start) < 10:
-                    start_idx = i
-                    break
-            
-            for i in range(start_idx, len(original_words)):
-                combined_start = original_words[i]['start']
-                
-                for j in range(i + 1, min(i + 6, len(original_words))):
-                    actual_text = original[combined_start:original_words[j]['end']]
-                    test_no_space = actual_text.replace(' ', '').replace('\n', '').replace('\r', '').replace('?', '').replace('.', '').replace('!', '')
-                    
-                    if test_no_space == corrected_no_space:
-                        found_original = {
-                            'word': actual_text.strip(),
-                            'start': combined_start,
-                            'end': original_words[j]['end']
-                        }
-                        break
-                    elif len(test_no_space) > len(corrected_no_space) + 2:
-                        break
-                
-                if found_original:
-                    break
-        
-        # 맞춤법 오류: 단일 단어 교정
-        if not found_original:
-            best_match = None
-            best_distance = float('inf')
-            best_similarity = 0
-            
-            # 교정된 텍스트와 가장 유사한 원본 단어 찾기
-            for ow in original_words:
-                ow_word = ow['word']
-                distance = abs(ow['start'] - estimated_start)
-                
-                # 교정된 텍스트와 원본 단어의 유사도 계산
-                # 1. 정확히 일치하는 경우 (제외)
-                if ow_word == corrected_text:
-                    continue
-                
-                # 2. 교정된 텍스트가 원본 단어에 포함된 경우
-                if corrected_text in ow_word:
-                    similarity = len(corrected_text) / len(ow_word)
-                    if similarity > best_similarity or (similarity == best_similarity and distance < best_distance):
-                        best_similarity = similarity
-                        best_distance = distance
-                        best_match = ow
-                # 3. 원본 단어가 교정된 텍스트에 포함된 경우
-                elif ow_word in corrected_text:
-                    similarity = len(ow_word) / len(corrected_text)
-                    if similarity > best_similarity or (similarity == best_similarity and distance < best_distance):
-                        best_similarity = similarity
-                        best_distance = distance
-                        best_match = ow
-                # 4. 부분적으로 일치하는 경우 (공통 부분 비율)
-                else:
-                    # 앞에서부터 공통 부분 찾기
-                    common_prefix = 0
-                    min_len = min(len(ow_word), len(corrected_text))
-                    for i in range(min_len):
-                        if ow_word[i] == corrected_text[i]:
-                            common_prefix += 1
-                        else:
-                            break
-                    
-                    # 뒤에서부터 공통 부분 찾기
-                    common_suffix = 0
-                    for i in range(min_len - common_prefix):
-                        if ow_word[-(i+1)] == corrected_text[-(i+1)]:
-                            common_suffix += 1
-                        else:
-                            break
-                    
-                    common_len = common_prefix + common_suffix
-                    
-                    if common_len > 0:
-                        # 공통 부분이 있으면 유사도 계산
-                        similarity = common_len / max(len(ow_word), len(corrected_text))
-                        # 공통 부분이 전체의 20% 이상이면 유사한 것으로 간주 (기존 30%에서 낮춤)
-                        if similarity > 0.2:
-                            if similarity > best_similarity or (similarity == best_similarity and distance < best_distance):
-                                best_similarity = similarity
-                                best_distance = distance
-                                best_match = ow
-                    # 5. 거리만으로 판단 (유사도가 없는 경우)
-                    if best_similarity == 0 and distance < best_distance:
-                        best_distance = distance
-                        if not best_match:
-                            best_match = ow
-            
-            # 유사도가 0.2 이상이거나 거리가 20 이하인 경우 매칭 (기존 0.3, 15에서 완화)
-            if best_match and (best_similarity > 0.2 or best_distance < 20):
-                found_original = {
-                    'word': best_match['word'],
-                    'start': best_match['start'],
-                    'end': best_match['end']
-                }
+        # 추정 위치 주변의 원본 단어(띄어쓰기 오류는 이어진 단어들) 중 교정된 텍스트와 가장 가까운 구간
+        found_original = find_original(word_index, corrected_text, estimated_start, error_type, ranking_cache)
         
         if found_original:
             # 원본 단어와 교정된 텍스트가 다른 경우에만 오류로 추가
@@ -903,43 +1247,13 @@ def _extract_errors(original: str, checked: str, words: dict) -> list:
     네이버 맞춤법 검사기의 결과를 그대로 반영합니다.
     """
     errors = []
-    try:
-        from hanspell.constants import CheckResult
-    except ImportError:
-        # 폴백: CheckResult 상수 직접 정의
-        class CheckResult:
-            PASSED = 0
-            WRONG_SPELLING = 1
-            WRONG_SPACING = 2
-            AMBIGUOUS = 3
-            STATISTICAL_CORRECTION = 4
-    
-    # 오류 유형 매핑
-    error_type_map = {
-        CheckResult.WRONG_SPELLING: "맞춤법",
-        CheckResult.WRONG_SPACING: "띄어쓰기",
-        CheckResult.AMBIGUOUS: "표준어",
-        CheckResult.STATISTICAL_CORRECTION: "통계적교정"
-    }
-    
     # 교정된 텍스트의 각 단어를 원본과 순차적으로 매칭
-    import re
-    
-    # 원본 텍스트에서 단어 위치 저장 (줄바꿈 포함)
-    original_words_with_pos = []
-    for match in re.finditer(r'\S+', original):
-        word = match.group()
-        start = match.start()
-        end = match.end()
-        original_words_with_pos.append({
-            'word': word,
-            'start': start,
-            'end': end
-        })
+    # 원본 텍스트 단어 색인 (줄바꿈 포함, 한 번만 생성)
+    word_index = WordIndex(original)
     
     # 교정된 텍스트에서 단어 위치 저장
     checked_words_with_pos = []
-    for match in re.finditer(r'\S+', checked):
+    for match in _WORD_PATTERN.finditer(checked):
         word = match.group()
         start = match.start()
         end = match.end()
@@ -949,14 +1263,18 @@ def _extract_errors(original: str, checked: str, words: dict) -> list:
             'end': end
         })
     
+    # 교정된 텍스트 → 원본 위치 대응표 (오류마다 처음부터 비교하지 않도록 한 번만 계산)
+    offset_map = OffsetMap(original, checked)
+    strict_offset_map = None
+    
     # words 딕셔너리의 각 오류 단어에 대해 원본 위치 찾기
     for corrected_word, check_result in words.items():
         if check_result == CheckResult.PASSED:
             continue
         
         # HTML 태그 제거 (py-hanspell이 words에 HTML 태그를 포함시킬 수 있음)
-        corrected_word_clean = re.sub(r'<[^>]+>', '', corrected_word).strip()
-        error_type = error_type_map.get(check_result, "기타")
+        corrected_word_clean = _TAG_PATTERN.sub('', corrected_word).strip()
+        error_type = ERROR_TYPE_BY_RESULT.get(check_result, "기타")
         
         # 교정된 텍스트에서 해당 단어의 위치 찾기
         # 단어가 다른 단어와 붙어있을 수 있으므로 정확히 찾기
@@ -966,7 +1284,7 @@ def _extract_errors(original: str, checked: str, words: dict) -> list:
         
         # 방법 1: 정확히 일치하는 단어 찾기 (HTML 태그 제거 후 비교)
         for cw in checked_words_with_pos:
-            cw_clean = re.sub(r'<[^>]+>', '', cw['word']).strip()
+            cw_clean = _TAG_PATTERN.sub('', cw['word']).strip()
             if cw_clean == corrected_word_clean:
                 corrected_pos = cw['start']
                 corrected_end_pos = cw['end']
@@ -975,7 +1293,7 @@ def _extract_errors(original: str, checked: str, words: dict) -> list:
         # 방법 2: 교정된 단어가 다른 단어에 포함된 경우 찾기
         if corrected_pos == -1:
             for cw in checked_words_with_pos:
-                cw_clean = re.sub(r'<[^>]+>', '', cw['word']).strip()
+                cw_clean = _TAG_PATTERN.sub('', cw['word']).strip()
                 if corrected_word_clean in cw_clean:
                     # 포함된 위치 찾기
                     inner_pos = cw_clean.find(corrected_word_clean)
@@ -994,35 +1312,7 @@ def _extract_errors(original: str, checked: str, words: dict) -> list:
             continue
         
         # 교정된 단어의 위치를 기준으로 원본에서 대응하는 위치 찾기
-        # 원본과 교정된 텍스트를 순차적으로 비교하여 정확한 위치 매핑
-        original_idx = 0
-        checked_idx = 0
-        
-        # 교정된 단어의 시작 위치까지 원본과 교정된 텍스트를 순차 비교
-        # 줄바꿈 문자도 고려하여 비교
-        while checked_idx < corrected_pos and original_idx < len(original) and checked_idx < len(checked):
-            checked_char = checked[checked_idx] if checked_idx < len(checked) else ''
-            original_char = original[original_idx] if original_idx < len(original) else ''
-            
-            if checked_char == original_char:
-                original_idx += 1
-                checked_idx += 1
-            elif checked_char.isspace() and not original_char.isspace():
-                # 교정된 텍스트에 공백이 추가된 경우
-                checked_idx += 1
-            elif original_char.isspace() and not checked_char.isspace():
-                # 원본에 공백/줄바꿈이 제거된 경우
-                original_idx += 1
-            elif original_char == '\n' or original_char == '\r':
-                # 원본의 줄바꿈은 교정된 텍스트에 없음
-                original_idx += 1
-            else:
-                # 다른 문자 - 위치 조정
-                original_idx += 1
-                checked_idx += 1
-        
-        # 이제 original_idx가 교정된 단어에 대응하는 원본 위치
-        estimated_original_start = original_idx
+        estimated_original_start = offset_map.to_original(corrected_pos)
         
         found_original = None
         
@@ -1032,115 +1322,45 @@ def _extract_errors(original: str, checked: str, words: dict) -> list:
             corrected_no_space = corrected_word_clean.replace(' ', '').replace('\n', '').replace('\r', '').replace('?', '').replace('.', '').replace('!', '').replace('，', '').replace('。', '')
             
             # 원본에서 estimated_original_start 위치 근처의 단어부터 시작
-            start_idx = 0
-            for i, ow in enumerate(original_words_with_pos):
-                if ow['start'] <= estimated_original_start < ow['end'] or abs(ow['start'] - estimated_original_start) < 8:
-                    start_idx = i
-                    break
+            start_idx = word_index.first_near(estimated_original_start, 8) or 0
             
-            # 연속된 단어들을 찾아서 합치기 (줄바꿈 포함)
-            for i in range(start_idx, len(original_words_with_pos)):
-                combined = original_words_with_pos[i]['word']
-                combined_start = original_words_with_pos[i]['start']
-                combined_end = original_words_with_pos[i]['end']
-                
-                # 뒤의 단어들도 포함하는지 확인 (최대 5개 단어까지, 줄바꿈 고려)
-                for j in range(i + 1, min(i + 6, len(original_words_with_pos))):
-                    # 원본 텍스트에서 실제로 어떻게 연결되어 있는지 확인 (줄바꿈 포함)
-                    actual_text = original[combined_start:original_words_with_pos[j]['end']]
-                    # 공백, 줄바꿈, 특수문자 제거하여 비교
-                    test_combined_no_space = actual_text.replace(' ', '').replace('\n', '').replace('\r', '').replace('?', '').replace('.', '').replace('!', '').replace('，', '').replace('。', '')
-                    
-                    if test_combined_no_space == corrected_no_space:
-                        found_original = {
-                            'word': actual_text.strip(),
-                            'start': combined_start,
-                            'end': original_words_with_pos[j]['end']
-                        }
-                        break
-                    elif len(test_combined_no_space) > len(corrected_no_space) + 2:
-                        # 너무 길어지면 중단
-                        break
-                
-                if found_original:
-                    break
+            # 연속된 단어들을 찾아서 합치기 (최대 6개 단어까지, 공백/줄바꿈/특수문자 제거하여 비교)
+            joined = word_index.find_joined(corrected_no_space, start_idx, ' \n\r?.!，。')
+            if joined:
+                combined_start = word_index.starts[joined[0]]
+                combined_end = word_index.ends[joined[1]]
+                found_original = {
+                    'word': original[combined_start:combined_end].strip(),
+                    'start': combined_start,
+                    'end': combined_end
+                }
         
         # 맞춤법 오류: 원본에서 유사한 단어 찾기
         if not found_original and error_type == "맞춤법":
             # 교정된 단어의 위치를 기준으로 원본에서 대응하는 위치 찾기
-            # 원본과 교정된 텍스트를 순차적으로 비교하여 더 정확한 위치 계산
-            # 줄바꿈도 고려하여 비교
-            orig_idx = 0
-            check_idx = 0
+            # (서로 다른 공백 문자는 교정된 글자로 보고 양쪽 모두 전진하는 대응표 사용)
+            if strict_offset_map is None:
+                strict_offset_map = OffsetMap(original, checked, skip_original_newlines=False)
+            refined_original_start = strict_offset_map.to_original(corrected_pos)
             
-            # 교정된 단어 위치까지 순차 비교 (줄바꿈 고려)
-            while check_idx < corrected_pos and orig_idx < len(original) and check_idx < len(checked):
-                checked_char = checked[check_idx] if check_idx < len(checked) else ''
-                original_char = original[orig_idx] if orig_idx < len(original) else ''
-                
-                if checked_char == original_char:
-                    orig_idx += 1
-                    check_idx += 1
-                elif checked_char.isspace() and not original_char.isspace():
-                    # 교정된 텍스트에 공백/줄바꿈이 추가된 경우
-                    check_idx += 1
-                elif original_char.isspace() and not checked_char.isspace():
-                    # 원본에 공백/줄바꿈이 제거된 경우
-                    orig_idx += 1
-                else:
-                    # 다른 문자 - 위치 조정
-                    orig_idx += 1
-                    check_idx += 1
-            
-            # 이제 orig_idx가 교정된 단어에 대응하는 원본 위치
-            refined_original_start = orig_idx
-            
-            # 위치가 비슷한 원본 단어 찾기
-            for ow in original_words_with_pos:
-                # 위치가 가까운 경우 (8자 이내, 줄바꿈 고려)
-                if abs(ow['start'] - refined_original_start) < 8:
-                    # 길이가 비슷한 경우 (4자 이내 차이)
-                    if abs(len(ow['word']) - len(corrected_word_clean)) < 4:
-                        found_original = {
-                            'word': ow['word'],
-                            'start': ow['start'],
-                            'end': ow['end']
-                        }
-                        break
+            # 위치가 비슷한 원본 단어 찾기 (8자 이내, 줄바꿈 고려)
+            for i in word_index.within(refined_original_start, 8):
+                # 길이가 비슷한 경우 (4자 이내 차이)
+                if abs(len(word_index.words[i]) - len(corrected_word_clean)) < 4:
+                    found_original = word_index.entry(i)
+                    break
             
             # 여전히 못 찾은 경우, 위치만으로 찾기
             if not found_original:
-                best_match = None
-                best_distance = float('inf')
-                for ow in original_words_with_pos:
-                    distance = abs(ow['start'] - refined_original_start)
-                    if distance < best_distance:
-                        best_distance = distance
-                        best_match = ow
-                
-                if best_match and best_distance < 15:
-                    found_original = {
-                        'word': best_match['word'],
-                        'start': best_match['start'],
-                        'end': best_match['end']
-                    }
+                best_match, best_distance = word_index.nearest(refined_original_start)
+                if best_match is not None and best_distance < 15:
+                    found_original = word_index.entry(best_match)
         
         # 방법 3: 위치 기반으로 가장 가까운 단어 찾기 (최후의 수단)
         if not found_original:
-            best_match = None
-            best_distance = float('inf')
-            for ow in original_words_with_pos:
-                distance = abs(ow['start'] - estimated_original_start)
-                if distance < best_distance:
-                    best_distance = distance
-                    best_match = ow
-            
-            if best_match and best_distance < 20:
-                found_original = {
-                    'word': best_match['word'],
-                    'start': best_match['start'],
-                    'end': best_match['end']
-                }
+            best_match, best_distance = word_index.nearest(estimated_original_start)
+            if best_match is not None and best_distance < 20:
+                found_original = word_index.entry(best_match)
         
         # 오류 추가
         if found_original and found_original['word'] != corrected_word_clean:
@@ -1154,10 +1374,104 @@ def _extract_errors(original: str, checked: str, words: dict) -> list:
     
     return errors
 
-@app.route('/health', methods=['GET'])
+@api.before_request
+def _start_request_metrics():
+    """요청 시작 시각과 처리 중인 요청 수 기록"""
+    g.metrics_endpoint = request.url_rule.rule
+    g.metrics_start = time.perf_counter()
+    IN_FLIGHT.labels(g.metrics_endpoint).inc()
+
+@api.after_request
+def _record_request_metrics(response):
+    """요청 수(상태 코드별)와 처리 시간 기록 (스트리밍 응답은 본문 전송 전까지의 시간)"""
+    endpoint = g.get('metrics_endpoint')
+    if endpoint is not None:
+        REQUESTS.labels(endpoint, response.status_code).inc()
+        REQUEST_LATENCY.labels(endpoint).observe(time.perf_counter() - g.metrics_start)
+    return response
+
+@api.teardown_request
+def _finish_request_metrics(exc):
+    endpoint = g.pop('metrics_endpoint', None)
+    if endpoint is not None:
+        IN_FLIGHT.labels(endpoint).dec()
+
+@api.route('/api/engines', methods=['GET'])
+def list_engines():
+    """사용할 수 있는 검사 엔진 목록 (첫 번째가 기본 엔진)"""
+    return jsonify({'engines': engines.info()})
+
+@api.route('/health', methods=['GET'])
 def health():
-    """헬스 체크 엔드포인트"""
-    return jsonify({'status': 'ok'})
+    """헬스 체크 엔드포인트 (업스트림이 차단 중이어도 서버는 로컬 규칙으로 응답하므로 status는 ok)"""
+    return jsonify({'status': 'ok', 'upstream': upstream_breaker.state})
+
+@api.route('/api/stats', methods=['GET'])
+def stats():
+    """서버 내부 통계 엔드포인트 (업스트림 연결 재사용 현황 등)"""
+    return jsonify({
+        'upstreamConnections': get_connection_stats(),
+        'resultCache': _result_cache.stats(),
+        'segmentCache': _segment_cache.stats(),
+        'resultStore': result_store.stats(),
+        'passportKey': passport_key_manager.stats(),
+        'upstreamCircuit': upstream_breaker.stats(),
+        'upstreamRateLimit': upstream_rate_limiter.stats(),
+        'upstreamCoalescing': upstream_coalescer.stats(),
+        'profiles': profile_store.stats(),
+        'logging': get_logging_stats()
+    })
+
+@api.route('/admin/profiles', methods=['GET', 'DELETE'])
+def list_profiles():
+    """
+    보관 중인 요청 프로파일 목록 (느린 순, X-Admin-Token 필요)
+    DELETE는 보관 중인 프로파일을 모두 지웁니다.
+    """
+    if not is_admin(request.headers.get('X-Admin-Token')):
+        return jsonify({'error': '관리자 토큰이 필요합니다.'}), 403
+    if request.method == 'DELETE':
+        profile_store.clear()
+    return jsonify({'profiles': profile_store.list(), **profile_store.stats()})
+
+@api.route('/admin/profiles/<int:profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """요청 프로파일 하나를 collapsed stack 형식으로 반환 (flamegraph.pl, speedscope 등으로 flame graph 생성)"""
+    if not is_admin(request.headers.get('X-Admin-Token')):
+        return jsonify({'error': '관리자 토큰이 필요합니다.'}), 403
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        return jsonify({'error': f'프로파일이 없습니다: {profile_id}'}), 404
+    return Response(profile.collapsed(), content_type='text/plain; charset=utf-8')
+
+@api.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus 형식 지표 엔드포인트 (요청/업스트림/파싱 지연 시간, 오류 수, 캐시 적중률 등)"""
+    return Response(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+def warm_up():
+    """
+    서버(워커) 시작 시 한 번 실행하는 준비 작업
+    업스트림 세션을 만들고 passport key를 미리 발급하여, 첫 요청이 발급 비용을 부담하지 않도록 합니다.
+    passport key는 이후 백그라운드에서 만료 전에 갱신됩니다.
+    """
+    get_session()
+    passport_key_manager.get_key()
+
+def create_app(warm: bool = False) -> Flask:
+    """
+    Flask 앱 생성 (라우트 등록 및 CORS 설정)
+    warm=True이면 앱을 돌려주기 전에 warm_up()을 실행합니다.
+    """
+    flask_app = Flask(__name__)
+    CORS(flask_app)  # CORS 허용
+    flask_app.register_blueprint(api)
+    if warm:
+        warm_up()
+    return flask_app
+
+# 개발 서버 및 `gunicorn app:app` 호환용 기본 앱
+app = create_app()
 
 if __name__ == '__main__':
     # macOS에서는 포트 5000이 AirPlay Receiver에 사용되므로 5001 사용
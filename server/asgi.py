@@ -0,0 +1,313 @@
+"""
+맞춤법 검사 백엔드 서버 - 비동기(ASGI) 서빙 모드
+네이버 호출을 비동기 HTTP 클라이언트(httpx)로 처리하여, 업스트림 응답을 기다리는 동안
+워커 스레드를 점유하지 않습니다. 한 프로세스에서 수천 개의 검사를 동시에 진행할 수 있습니다.
+
+Flask 서버(app.py)와 같은 라우트/응답 형식을 제공합니다.
+- POST /api/spell-check
+- GET  /passportKey
+- GET  /api/engines
+- GET  /health
+- GET  /metrics
+
+실행 방법:
+    uvicorn asgi:app --host 0.0.0.0 --port 5001
+"""
+import asyncio
+import contextlib
+import os
+import time
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from app import (
+    SPELLER_URL,
+    SPELLER_HEADERS,
+    _result_cache,
+    _check_cache_key,
+    _resolve_check,
+    _plan_spans,
+    _SpanPlan,
+    _ok_response,
+    _failed_response,
+    _should_use_cache,
+    _wants_timings,
+    _speller_payload,
+    _speller_data,
+    _needs_new_passport_key,
+    _raise_for_speller_error,
+    _passport_key_retry,
+    _guarded_upstream_call,
+    _record_queue_wait,
+    _build_check_result,
+    HanspellEngine,
+    NaverEngine,
+    warm_up,
+)
+from circuit_breaker import upstream_breaker
+from engines import Engine, EngineRegistry, local_engine
+from http_client import POOL_MAXSIZE, UPSTREAM_TIMEOUT, count_async_request
+from log import get_logger
+from metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    IN_FLIGHT,
+    REQUEST_LATENCY,
+    REQUESTS,
+    registry as metrics_registry,
+)
+from passport import passport_key_manager
+from results import SpellResult
+from timing import recording as record_timings, stage
+from upstream_scheduler import upstream_coalescer, upstream_rate_limiter
+
+logger = get_logger('asgi')
+
+# 프로세스 전체에서 동시에 진행할 수 있는 최대 네이버 호출 수
+ASYNC_MAX_UPSTREAM = int(os.environ.get('ASYNC_MAX_UPSTREAM', '512'))
+
+_client = None
+_upstream_slots = None
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_app):
+    """공유 비동기 HTTP 클라이언트 생성/정리 및 시작 시 준비 작업"""
+    global _client, _upstream_slots
+    _client = httpx.AsyncClient(
+        timeout=UPSTREAM_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=ASYNC_MAX_UPSTREAM,
+            max_keepalive_connections=POOL_MAXSIZE
+        ),
+        # 업스트림 요청/연결 수를 /api/stats, /metrics의 upstreamConnections에 집계
+        event_hooks={'request': [count_async_request]}
+    )
+    _upstream_slots = asyncio.Semaphore(ASYNC_MAX_UPSTREAM)
+    # passport key 미리 발급 (첫 요청이 발급 비용을 부담하지 않도록)
+    await asyncio.to_thread(warm_up)
+    try:
+        yield
+    finally:
+        await _client.aclose()
+
+
+async def _check_text(text: str) -> SpellResult:
+    """500자 이하 텍스트 하나를 네이버 맞춤법 검사기로 검사 (app._check_text의 비동기 버전)"""
+    return await upstream_coalescer.run_async(('speller', text), _request_check, text)
+
+
+async def _request_check(text: str) -> SpellResult:
+    """_check_text의 실제 네이버 호출 (app._request_check의 비동기 버전, 오류 처리와 재시도는 같은 함수 사용)"""
+    # 업스트림 차단 중이면 passport key 발급이나 호출을 기다리지 않고 바로 실패
+    upstream_breaker.fail_fast()
+
+    # passport key는 보통 메모리에서 바로 사용하고, 갱신이 필요할 때만 이벤트 루프 밖에서 발급
+    with stage('passport'):
+        passport_key = passport_key_manager.cached_key()
+        if passport_key is None:
+            passport_key = await asyncio.to_thread(passport_key_manager.get_key)
+
+    data = _speller_data(await _speller_get(_speller_payload(text, passport_key)))
+
+    # "유효한 키가 아닙니다" 오류인 경우, passport key 재발급 후 한 번 재시도
+    if _needs_new_passport_key(data):
+        with _passport_key_retry(data):
+            with stage('passport'):
+                passport_key = await asyncio.to_thread(passport_key_manager.invalidate, passport_key)
+            data = _speller_data(await _speller_get(_speller_payload(text, passport_key)))
+            _raise_for_speller_error(data)
+
+    return _build_check_result(text, data)
+
+
+async def _speller_get(payload: dict):
+    """네이버 맞춤법 검사기 호출 (app._speller_get의 비동기 버전, 동시 호출 수 제한 포함)"""
+    # 속도 제한 대기는 동시 호출 슬롯을 차지하지 않은 채로 함
+    _record_queue_wait(await upstream_rate_limiter.acquire_async())
+
+    async with _upstream_slots:
+        with _guarded_upstream_call(httpx.TimeoutException, httpx.HTTPError) as call:
+            r = await _client.get(SPELLER_URL, params=payload, headers=SPELLER_HEADERS)
+            call.status_code = r.status_code
+    return r
+
+
+class AsyncNaverEngine(NaverEngine):
+    """네이버 엔진 (비동기 HTTP 클라이언트로 호출)"""
+
+    async def check_async(self, text: str) -> SpellResult:
+        return await _check_text(text)
+
+
+# app.engines와 같은 엔진 (네이버 엔진만 비동기 클라이언트 사용)
+engines = EngineRegistry((AsyncNaverEngine(), HanspellEngine(), local_engine))
+
+
+async def _check_spans(text: str, spans: list, engine: Engine, use_cache: bool) -> SpellResult:
+    """구간(청크/문장)별로 동시에 검사한 뒤 병합 (app._check_spans의 비동기 버전)"""
+    plan = _SpanPlan(text, spans, engine, use_cache)
+    if plan.uses_store:
+        await asyncio.to_thread(plan.load_stored)
+    # 하나라도 실패하면 예외 전파
+    result = plan.merge(await asyncio.gather(*(engine.check_async(segment) for segment in plan.pending)))
+    if plan.uses_store:
+        await asyncio.to_thread(plan.save_stored)
+    return result
+
+
+async def _cache_get(key):
+    """결과 캐시 조회 (메모리는 바로 조회하고, 디스크 저장소는 이벤트 루프를 막지 않도록 스레드에서 조회)"""
+    result = _result_cache.get_local(key)
+    if result is None and _result_cache.store is not None:
+        result = await asyncio.to_thread(_result_cache.load, key)
+    return result
+
+
+async def _cache_set(key, result: SpellResult):
+    """결과 캐시 저장 (디스크 저장소는 스레드에서 저장)"""
+    _result_cache.set_local(key, result)
+    if _result_cache.store is not None:
+        await asyncio.to_thread(_result_cache.save, key, result)
+
+
+async def _run_spell_check(text, engine='네이버', use_cache=True, incremental=False) -> tuple:
+    """텍스트 하나를 검사하여 (응답 딕셔너리, HTTP 상태 코드) 반환 (app._run_spell_check의 비동기 버전)"""
+    engine, invalid = _resolve_check(text, engine, engines)
+    if invalid:
+        return invalid
+
+    use_cache = use_cache and engine.cacheable
+    try:
+        cache_key = _check_cache_key(text, engine, incremental)
+        with stage('cache'):
+            result = await _cache_get(cache_key) if use_cache else None
+
+        if result is None:
+            spans = _plan_spans(text, engine, incremental)
+            if spans is None:
+                result = await engine.check_async(text)
+            else:
+                result = await _check_spans(text, spans, engine, use_cache)
+
+            if use_cache:
+                await _cache_set(cache_key, result)
+
+        return _ok_response(result)
+
+    except Exception as e:
+        return _failed_response(text, e)
+
+
+async def spell_check_api(request):
+    """맞춤법 검사 API 엔드포인트 (요청/응답 형식은 app.spell_check_api와 동일)"""
+    try:
+        data = await request.json()
+        with record_timings(_wants_timings(data, request.headers)) as timings:
+            payload, status = await _run_spell_check(
+                data.get('text', ''),
+                engine=data.get('engine', '네이버'),
+                use_cache=_should_use_cache(data, request.headers),
+                incremental=bool(data.get('incremental', False))
+            )
+        if timings is None:
+            return JSONResponse(payload, status_code=status)
+
+        payload['timings'] = timings.as_dict()
+        return JSONResponse(payload, status_code=status, headers={'Server-Timing': timings.header()})
+
+    except Exception as e:
+        return JSONResponse({
+            'success': False,
+            'error': str(e)
+        }, status_code=500)
+
+
+async def get_passport_key(request):
+    """네이버 맞춤법 검사기 passport key 발급 엔드포인트"""
+    try:
+        passport_key = await asyncio.to_thread(passport_key_manager.refresh)
+        return JSONResponse({
+            'passportKey': passport_key
+        })
+    except Exception as e:
+        logger.warning("passport key 발급 실패: %s", e)
+        return JSONResponse({
+            'error': str(e)
+        }, status_code=500)
+
+
+async def list_engines(request):
+    """사용할 수 있는 검사 엔진 목록 (app.list_engines와 동일)"""
+    return JSONResponse({'engines': engines.info()})
+
+
+async def health(request):
+    """헬스 체크 엔드포인트 (app.health와 동일)"""
+    return JSONResponse({'status': 'ok', 'upstream': upstream_breaker.state})
+
+
+async def metrics(request):
+    """Prometheus 형식 지표 엔드포인트 (app.metrics와 동일)"""
+    # 지표 값 중 디스크 저장소 현황은 가끔 SQLite를 조회하므로 이벤트 루프 밖에서 생성
+    body = await asyncio.to_thread(metrics_registry.render)
+    return Response(body, headers={'content-type': METRICS_CONTENT_TYPE})
+
+
+class RequestMetricsMiddleware:
+    """경로별 요청 수(상태 코드별), 처리 시간, 처리 중인 요청 수 기록 (app.py의 요청 훅과 동일한 지표)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        # 등록되지 않은 경로는 하나로 묶어 레이블 값이 무한히 늘어나지 않도록 함
+        endpoint = scope['path'] if scope['path'] in _ROUTE_PATHS else 'unmatched'
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        IN_FLIGHT.labels(endpoint).inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            IN_FLIGHT.labels(endpoint).dec()
+            REQUESTS.labels(endpoint, status).inc()
+            REQUEST_LATENCY.labels(endpoint).observe(time.perf_counter() - start)
+
+
+ROUTES = [
+    Route('/api/spell-check', spell_check_api, methods=['POST']),
+    Route('/passportKey', get_passport_key, methods=['GET']),
+    Route('/api/engines', list_engines, methods=['GET']),
+    Route('/health', health, methods=['GET']),
+    Route('/metrics', metrics, methods=['GET']),
+]
+_ROUTE_PATHS = {route.path for route in ROUTES}
+
+app = Starlette(
+    routes=ROUTES,
+    middleware=[
+        Middleware(RequestMetricsMiddleware),
+        # CORS 허용 (app.py의 CORS(app)과 동일)
+        Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*']),
+    ],
+    lifespan=lifespan,
+)
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=int(os.environ.get('PORT', '5001')))
@@ -0,0 +1,143 @@
+"""
+오프셋 정렬 벤치마크
+오류가 많은 긴 텍스트에서 교정 위치 → 원본 위치 매핑 비용과 오류 추출 전체 시간을 길이별로 측정합니다.
+오류마다 텍스트 처음부터 다시 비교하던 기존 방식(오류 수 × 텍스트 길이)과 OffsetMap(텍스트 길이)을 비교하며,
+글자당 시간(us/char)이 길이와 무관하게 일정하면 선형으로 늘어나는 것입니다.
+
+    python3 benchmarks/alignment.py
+    python3 benchmarks/alignment.py --sizes 1000,4000,16000 --repeat 5 --json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+# 오류가 포함된 문장 (원본, 네이버 응답 HTML)
+_SENTENCES = [
+    ("그건 안되요.", "그건 <em class='red_text'>안돼요</em>."),
+    ("잠시후 다시 시도해 주세요.", "<em class='green_text'>잠시 후</em> 다시 시도해 주세요."),
+    ("네트워크 연결이 불안정 해요.", "네트워크 연결이 <em class='green_text'>불안정해요</em>."),
+    ("설정을 저장 했읍니다.", "설정을 <em class='green_text'>저장했습니다</em>."),
+]
+
+
+def _build_sample(size: int) -> tuple:
+    """size자 이상이 될 때까지 오류 문장을 이어 붙인 (원본, HTML, 오류 개수)"""
+    original_parts = []
+    html_parts = []
+    length = 0
+    count = 0
+    while length < size:
+        original, html = _SENTENCES[count % len(_SENTENCES)]
+        separator = '\n' if count % 5 == 4 else ' '
+        original_parts.append(original + separator)
+        html_parts.append(html + ('<br>' if separator == '\n' else separator))
+        length += len(original) + 1
+        count += 1
+    return ''.join(original_parts), ''.join(html_parts), count
+
+
+def _legacy_char_walk(original: str, checked: str, corrected_pos: int) -> int:
+    """기존 방식: 교정 위치마다 두 텍스트를 처음부터 한 글자씩 비교"""
+    orig_idx = 0
+    check_idx = 0
+    while check_idx < corrected_pos and orig_idx < len(original) and check_idx < len(checked):
+        checked_char = checked[check_idx]
+        original_char = original[orig_idx]
+        if checked_char == original_char:
+            orig_idx += 1
+            check_idx += 1
+        elif checked_char.isspace() and not original_char.isspace():
+            check_idx += 1
+        elif original_char.isspace() and not checked_char.isspace():
+            orig_idx += 1
+        elif original_char == '\n' or original_char == '\r':
+            orig_idx += 1
+        else:
+            orig_idx += 1
+            check_idx += 1
+    return orig_idx
+
+
+def _best_of(repeat: int, func) -> float:
+    """repeat번 실행한 것 중 가장 짧은 시간(ms)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def run(sizes: list, repeat: int) -> list:
+    # import 중 출력되는 진단 메시지는 측정 결과와 섞이지 않도록 버림
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    from alignment import OffsetMap
+    from speller_html import parse_speller_html
+
+    rows = []
+    for size in sizes:
+        original, html, _ = _build_sample(size)
+        parsed = parse_speller_html(html)
+        checked = parsed.checked
+        positions = [span.start for span in parsed.spans]
+
+        def legacy():
+            for pos in positions:
+                _legacy_char_walk(original, checked, pos)
+
+        def offset_map():
+            mapping = OffsetMap(original, checked)
+            for pos in positions:
+                mapping.to_original(pos)
+
+        def extraction():
+            with contextlib.redirect_stdout(io.StringIO()):
+                app._extract_errors_from_html(original, checked, parsed.spans, len(parsed.spans))
+
+        # 두 방식의 결과가 같은지 확인
+        mapping = OffsetMap(original, checked)
+        assert all(mapping.to_original(pos) == _legacy_char_walk(original, checked, pos) for pos in positions)
+
+        extraction_ms = _best_of(repeat, extraction)
+        rows.append({
+            'chars': len(original),
+            'errors': len(parsed.spans),
+            'legacy_walk_ms': round(_best_of(repeat, legacy), 3),
+            'offset_map_ms': round(_best_of(repeat, offset_map), 3),
+            'extraction_ms': round(extraction_ms, 3),
+            'extraction_us_per_char': round(extraction_ms * 1000 / len(original), 3),
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='오프셋 정렬/오류 추출 벤치마크')
+    parser.add_argument('--sizes', default='500,1000,2000,4000,8000',
+                        help='측정할 텍스트 길이(글자 수) 목록, 쉼표로 구분 (기본값: 500,1000,2000,4000,8000)')
+    parser.add_argument('--repeat', type=int, default=3, help='길이별 반복 횟수, 가장 짧은 시간을 사용 (기본값: 3)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args(argv)
+
+    rows = run([int(size) for size in args.sizes.split(',')], args.repeat)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print("오프셋 정렬 벤치마크 (단위: ms, 추출 시간은 글자당 us)")
+    print(f"{'chars':>8}{'errors':>8}{'legacy':>12}{'offsetmap':>12}{'extract':>12}{'us/char':>10}")
+    for row in rows:
+        print(f"{row['chars']:>8}{row['errors']:>8}{row['legacy_walk_ms']:>12}{row['offset_map_ms']:>12}"
+              f"{row['extraction_ms']:>12}{row['extraction_us_per_char']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""
+오류 추출 마이크로벤치마크
+기록된 네이버 응답 말뭉치(corpus/extraction.jsonl: 짧은 문구부터 500자까지, 오류가 없는 글부터 오류가 빽빽한 글,
+여러 줄 입력까지)로 오류 추출 함수별 호출당 시간과 메모리 할당량을 측정하고 저장된 기준값과 비교합니다.
+
+측정 전에 각 함수의 출력(오류 목록, 교정된 텍스트)이 저장된 기대 출력(corpus/extraction_expected.json)과
+같은지 먼저 확인하며, 하나라도 다르면 측정하지 않고 종료 코드 1로 끝납니다 (최적화로 오류 위치가 바뀌지 않도록).
+
+    python3 benchmarks/extraction.py                    # 출력 확인 + 측정 + 기준값과 비교
+    python3 benchmarks/extraction.py --save-baseline    # 현재 측정값을 기준값으로 저장
+    python3 benchmarks/extraction.py --update-expected  # 출력이 의도적으로 바뀐 경우 기대 출력 갱신
+    python3 benchmarks/extraction.py --check            # 기준값보다 느려진 함수가 있으면 종료 코드 1
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SERVER_DIR)
+# import 시 로그가 측정 결과와 섞이지 않도록 경고 이상만 기록
+os.environ.setdefault('LOG_LEVEL', 'ERROR')
+
+CORPUS_PATH = os.path.join(BENCHMARK_DIR, 'corpus', 'extraction.jsonl')
+EXPECTED_PATH = os.path.join(BENCHMARK_DIR, 'corpus', 'extraction_expected.json')
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baselines', 'extraction.json')
+CATEGORIES = ('short', 'long', 'multiline')
+# 기계 속도 보정용 작업 이름 (기준값 비교 시 이 작업의 시간 비율로 나눔)
+CALIBRATION = 'calibration'
+
+
+def load_corpus(path: str = CORPUS_PATH) -> list:
+    """말뭉치 항목 목록 ({'name', 'category', 'text', 'html', 'errata_count'})"""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# 측정할 함수 (이름 → app 모듈 속성 이름), build_check_result는 파싱과 추출을 포함한 전체 경로
+FUNCTIONS = OrderedDict([
+    ('build_check_result', '_build_check_result'),
+    ('remove_tags', '_remove_tags'),
+    ('extract_errors_from_html', '_extract_errors_from_html'),
+    ('extract_errors', '_extract_errors'),
+    ('extract_errors_from_words', '_extract_errors_from_words'),
+])
+
+
+def build_cases(app, corpus: list) -> dict:
+    """함수 이름 → [(항목 이름, 분류, 인자 튜플)] (HTML 파싱 등 준비 작업은 측정에서 제외)"""
+    from speller_html import parse_speller_html
+
+    cases = {name: [] for name in FUNCTIONS}
+    for entry in corpus:
+        text, html = entry['text'], entry['html']
+        parsed = parse_speller_html(html, with_words=True)
+        words = OrderedDict(
+            (word, app.CHECK_RESULT_BY_CLASS.get(error_class, app.CheckResult.PASSED))
+            for word, error_class in parsed.words
+        )
+        data = {'message': {'result': {'html': html, 'errata_count': entry['errata_count']}}}
+        args = {
+            'build_check_result': (text, data),
+            'remove_tags': (html,),
+            'extract_errors_from_html': (text, parsed.checked, parsed.spans, entry['errata_count']),
+            'extract_errors': (text, parsed.checked, words),
+            'extract_errors_from_words': (text, words),
+        }
+        for name in FUNCTIONS:
+            cases[name].append((entry['name'], entry['category'], args[name]))
+    return cases
+
+
+def collect_outputs(app, cases: dict) -> dict:
+    """함수 이름 → {항목 이름: 출력} (JSON으로 저장할 수 있는 형태)"""
+    outputs = {}
+    for name, attribute in FUNCTIONS.items():
+        func = getattr(app, attribute)
+        outputs[name] = {case_name: _jsonable(func(*args)) for case_name, _, args in cases[name]}
+    return outputs
+
+
+def _jsonable(output):
+    """검사 결과 객체(SpellResult)는 응답 JSON과 같은 딕셔너리로 변환"""
+    return output.as_dict() if hasattr(output, 'as_dict') else output
+
+
+def verify_outputs(outputs: dict, expected: dict) -> list:
+    """기대 출력과 다른 (함수 이름, 항목 이름, 기대 출력, 실제 출력) 목록"""
+    mismatches = []
+    for name, by_case in outputs.items():
+        for case_name, output in by_case.items():
+            want = expected.get(name, {}).get(case_name)
+            if json.loads(json.dumps(output, ensure_ascii=False)) != want:
+                mismatches.append((name, case_name, want, output))
+    return mismatches
+
+
+def _time_pass(func, args_list: list) -> float:
+    """args_list 전체를 한 번 실행한 시간(초), timeit처럼 측정 중에는 GC를 끔"""
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for args in args_list:
+            func(*args)
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _allocations_per_call(func, args_list: list) -> tuple:
+    """tracemalloc 기준 호출당 (최대 사용 메모리 증가량, 남은 메모리) 평균 바이트"""
+    peak_total = 0
+    retained_total = 0
+    tracemalloc.start()
+    try:
+        for args in args_list:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            result = func(*args)
+            after, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - before
+            retained_total += after - before
+            del result
+    finally:
+        tracemalloc.stop()
+    return peak_total / len(args_list), retained_total / len(args_list)
+
+
+def _calibration_workload(size: int):
+    """기계 속도 보정용 고정 작업 (문자열 분리/비교/딕셔너리 조회 등 추출 함수와 비슷한 연산)"""
+    words = ('안녕 하세요 그건 안되요 잠시후 다시 시도해 주세요 ' * 4).split()
+    index = {}
+    for i in range(size):
+        word = words[i % len(words)]
+        index[word] = index.get(word, 0) + len(word.strip())
+        word.find('요')
+    return index
+
+
+def measure(app, cases: dict, repeat: int) -> dict:
+    """
+    함수 이름 → 호출당 시간(전체/분류별, us)과 메모리 할당량(bytes)
+    시간은 모든 함수/분류를 번갈아 repeat번 측정한 것 중 가장 짧은 값이므로,
+    측정 중 잠깐 생긴 부하가 한 함수에만 몰리지 않습니다.
+    """
+    groups = [(CALIBRATION, 'us_per_call', _calibration_workload, [(2000,)] * 10)]
+    for name, attribute in FUNCTIONS.items():
+        func = getattr(app, attribute)
+        groups.append((name, 'us_per_call', func, [args for _, _, args in cases[name]]))
+        for category in CATEGORIES:
+            category_args = [args for _, case_category, args in cases[name] if case_category == category]
+            if category_args:
+                groups.append((name, f'{category}_us', func, category_args))
+
+    # 첫 호출 비용(정규식 컴파일 캐시 등)이 측정에 섞이지 않도록 한 번 미리 실행
+    for _, _, func, args_list in groups:
+        _time_pass(func, args_list)
+
+    best = [float('inf')] * len(groups)
+    for _ in range(repeat):
+        for index, (_, _, func, args_list) in enumerate(groups):
+            best[index] = min(best[index], _time_pass(func, args_list))
+
+    results = OrderedDict((name, {}) for name in (CALIBRATION,) + tuple(FUNCTIONS))
+    for (name, key, _, args_list), seconds in zip(groups, best):
+        results[name][key] = round(seconds / len(args_list) * 1e6, 3)
+    for name, attribute in FUNCTIONS.items():
+        peak, retained = _allocations_per_call(getattr(app, attribute), [args for _, _, args in cases[name]])
+        results[name]['peak_bytes'] = round(peak)
+        results[name]['retained_bytes'] = round(retained)
+    return results
+
+
+def compare(results: dict, baseline: dict) -> dict:
+    """
+    함수 이름 → 기준값 대비 호출당 시간 비율 (기준값이 없는 함수는 제외)
+    같은 조건에서 측정한 보정 작업의 시간 비율로 나누므로, 기계 전체가 느려지거나 빨라진 만큼은 상쇄됩니다.
+    """
+    functions = baseline.get('functions', {})
+    scale = 1.0
+    base_calibration = functions.get(CALIBRATION, {}).get('us_per_call')
+    if base_calibration:
+        scale = results[CALIBRATION]['us_per_call'] / base_calibration
+
+    ratios = {}
+    for name, result in results.items():
+        base = functions.get(name)
+        if name != CALIBRATION and base and base.get('us_per_call'):
+            ratios[name] = round(result['us_per_call'] / base['us_per_call'] / scale, 3)
+    return ratios
+
+
+def _print_report(results: dict, ratios: dict, threshold: float, corpus_size: int):
+    print(f'말뭉치 {corpus_size}개 항목, 호출당 시간(us)과 메모리(bytes)')
+    header = f"{'함수':<28}{'전체':>10}" + ''.join(f'{c:>11}' for c in CATEGORIES) + f"{'peak':>10}{'retained':>10}{'기준 대비':>12}"
+    print(header)
+    for name, result in results.items():
+        if name == CALIBRATION:
+            continue
+        ratio = ratios.get(name)
+        if ratio is None:
+            versus = '-'
+        else:
+            versus = f'{ratio:.2f}x' + (' 느려짐' if ratio > 1 + threshold else '')
+        print(f"{name:<28}{result['us_per_call']:>10.2f}"
+              + ''.join(f"{result.get(f'{c}_us', 0.0):>11.2f}" for c in CATEGORIES)
+              + f"{result['peak_bytes']:>10}{result['retained_bytes']:>10}{versus:>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='오류 추출 마이크로벤치마크')
+    parser.add_argument('--repeat', type=int, default=50, help='말뭉치 전체를 반복 측정할 횟수 (가장 빠른 값 사용)')
+    parser.add_argument('--threshold', type=float, default=0.15, help='기준값보다 이 비율 이상 느리면 느려진 것으로 표시')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='기준값 파일')
+    parser.add_argument('--save-baseline', action='store_true', help='현재 측정값을 기준값으로 저장')
+    parser.add_argument('--update-expected', action='store_true', help='현재 출력을 기대 출력으로 저장')
+    parser.add_argument('--check', action='store_true', help='느려진 함수가 있으면 종료 코드 1')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args(argv)
+
+    import app
+
+    corpus = load_corpus()
+    cases = build_cases(app, corpus)
+
+    outputs = collect_outputs(app, cases)
+    if args.update_expected:
+        with open(EXPECTED_PATH, 'w', encoding='utf-8') as f:
+            json.dump(outputs, f, ensure_ascii=False, indent=1, sort_keys=True)
+            f.write('\n')
+        print(f'기대 출력을 저장했습니다: {EXPECTED_PATH}')
+    else:
+        with open(EXPECTED_PATH, encoding='utf-8') as f:
+            expected = json.load(f)
+        mismatches = verify_outputs(outputs, expected)
+        if mismatches:
+            for name, case_name, want, got in mismatches[:10]:
+                print(f'출력이 바뀌었습니다: {name} / {case_name}', file=sys.stderr)
+                print(f'  기대: {json.dumps(want, ensure_ascii=False)}', file=sys.stderr)
+                print(f'  실제: {json.dumps(got, ensure_ascii=False)}', file=sys.stderr)
+            print(f'출력이 다른 항목 {len(mismatches)}개 (의도한 변경이면 --update-expected)', file=sys.stderr)
+            sys.exit(1)
+
+    results = measure(app, cases, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    ratios = compare(results, baseline)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'repeat': args.repeat, 'functions': results},
+                      f, ensure_ascii=False, indent=2)
+            f.write('\n')
+
+    if args.json:
+        print(json.dumps({'functions': results, 'vsBaseline': ratios}, ensure_ascii=False, indent=2))
+    else:
+        _print_report(results, ratios, args.threshold, len(corpus))
+        if args.save_baseline:
+            print(f'기준값을 저장했습니다: {args.baseline}')
+
+    if args.check and any(ratio > 1 + args.threshold for ratio in ratios.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
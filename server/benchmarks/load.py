@@ -0,0 +1,244 @@
+"""
+부하 테스트 벤치마크
+고정된 동시 요청 수로 POST /api/spell-check를 반복 호출하여 처리량(초당 요청 수)과
+지연 시간 분포(p50/p95/p99)를 보고합니다. 각 동시 요청은 응답을 받으면 바로 다음 요청을 보냅니다(closed loop).
+
+검사할 텍스트는 말뭉치(corpus/copy.jsonl)를 순서대로 돌려 사용하며, 기본적으로 결과 캐시를 끄고("cache": false)
+매번 업스트림까지 호출합니다.
+
+    # 이미 실행 중인 서버 대상
+    python3 benchmarks/load.py --url http://127.0.0.1:5001 --concurrency 32 --requests 5000
+
+    # 대역 서버(mock_upstream.py)와 서버(serve.py)를 직접 띄워서 오프라인으로 측정
+    python3 benchmarks/load.py --start --latency 80 --concurrency 64 --duration 20
+    python3 benchmarks/load.py --start --asgi --workers 1 --concurrency 256 --json
+"""
+import argparse
+import collections
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_PATH = os.path.join(BENCHMARK_DIR, 'corpus', 'copy.jsonl')
+
+
+def load_texts(path: str = CORPUS_PATH) -> list:
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line)['text'] for line in f if line.strip()]
+
+
+def percentile(sorted_values: list, percent: float) -> float:
+    """정렬된 값 목록의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'프로세스가 종료되었습니다: {" ".join(process.args)}')
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.1)
+    raise RuntimeError(f'{url} 응답을 기다리다 시간이 초과되었습니다.')
+
+
+def start_servers(args) -> tuple:
+    """대역 서버와 맞춤법 검사 서버를 띄우고 (서버 주소, 프로세스 목록) 반환"""
+    upstream_port = _free_port()
+    upstream = subprocess.Popen(
+        [sys.executable, os.path.join(BENCHMARK_DIR, 'mock_upstream.py'), '--port', str(upstream_port),
+         '--latency', str(args.latency), '--jitter', str(args.jitter), '--error-rate', str(args.error_rate)],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    urls = dict(upstream.stdout.readline().strip().split('=', 1) for _ in range(2))
+
+    server_port = _free_port()
+    env = dict(os.environ, **urls)
+    env.setdefault('LOG_LEVEL', 'WARNING')
+    # 대역 서버 대상으로는 속도 제한 없이 서버 자체의 처리량을 측정 (환경 변수로 지정하면 그 값 사용)
+    env.setdefault('UPSTREAM_RATE_LIMIT', '0')
+    command = [sys.executable, os.path.join(SERVER_DIR, 'serve.py'), '--bind', f'127.0.0.1:{server_port}',
+               '--workers', str(args.workers), '--threads', str(args.threads)]
+    if args.asgi:
+        command.append('--asgi')
+    server = subprocess.Popen(command, cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    base_url = f'http://127.0.0.1:{server_port}'
+    try:
+        _wait_until_ready(base_url + '/health', server)
+    except Exception:
+        stop_servers([upstream, server])
+        raise
+    return base_url, [upstream, server]
+
+
+def stop_servers(processes: list):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+class LoadTest:
+    """동시 요청 concurrency개로 총 total개(또는 duration초 동안) 요청하고 결과 집계"""
+
+    def __init__(self, url: str, texts: list, concurrency: int, total: int = None, duration: float = None,
+                 engine: str = None, use_cache: bool = False, timeout: float = 30.0):
+        self.url = url.rstrip('/') + '/api/spell-check'
+        self.texts = texts
+        self.concurrency = concurrency
+        self.total = total
+        self.duration = duration
+        self.engine = engine
+        self.use_cache = use_cache
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._issued = 0
+        self._deadline = None
+        self.latencies = []
+        self.statuses = collections.Counter()
+
+    def _next_index(self):
+        """다음 요청의 텍스트 인덱스, 더 보낼 요청이 없으면 None"""
+        with self._lock:
+            if self.total is not None and self._issued >= self.total:
+                return None
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                return None
+            index = self._issued
+            self._issued += 1
+            return index
+
+    def _body(self, index: int) -> dict:
+        body = {'text': self.texts[index % len(self.texts)]}
+        if self.engine:
+            body['engine'] = self.engine
+        if not self.use_cache:
+            body['cache'] = False
+        return body
+
+    def _worker(self):
+        session = requests.Session()
+        latencies = []
+        statuses = collections.Counter()
+        while True:
+            index = self._next_index()
+            if index is None:
+                break
+            start = time.perf_counter()
+            try:
+                response = session.post(self.url, json=self._body(index), timeout=self.timeout)
+                status = str(response.status_code)
+                if response.status_code == 200 and response.json().get('degraded'):
+                    status = '200 (degraded)'
+            except requests.RequestException as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+        with self._lock:
+            self.latencies.extend(latencies)
+            self.statuses.update(statuses)
+
+    def run(self) -> dict:
+        threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(self.concurrency)]
+        start = time.perf_counter()
+        if self.duration is not None:
+            self._deadline = start + self.duration
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            'concurrency': self.concurrency,
+            'requests': count,
+            'seconds': round(elapsed, 3),
+            'rps': round(count / elapsed, 1) if elapsed else 0.0,
+            'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+            'max_ms': round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            'statuses': dict(sorted(self.statuses.items())),
+        }
+
+
+def _print_report(result: dict):
+    print(f"동시 요청 {result['concurrency']}개, 요청 {result['requests']}개, {result['seconds']}초")
+    print(f"  처리량: {result['rps']} req/s")
+    print(f"  지연 시간: p50 {result['p50_ms']}ms, p95 {result['p95_ms']}ms, "
+          f"p99 {result['p99_ms']}ms, 최대 {result['max_ms']}ms")
+    print('  응답: ' + ', '.join(f'{status} × {count}' for status, count in result['statuses'].items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='POST /api/spell-check 부하 테스트')
+    parser.add_argument('--url', default='http://127.0.0.1:5001', help='대상 서버 주소 (--start이면 무시)')
+    parser.add_argument('--concurrency', type=int, default=16, help='동시 요청 수')
+    parser.add_argument('--requests', type=int, default=2000, help='총 요청 수 (--duration이 있으면 무시)')
+    parser.add_argument('--duration', type=float, help='측정 시간(초)')
+    parser.add_argument('--warmup', type=int, default=50, help='측정 전에 보내는 요청 수 (결과에서 제외)')
+    parser.add_argument('--engine', help='요청의 engine 값 (기본값: 서버 기본 엔진)')
+    parser.add_argument('--cache', action='store_true', help='결과 캐시 사용 (기본값: 매번 업스트림 호출)')
+    parser.add_argument('--corpus', default=CORPUS_PATH, help='검사할 텍스트 말뭉치 (JSONL, text 필드)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+
+    start_group = parser.add_argument_group('--start: 대역 서버와 서버를 직접 띄워서 측정')
+    start_group.add_argument('--start', action='store_true')
+    start_group.add_argument('--asgi', action='store_true', help='서버를 비동기(ASGI) 모드로 실행')
+    start_group.add_argument('--workers', type=int, default=1, help='서버 워커 프로세스 수')
+    start_group.add_argument('--threads', type=int, default=32, help='워커당 스레드 수')
+    start_group.add_argument('--latency', type=float, default=50, help='대역 서버 응답 기본 지연(ms)')
+    start_group.add_argument('--jitter', type=float, default=30, help='대역 서버 무작위 추가 지연 최대값(ms)')
+    start_group.add_argument('--error-rate', type=float, default=0.0, help='대역 서버 HTTP 500 비율 (0~1)')
+    args = parser.parse_args(argv)
+
+    texts = load_texts(args.corpus)
+    processes = []
+    url = args.url
+    if args.start:
+        url, processes = start_servers(args)
+    try:
+        options = dict(texts=texts, concurrency=args.concurrency, engine=args.engine, use_cache=args.cache)
+        if args.warmup:
+            LoadTest(url, total=args.warmup, **options).run()
+        if args.duration is not None:
+            result = LoadTest(url, duration=args.duration, **options).run()
+        else:
+            result = LoadTest(url, total=args.requests, **options).run()
+    finally:
+        stop_servers(processes)
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        _print_report(result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+"""
+네이버 맞춤법 검사기 대역 서버 (벤치마크/부하 테스트용)
+실제 네이버 대신 로컬에서 다음 두 주소를 흉내 냅니다.
+- GET /search.naver: passportKey=...가 들어 있는 검색 결과 페이지 (passport key 발급)
+- GET /p/csearch/ocontent/util/SpellerProxy: mycallback({...}) 형식의 JSONP 검사 결과
+
+검사 결과 HTML은 말뭉치(corpus/copy.jsonl)에 있는 텍스트면 기록된 HTML을, 아니면 자주 틀리는 표현 규칙으로
+red_text/green_text/violet_text/blue_text 오류 태그를 붙여 만듭니다. 응답 지연과 오류 비율을 조절할 수 있습니다.
+
+    python3 benchmarks/mock_upstream.py --port 5050 --latency 80 --jitter 40 --error-rate 0.01
+
+서버가 대역 서버를 사용하도록 하려면 출력되는 환경 변수(SPELLER_URL, PASSPORT_SEARCH_URL)를 지정해 실행합니다.
+"""
+import argparse
+import html as html_lib
+import json
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus', 'copy.jsonl')
+
+SPELLER_PATH = '/p/csearch/ocontent/util/SpellerProxy'
+SEARCH_PATH = '/search.naver'
+
+# (틀린 표현, 교정, 오류 태그 class) - 같은 위치에서는 앞쪽 규칙이 우선
+RULES = (
+    ('안되요', '안 돼요', 'red_text'),
+    ('되요', '돼요', 'red_text'),
+    ('됬', '됐', 'red_text'),
+    ('할께요', '할게요', 'red_text'),
+    ('몇일', '며칠', 'red_text'),
+    ('잠시후', '잠시 후', 'green_text'),
+    ('불안정 해요', '불안정해요', 'green_text'),
+    ('확인 하세요', '확인하세요', 'green_text'),
+    ('삐졌', '삐쳤', 'violet_text'),
+    ('짜투리', '자투리', 'violet_text'),
+    ('시도해주세요', '시도해 주세요', 'blue_text'),
+    ('확인해주세요', '확인해 주세요', 'blue_text'),
+)
+_RULE_PATTERN = re.compile('|'.join(re.escape(wrong) for wrong, _, _ in RULES))
+_RULE_BY_WRONG = {wrong: (right, error_class) for wrong, right, error_class in RULES}
+
+
+def load_corpus_html(path: str = CORPUS_PATH) -> dict:
+    """말뭉치의 텍스트 → (html, errata_count)"""
+    corpus = {}
+    if not os.path.exists(path):
+        return corpus
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                corpus[entry['text']] = (entry['html'], entry['errata_count'])
+    return corpus
+
+
+def build_html(text: str) -> tuple:
+    """규칙으로 네이버 응답과 같은 형식의 HTML과 오류 개수 생성 (줄바꿈은 <br>)"""
+    parts = []
+    count = 0
+    last = 0
+    for match in _RULE_PATTERN.finditer(text):
+        right, error_class = _RULE_BY_WRONG[match.group()]
+        parts.append(html_lib.escape(text[last:match.start()], quote=False))
+        parts.append(f"<em class='{error_class}'>{html_lib.escape(right, quote=False)}</em>")
+        last = match.end()
+        count += 1
+    parts.append(html_lib.escape(text[last:], quote=False))
+    return ''.join(parts).replace('\r\n', '\n').replace('\n', '<br>'), count
+
+
+class MockUpstream(ThreadingHTTPServer):
+    """대역 서버 (설정과 호출 수 집계를 요청 처리기와 공유)"""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 invalid_key_rate: float = 0.0, corpus: dict = None):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.invalid_key_rate = invalid_key_rate
+        self.corpus = corpus if corpus is not None else load_corpus_html()
+        self.passport_key = secrets.token_hex(20)
+        self._lock = threading.Lock()
+        self.counts = {'search': 0, 'speller': 0, 'errors': 0, 'invalidKey': 0}
+
+    def count(self, name: str):
+        with self._lock:
+            self.counts[name] += 1
+
+    def delay(self):
+        """설정한 응답 지연 (latency + 0 ~ jitter 초)"""
+        seconds = self.latency + random.uniform(0, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def urls(self) -> dict:
+        host, port = self.server_address[:2]
+        base = f'http://{host}:{port}'
+        return {
+            'SPELLER_URL': base + SPELLER_PATH,
+            'PASSPORT_SEARCH_URL': base + SEARCH_PATH + '?where=nexearch&query=맞춤법검사기',
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # 실제 서버처럼 keep-alive 연결 유지
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        if url.path == SPELLER_PATH:
+            self._speller(query)
+        elif url.path == SEARCH_PATH:
+            self._search()
+        elif url.path == '/stats':
+            self._send(200, json.dumps(self.server.counts), 'application/json')
+        else:
+            self._send(404, 'not found', 'text/plain')
+
+    def _search(self):
+        self.server.count('search')
+        page = (f'<html><body><script>var spellerUrl = "{SPELLER_PATH}?passportKey={self.server.passport_key}'
+                f'&where=nexearch";</script></body></html>')
+        self._send(200, page, 'text/html; charset=utf-8')
+
+    def _speller(self, query: dict):
+        server = self.server
+        server.count('speller')
+        server.delay()
+
+        if random.random() < server.error_rate:
+            server.count('errors')
+            self._send(500, 'internal error', 'text/plain')
+            return
+
+        if query.get('passportKey') != server.passport_key or random.random() < server.invalid_key_rate:
+            server.count('invalidKey')
+            body = {'message': {'error': '유효한 키가 아닙니다.'}}
+        else:
+            text = query.get('q', '')
+            html, count = server.corpus.get(text) or build_html(text)
+            body = {'message': {'result': {
+                'errata_count': count,
+                'origin_html': html_lib.escape(text, quote=False),
+                'html': html,
+                'notag_html': html_lib.unescape(re.sub(r'<[^>]+>', '', html.replace('<br>', '\n'))),
+            }}}
+
+        payload = json.dumps(body, ensure_ascii=False)
+        callback = query.get('_callback')
+        if callback:
+            payload = f'{callback}({payload});'
+        self._send(200, payload, 'text/javascript; charset=utf-8')
+
+    def _send(self, status: int, body: str, content_type: str):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # 요청마다 접근 로그를 남기지 않음 (부하 테스트 중 출력이 병목이 되지 않도록)
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='네이버 맞춤법 검사기 대역 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5050)
+    parser.add_argument('--latency', type=float, default=50, help='검사 응답 기본 지연(ms)')
+    parser.add_argument('--jitter', type=float, default=30, help='기본 지연에 더할 무작위 지연 최대값(ms)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='HTTP 500을 반환할 비율 (0~1)')
+    parser.add_argument('--invalid-key-rate', type=float, default=0.0,
+                        help='"유효한 키가 아닙니다" 오류를 반환할 비율 (0~1, passport key 재발급 경로)')
+    args = parser.parse_args(argv)
+
+    server = MockUpstream((args.host, args.port), latency=args.latency / 1000, jitter=args.jitter / 1000,
+                          error_rate=args.error_rate, invalid_key_rate=args.invalid_key_rate)
+    for name, value in server.urls().items():
+        print(f'{name}={value}')
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
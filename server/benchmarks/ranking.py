@@ -0,0 +1,214 @@
+"""
+원본 단어 후보 순위 벤치마크
+실제 서비스 문구 말뭉치(corpus/copy.jsonl)로 오류 추출의 정확도와 속도를
+후보 순위 방식(candidates.find_original)과 이전 방식(원본 단어 전체를 유사도로 비교)끼리 비교합니다.
+
+정확도는 말뭉치에 기록된 오류 구간 기준입니다.
+- exact: 추출한 오류의 start/end가 기대 구간과 정확히 같은 비율
+- located: 추출한 오류가 기대 구간과 겹치는 비율
+- false_positives: 어떤 기대 구간과도 겹치지 않는 추출 오류 수
+
+    python3 benchmarks/ranking.py
+    python3 benchmarks/ranking.py --repeat 20 --long-copies 200 --json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus', 'copy.jsonl')
+
+
+def load_corpus(path: str = CORPUS_PATH) -> list:
+    """말뭉치 항목 목록 ({'text', 'html', 'errata_count', 'expected'})"""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _legacy_word_similarity(word: str, corrected_text: str) -> float:
+    """이전 방식의 유사도: 포함 관계면 길이 비율, 아니면 앞뒤 공통 부분 비율 (20% 이하이면 0)"""
+    if corrected_text in word:
+        return len(corrected_text) / len(word)
+    if word in corrected_text:
+        return len(word) / len(corrected_text)
+
+    common_prefix = 0
+    min_len = min(len(word), len(corrected_text))
+    for i in range(min_len):
+        if word[i] != corrected_text[i]:
+            break
+        common_prefix += 1
+    common_suffix = 0
+    for i in range(min_len - common_prefix):
+        if word[-(i+1)] != corrected_text[-(i+1)]:
+            break
+        common_suffix += 1
+
+    common_len = common_prefix + common_suffix
+    if common_len == 0:
+        return 0
+    similarity = common_len / max(len(word), len(corrected_text))
+    return similarity if similarity > 0.2 else 0
+
+
+def legacy_find_original(word_index, corrected_text: str, estimated_start: int, error_type: str = None, cache: dict = None):
+    """
+    이전 방식: 띄어쓰기 오류는 이어진 단어 2~6개를 공백/문장부호를 빼고 정확히 비교하고,
+    그 밖에는 원본의 모든 단어 형태를 유사도로 비교하여 가장 유사한 단어 중 가장 가까운 것을 고름
+    """
+    if cache is None:
+        cache = {}
+
+    if error_type == "띄어쓰기":
+        corrected_no_space = corrected_text.replace(' ', '').replace('?', '').replace('.', '').replace('!', '')
+        start_idx = word_index.first_near(estimated_start, 10) or 0
+        joined = word_index.find_joined(corrected_no_space, start_idx, ' \n\r?.!')
+        if joined:
+            start = word_index.starts[joined[0]]
+            end = word_index.ends[joined[1]]
+            return {'word': word_index.text[start:end].strip(), 'start': start, 'end': end}
+
+    if not corrected_text:
+        best, best_distance = word_index.nearest(estimated_start)
+        return word_index.entry(best) if best is not None and best_distance < 20 else None
+
+    ranking = cache.get(('legacy', corrected_text))
+    if ranking is None:
+        best_similarity = 0
+        best_surfaces = []
+        for surface in word_index.surfaces():
+            if surface == corrected_text:
+                continue
+            similarity = _legacy_word_similarity(surface, corrected_text)
+            if similarity > best_similarity:
+                best_similarity, best_surfaces = similarity, [surface]
+            elif similarity == best_similarity and similarity > 0:
+                best_surfaces.append(surface)
+        ranking = cache[('legacy', corrected_text)] = (best_similarity, best_surfaces)
+    best_similarity, best_surfaces = ranking
+
+    best = None
+    best_distance = float('inf')
+    if best_similarity > 0:
+        for surface in best_surfaces:
+            index, distance = word_index.nearest(estimated_start, surface)
+            if distance < best_distance or (distance == best_distance and index < best):
+                best, best_distance = index, distance
+    else:
+        # 유사한 단어가 없으면 교정된 텍스트와 다른 첫 단어 (거리는 가장 가까운 단어 기준)
+        others = [i for i, word in enumerate(word_index.words) if word != corrected_text]
+        if others:
+            best = others[0]
+            best_distance = min(abs(word_index.starts[i] - estimated_start) for i in others)
+
+    if best is not None and (best_similarity > 0.2 or best_distance < 20):
+        return word_index.entry(best)
+    return None
+
+
+def _extract(app, entry: dict) -> list:
+    data = {'message': {'result': {'html': entry['html'], 'errata_count': entry['errata_count']}}}
+    with contextlib.redirect_stdout(io.StringIO()):
+        return app._build_check_result(entry['text'], data).errors
+
+
+def _accuracy(app, corpus: list) -> dict:
+    expected_total = 0
+    exact = 0
+    located = 0
+    false_positives = 0
+    for entry in corpus:
+        errors = _extract(app, entry)
+        expected = entry['expected']
+        expected_total += len(expected)
+        for want in expected:
+            if any(e['start'] == want['start'] and e['end'] == want['end'] for e in errors):
+                exact += 1
+            if any(e['start'] < want['end'] and want['start'] < e['end'] for e in errors):
+                located += 1
+        for error in errors:
+            if not any(error['start'] < want['end'] and want['start'] < error['end'] for want in expected):
+                false_positives += 1
+    return {
+        'expected': expected_total,
+        'exact': round(exact / expected_total, 4) if expected_total else 0.0,
+        'located': round(located / expected_total, 4) if expected_total else 0.0,
+        'false_positives': false_positives,
+    }
+
+
+def _long_entry(corpus: list, copies: int) -> dict:
+    """말뭉치 문구를 copies번 이어 붙인 오류가 많은 긴 입력"""
+    texts = []
+    htmls = []
+    errata = 0
+    for n in range(copies):
+        entry = corpus[n % len(corpus)]
+        texts.append(entry['text'])
+        htmls.append(entry['html'])
+        errata += entry['errata_count']
+    return {'text': '\n'.join(texts), 'html': '<br>'.join(htmls), 'errata_count': errata}
+
+
+def _best_of(repeat: int, func) -> float:
+    """repeat번 실행한 것 중 가장 짧은 시간(ms)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def run(repeat: int, long_copies: int) -> dict:
+    # import 중 출력되는 진단 메시지는 측정 결과와 섞이지 않도록 버림
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    corpus = load_corpus()
+    long_entry = _long_entry(corpus, long_copies)
+
+    results = {}
+    current = app.find_original
+    try:
+        for name, finder in (('legacy', legacy_find_original), ('candidates', current)):
+            app.find_original = finder
+            results[name] = _accuracy(app, corpus)
+            results[name]['corpus_ms'] = round(_best_of(repeat, lambda: [_extract(app, e) for e in corpus]), 3)
+            results[name]['long_ms'] = round(_best_of(repeat, lambda: _extract(app, long_entry)), 3)
+    finally:
+        app.find_original = current
+
+    results['long_chars'] = len(long_entry['text'])
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='원본 단어 후보 순위 정확도/속도 벤치마크')
+    parser.add_argument('--repeat', type=int, default=5, help='속도 측정 반복 횟수, 가장 짧은 시간을 사용 (기본값: 5)')
+    parser.add_argument('--long-copies', type=int, default=100,
+                        help='긴 입력을 만들 때 이어 붙일 말뭉치 문구 수 (기본값: 100)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat, args.long_copies)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"후보 순위 벤치마크 (말뭉치 오류 {results['legacy']['expected']}개, 긴 입력 {results['long_chars']}자)")
+    print(f"{'방식':<12}{'exact':>8}{'located':>10}{'false+':>8}{'corpus ms':>12}{'long ms':>10}")
+    for name in ('legacy', 'candidates'):
+        row = results[name]
+        print(f"{name:<12}{row['exact']:>8}{row['located']:>10}{row['false_positives']:>8}"
+              f"{row['corpus_ms']:>12}{row['long_ms']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+검사 결과 메모리 벤치마크
+기록된 네이버 응답 말뭉치(corpus/extraction.jsonl, corpus/copy.jsonl)의 검사 결과를 캐시에 보관할 때
+결과 하나가 차지하는 메모리(tracemalloc 기준)를 이전 딕셔너리 형식과 SpellResult(results.py)로 비교합니다.
+
+이전 형식은 응답과 같은 딕셔너리({'original', 'checked', 'errors', 'errorCount'})를 오류마다 딕셔너리 하나로
+보관하던 방식이며, 원본 텍스트는 캐시 키와 공유하므로 두 형식 모두 측정에서 제외합니다.
+intern된 교정 후보처럼 먼저 만든 결과와 공유되는 문자열이 측정에서 빠지지 않도록, 형식마다 별도 프로세스에서
+말뭉치를 새로 읽어 측정합니다.
+
+    python3 benchmarks/result_memory.py
+    python3 benchmarks/result_memory.py --copies 20 --json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SERVER_DIR)
+# import 시 로그가 측정 결과와 섞이지 않도록 경고 이상만 기록
+os.environ.setdefault('LOG_LEVEL', 'ERROR')
+
+CORPUS_PATHS = (
+    os.path.join(BENCHMARK_DIR, 'corpus', 'extraction.jsonl'),
+    os.path.join(BENCHMARK_DIR, 'corpus', 'copy.jsonl'),
+)
+
+
+def load_entries(paths=CORPUS_PATHS) -> list:
+    """말뭉치 항목 목록 ({'text', 'html', 'errata_count', ...})"""
+    entries = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            entries.extend(json.loads(line) for line in f if line.strip())
+    return entries
+
+
+def _legacy_result(text: str, result) -> dict:
+    """이전 형식의 결과 (교정된 텍스트, 오류의 original/교정 후보는 결과마다 새 문자열)"""
+    legacy = json.loads(json.dumps(result.as_dict(), ensure_ascii=False))
+    legacy['original'] = text
+    return legacy
+
+
+def _retained_bytes(build) -> int:
+    """build()가 만든 객체가 차지하는 메모리(bytes)"""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        kept = build()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+FORMATS = ('legacy', 'compact')
+
+
+def measure(result_format: str, copies: int) -> dict:
+    """현재 프로세스에서 말뭉치를 읽어 result_format 형식 결과들의 메모리를 측정"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+
+    entries = load_entries()
+    # 캐시처럼 서로 다른 텍스트를 보관하도록 복사본마다 텍스트 끝을 바꿈 (원본 텍스트는 측정 전에 생성)
+    texts = [f"{entry['text']}{' ' * copy}" for copy in range(copies) for entry in entries]
+    datas = [{'message': {'result': {'html': entry['html'] + ' ' * copy, 'errata_count': entry['errata_count']}}}
+             for copy in range(copies) for entry in entries]
+    if result_format == 'legacy':
+        def build():
+            return [_legacy_result(text, app._build_check_result(text, data)) for text, data in zip(texts, datas)]
+    else:
+        def build():
+            return [app._build_check_result(text, data) for text, data in zip(texts, datas)]
+    return {
+        'results': len(texts),
+        'errors': sum(entry['errata_count'] for entry in entries) * copies,
+        'bytes': _retained_bytes(build),
+    }
+
+
+def run(copies: int) -> dict:
+    measured = {}
+    for result_format in FORMATS:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--copies', str(copies), '--measure', result_format],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        measured[result_format] = json.loads(output)
+    legacy, compact = measured['legacy'], measured['compact']
+    count = compact['results']
+    return {
+        'results': count,
+        'errors': compact['errors'],
+        'legacy_bytes_per_result': round(legacy['bytes'] / count, 1),
+        'compact_bytes_per_result': round(compact['bytes'] / count, 1),
+        'reduction': round(legacy['bytes'] / compact['bytes'], 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='검사 결과 메모리 벤치마크')
+    parser.add_argument('--copies', type=int, default=10, help='말뭉치를 반복할 횟수 (결과 수 = 항목 수 × copies)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    # run()이 형식마다 띄우는 측정 프로세스용
+    parser.add_argument('--measure', choices=FORMATS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.copies)))
+        return
+
+    result = run(args.copies)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
+    print(f"결과 {result['results']}개 (오류 {result['errors']}개), 결과 하나당 메모리")
+    print(f"  이전 딕셔너리 형식: {result['legacy_bytes_per_result']} bytes")
+    print(f"  SpellResult:        {result['compact_bytes_per_result']} bytes")
+    print(f"  감소: {result['reduction']}x")
+
+
+if __name__ == '__main__':
+    main()
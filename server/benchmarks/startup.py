@@ -0,0 +1,106 @@
+"""
+콜드 스타트 벤치마크
+새 Python 프로세스에서 app 모듈 import 시간과 첫 요청 지연 시간을 여러 번 측정하여 보고합니다.
+
+    python3 benchmarks/startup.py                 # import + 첫 /health 요청
+    python3 benchmarks/startup.py --with-upstream # 첫 /api/spell-check 요청(네이버 호출 포함)까지 측정
+    python3 benchmarks/startup.py --runs 20 --json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _child(with_upstream: bool, text: str):
+    """새 프로세스 안에서 한 번 측정하여 결과를 JSON 한 줄로 출력"""
+    import contextlib
+    import io
+
+    sys.path.insert(0, SERVER_DIR)
+    result = {}
+
+    start = time.perf_counter()
+    # import 중 출력되는 진단 메시지는 측정 결과와 섞이지 않도록 버림
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    result['import_ms'] = (time.perf_counter() - start) * 1000
+
+    client = app.app.test_client()
+
+    start = time.perf_counter()
+    client.get('/health')
+    result['first_health_ms'] = (time.perf_counter() - start) * 1000
+
+    if with_upstream:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            response = client.post('/api/spell-check', json={'text': text, 'cache': False})
+        result['first_check_ms'] = (time.perf_counter() - start) * 1000
+        result['first_check_ok'] = response.status_code == 200
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            client.post('/api/spell-check', json={'text': text, 'cache': False})
+        result['second_check_ms'] = (time.perf_counter() - start) * 1000
+
+    print(json.dumps(result))
+
+
+def _run_once(args) -> dict:
+    command = [sys.executable, os.path.abspath(__file__), '--child', '--text', args.text]
+    if args.with_upstream:
+        command.append('--with-upstream')
+    start = time.perf_counter()
+    output = subprocess.run(command, capture_output=True, text=True, check=True, cwd=SERVER_DIR).stdout
+    total_ms = (time.perf_counter() - start) * 1000
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process_total_ms'] = total_ms
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='맞춤법 검사 서버 콜드 스타트 벤치마크')
+    parser.add_argument('--runs', type=int, default=10, help='측정 횟수 (기본값: 10)')
+    parser.add_argument('--with-upstream', action='store_true', help='첫 맞춤법 검사 요청(업스트림 호출 포함)도 측정')
+    parser.add_argument('--text', default='그건 안되요', help='첫 검사 요청에 사용할 텍스트')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args.with_upstream, args.text)
+        return
+
+    runs = [_run_once(args) for _ in range(args.runs)]
+    summary = {}
+    for key in runs[0]:
+        values = [run[key] for run in runs if isinstance(run.get(key), float)]
+        if values:
+            summary[key] = {
+                'median': round(statistics.median(values), 2),
+                'min': round(min(values), 2),
+                'max': round(max(values), 2),
+            }
+
+    if args.json:
+        print(json.dumps({'runs': args.runs, 'summary': summary}, indent=2))
+        return
+
+    print(f"콜드 스타트 측정 ({args.runs}회, 단위: ms)")
+    print(f"{'항목':<20}{'median':>10}{'min':>10}{'max':>10}")
+    for key, stats in summary.items():
+        print(f"{key:<20}{stats['median']:>10}{stats['min']:>10}{stats['max']:>10}")
+    if args.with_upstream:
+        failures = sum(1 for run in runs if not run.get('first_check_ok'))
+        if failures:
+            print(f"⚠️  첫 검사 요청 실패: {failures}/{args.runs}회")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,364 @@
+"""
+원본 단어 후보 순위 매기기
+교정된 텍스트에 대응하는 원본 구간을 추정 위치 주변의 후보(단어 하나 또는 이어진 단어들) 중에서 고릅니다.
+후보는 한글 자모 단위 편집 거리로 비교하므로 "되요"/"돼요"처럼 받침이나 모음 하나만 다른 교정도
+글자 하나가 통째로 다른 것보다 가깝게 평가됩니다. 편집 거리는 비트 병렬 방식으로 계산하며,
+자모 길이 차이나 없는 자모 수만으로 허용 거리를 넘는 후보는 거리를 계산하지 않습니다.
+같거나 포함하는 후보(거리 0)는 문자열 비교로 먼저 찾고, 앞뒤 공통 부분을 빼면 한 자모만 다른 후보(거리 1)는 바로 판정합니다.
+"""
+from functools import lru_cache
+from operator import itemgetter
+
+# 추정 위치에서 이 거리(글자 수) 안에서 시작하는 단어만 후보로 사용
+WINDOW = 20
+# 띄어쓰기 오류에서 하나로 합쳐 비교할 수 있는 최대 단어 수
+MAX_JOINED_WORDS = 6
+# 허용하는 편집 거리 (교정된 텍스트 자모 수 대비 비율)
+MAX_DISTANCE_RATIO = 0.4
+
+# 비교할 때 무시하는 공백과 문장부호
+IGNORED_CHARS = ' \t\r\n?.!,，。…~"\'()[]'
+_IGNORED_TABLE = str.maketrans('', '', IGNORED_CHARS)
+
+_JAMO = itemgetter(1)
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+
+
+def normalize(text: str) -> str:
+    """공백과 문장부호를 제거한 비교용 텍스트"""
+    return text.translate(_IGNORED_TABLE)
+
+
+@lru_cache(maxsize=65536)
+def to_jamo(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 분해 (한글이 아닌 글자는 그대로)"""
+    jamo = []
+    for char in text:
+        code = ord(char)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            code -= _HANGUL_BASE
+            jamo.append(chr(0x1100 + code // 588))
+            jamo.append(chr(0x1161 + (code % 588) // 28))
+            if code % 28:
+                jamo.append(chr(0x11A7 + code % 28))
+        else:
+            jamo.append(char)
+    return ''.join(jamo)
+
+
+def bounded_distance(pattern: str, text: str, max_distance: int, infix: bool = False) -> int:
+    """
+    pattern과 text의 편집 거리 (max_distance를 넘으면 max_distance + 1)
+    infix가 True이면 text의 앞뒤를 건너뛰는 비용 없이, pattern과 가장 가까운 text의 일부 구간과 비교합니다.
+    """
+    pattern_len = len(pattern)
+    text_len = len(text)
+    if not infix and abs(text_len - pattern_len) > max_distance:
+        return max_distance + 1
+    if pattern_len == 0:
+        return 0 if infix else text_len
+    if pattern == text or (infix and pattern in text):
+        return 0
+    if max_distance <= 0 or pattern_len - text_len > max_distance:
+        return max_distance + 1
+    # 앞뒤 공통 부분: 받침이나 모음 하나만 다른 교정이 대부분이라 공통 부분을 빼면 한 글자 이하만 남음
+    prefix = 0
+    common = min(pattern_len, text_len)
+    while prefix < common and pattern[prefix] == text[prefix]:
+        prefix += 1
+    suffix = 0
+    common -= prefix
+    while suffix < common and pattern[pattern_len - 1 - suffix] == text[text_len - 1 - suffix]:
+        suffix += 1
+    if pattern_len - prefix - suffix <= 1 and text_len - prefix - suffix <= 1:
+        # 남은 부분은 한 번 바꾸거나 넣거나 빼면 같아지며, 거리 0(같거나 포함)은 위에서 처리했으므로 거리는 1
+        return 1
+    if infix:
+        # 부분 비교는 단어 뒤에 조사 등이 붙은 경우가 많으므로, text 앞부분에 맞춰 처음 다른 위치에서
+        # 한 번 바꾸거나 빼거나 넣으면 같아지는지 확인
+        rest = pattern[prefix + 1:]
+        if (rest == text[prefix + 1:pattern_len] or rest == text[prefix:pattern_len - 1]
+                or pattern[prefix:] == text[prefix + 1:pattern_len + 1]):
+            return 1
+    else:
+        # 전체 비교는 앞뒤 공통 부분을 빼고 비교해도 거리가 같음 (부분 비교는 text의 다른 구간이 더 가까울 수 있어 그대로 비교)
+        pattern = pattern[prefix:pattern_len - suffix]
+        text = text[prefix:text_len - suffix]
+        pattern_len = len(pattern)
+        text_len = len(text)
+        if pattern_len == 0:
+            return text_len if text_len <= max_distance else max_distance + 1
+    # text에 없는 pattern의 글자는 각각 최소 한 번의 편집이 필요하므로, 그 수만으로 허용 거리를 넘으면 바로 포기
+    missing = 0
+    for char in pattern:
+        if char not in text:
+            missing += 1
+            if missing > max_distance:
+                return max_distance + 1
+
+    # 비트 병렬 편집 거리 (Myers): pattern의 각 위치를 비트 하나로 두고, text 글자마다 DP 열 하나를 정수 연산 몇 번으로 갱신
+    # vp/vn은 열의 위아래 칸 차이가 +1/-1인 위치, score는 열의 마지막 칸(pattern 전체와 비교한 거리)
+    matches = {}
+    for index, char in enumerate(pattern):
+        matches[char] = matches.get(char, 0) | (1 << index)
+    full = (1 << pattern_len) - 1
+    last = 1 << (pattern_len - 1)
+    # 부분 비교는 text의 앞부분을 건너뛰는 비용이 없으므로 첫 행의 차이가 0, 전체 비교는 +1
+    top = 0 if infix else 1
+    vp = full
+    vn = 0
+    score = pattern_len
+    best = score
+    for char in text:
+        eq = matches.get(char, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        hp = vn | ~(xh | vp)
+        hn = vp & xh
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+        hp = (hp << 1) | top
+        hn <<= 1
+        vp = (hn | ~(xv | hp)) & full
+        vn = hp & xv
+        if score < best:
+            best = score
+
+    distance = best if infix else score
+    return distance if distance <= max_distance else max_distance + 1
+
+
+def find_original(word_index, corrected_text: str, estimated_start: int, error_type: str = None, cache: dict = None):
+    """
+    교정된 텍스트에 대응하는 원본 구간 {'word', 'start', 'end'} (찾지 못하면 None)
+
+    추정 위치 주변 WINDOW 안에서 시작하는 단어 하나 또는 이어진 단어 최대 MAX_JOINED_WORDS개를 후보로,
+    편집 거리 → 추정 위치와의 거리 → 길이 차이 → 앞쪽 후보 순으로 고릅니다.
+    단어 하나는 교정된 텍스트가 단어의 일부여도 되고(예: "안되요"와 "돼요"), 이어진 단어들은 전체를 비교합니다.
+    편집 거리가 0인 후보(교정된 텍스트를 포함하는 단어, 띄어쓰기 오류처럼 공백을 빼면 같은 단어들)는
+    문자열 비교만으로 먼저 찾고, 없을 때만 자모 편집 거리를 계산합니다. 따라서 error_type은 순위에 영향을 주지 않습니다.
+    허용 거리 안의 후보가 없으면 추정 위치에 가장 가까운 단어를 사용합니다.
+    cache는 같은 요청 안에서 (후보, 교정된 텍스트)별 편집 거리를 재사용하기 위한 딕셔너리입니다.
+    """
+    if cache is None:
+        cache = {}
+
+    starts = word_index.starts
+    candidates = word_index.within(estimated_start, WINDOW, containing=True)
+    forms = _word_forms(cache, word_index)
+    target, target_jamo, target_len, target_jamo_len = _word_form(corrected_text)
+
+    best = _exact_candidate(word_index, candidates, forms, target, target_jamo, estimated_start)
+    if best is None:
+        max_distance = max(1, int(target_jamo_len * MAX_DISTANCE_RATIO))
+        best = _best_candidate(word_index, candidates, forms, target, target_jamo, estimated_start, max_distance, cache)
+
+    if best is None:
+        # 비슷한 후보가 없으면 위치만으로 판단
+        for i in sorted(candidates, key=lambda i: (abs(starts[i] - estimated_start), i)):
+            if forms[i][0] != target:
+                best = (i, i)
+                break
+        if best is None:
+            return None
+
+    start = starts[best[0]]
+    end = word_index.ends[best[1]]
+    return {
+        'word': word_index.text[start:end].strip(),
+        'start': start,
+        'end': end
+    }
+
+
+def _exact_candidate(word_index, candidates: range, forms: list, target: str, target_jamo: str, estimated_start: int):
+    """
+    편집 거리가 0인 후보 중 순위가 가장 높은 (첫 단어 인덱스, 마지막 단어 인덱스) (없으면 None)
+    교정된 텍스트를 포함하는 단어 하나, 또는 이어 붙이면 교정된 텍스트와 같은 단어들을 자모 문자열 비교만으로 찾습니다.
+    """
+    starts = word_index.starts
+    ends = word_index.ends
+    target_len = len(target)
+    word_count = len(forms)
+    # 후보는 모두 후보 구간 단어들을 이어 붙인 문자열의 일부이므로, 거기에 없으면 바로 포기
+    if target_jamo not in ''.join(map(_JAMO, forms[candidates.start:candidates.stop + MAX_JOINED_WORDS - 1])):
+        return None
+
+    best = None
+    best_key = None
+    for i in candidates:
+        # 추정 위치 뒤에서 시작하는 후보는 뒤로 갈수록 멀어지므로, 이미 더 가까운 후보가 있으면 중단
+        if best_key is not None and starts[i] - estimated_start > best_key[0]:
+            break
+        word, jamo, length, _ = forms[i]
+        # 교정된 텍스트와 같은 단어는 오류가 아님
+        if word and word != target and target_jamo in jamo:
+            rank = (_offset(starts[i], ends[i], estimated_start), abs(length - target_len), i, i)
+            if best_key is None or rank < best_key:
+                best_key = rank
+                best = (i, i)
+
+        # 이어 붙인 단어들은 교정된 텍스트가 그 앞부분으로 시작할 때만 같을 수 있음
+        if not target_jamo.startswith(jamo):
+            continue
+        joined_len = length
+        joined_jamo = jamo
+        for j in range(i + 1, min(i + MAX_JOINED_WORDS, word_count)):
+            _, jamo, length, _ = forms[j]
+            joined_len += length
+            joined_jamo += jamo
+            if not target_jamo.startswith(joined_jamo):
+                break
+            if joined_len and joined_jamo == target_jamo:
+                rank = (_offset(starts[i], ends[j], estimated_start), abs(joined_len - target_len), i, j)
+                if best_key is None or rank < best_key:
+                    best_key = rank
+                    best = (i, j)
+
+    return best
+
+
+def _offset(start: int, end: int, estimated_start: int) -> int:
+    """후보 구간 [start, end)와 추정 위치의 거리 (구간 안이면 0, 아니면 가까운 끝까지의 거리)"""
+    if start <= estimated_start < end:
+        return 0
+    return min(abs(start - estimated_start), abs(end - estimated_start))
+
+
+def _best_candidate(word_index, candidates: range, forms: list, target: str, target_jamo: str, estimated_start: int,
+                    max_distance: int, cache: dict):
+    """
+    편집 거리가 1 이상 max_distance 이하인 후보 중 순위가 가장 높은 (첫 단어 인덱스, 마지막 단어 인덱스) (없으면 None)
+    편집 거리가 0인 후보는 _exact_candidate에서 먼저 찾으므로 여기서는 없다고 보고 계산합니다.
+    """
+    starts = word_index.starts
+    ends = word_index.ends
+    target_jamo_len = len(target_jamo)
+    target_len = len(target)
+    max_joined_len = target_len + max_distance
+    word_count = len(forms)
+
+    best = None
+    best_key = None
+    # 추정 위치에 가까운 후보부터 확인하여, 이후 후보는 더 좁은 허용 거리로 빨리 포기
+    for i in sorted(candidates, key=lambda i: abs(starts[i] - estimated_start)):
+        start = starts[i]
+        if start >= estimated_start:
+            start_offset = start - estimated_start
+            # 추정 위치 뒤에서 시작하는 후보는 이어 붙여도 추정 위치와의 거리가 같으므로,
+            # 이미 가장 작은 거리(1)의 후보가 더 가까우면 이길 수 없음
+            if best_key is not None and best_key[0] == 1 and start_offset > best_key[1]:
+                continue
+        else:
+            start_offset = estimated_start - start
+        word, joined_jamo, joined_len, jamo_len = forms[i]
+        # 단어 하나는 교정된 텍스트의 일부와 비교하므로 교정된 텍스트보다 짧은 만큼만 편집이 필요하고,
+        # 교정된 텍스트와 같은 단어는 오류가 아님
+        length_gap = target_jamo_len - jamo_len
+        if word and word != target and length_gap <= max_distance:
+            end = ends[i]
+            if start <= estimated_start < end:
+                offset = 0
+            else:
+                end_offset = end - estimated_start if end >= estimated_start else estimated_start - end
+                offset = start_offset if start_offset < end_offset else end_offset
+            limit = max_distance
+            if best_key is not None:
+                limit = best_key[0] if offset <= best_key[1] else best_key[0] - 1
+                if limit > max_distance:
+                    limit = max_distance
+            # 편집 거리가 0인 후보는 없으므로 하한은 1
+            if limit >= 1 and limit >= length_gap:
+                distance = _cached_distance(cache, target_jamo, joined_jamo, limit, True)
+                if distance <= limit:
+                    rank = (distance, offset, abs(joined_len - target_len), i, i)
+                    if best_key is None or rank < best_key:
+                        best_key = rank
+                        best = (i, i)
+
+        # 이어진 단어들은 전체를 비교하므로 자모 길이 차이만큼 편집이 필요
+        for j in range(i + 1, min(i + MAX_JOINED_WORDS, word_count)):
+            _, jamo, length, _ = forms[j]
+            joined_len += length
+            if not joined_len:
+                continue
+            joined_jamo += jamo
+            length_gap = len(joined_jamo) - target_jamo_len
+            if joined_len > max_joined_len or length_gap > max_distance:
+                # 더 이어 붙이면 길이 차이가 더 커지므로 중단
+                break
+            if length_gap < 0:
+                length_gap = -length_gap
+                if length_gap > max_distance:
+                    continue
+            elif length_gap == 0:
+                length_gap = 1
+
+            end = ends[j]
+            if start <= estimated_start < end:
+                offset = 0
+            else:
+                end_offset = end - estimated_start if end >= estimated_start else estimated_start - end
+                offset = start_offset if start_offset < end_offset else end_offset
+
+            # 지금까지 가장 좋은 후보를 이길 수 있는 최대 거리
+            limit = max_distance
+            if best_key is not None:
+                beatable = best_key[0] if offset <= best_key[1] else best_key[0] - 1
+                if beatable < limit:
+                    limit = beatable
+                if limit < length_gap:
+                    continue
+
+            distance = _cached_distance(cache, target_jamo, joined_jamo, limit, False)
+            if distance > limit:
+                continue
+
+            rank = (distance, offset, abs(joined_len - target_len), i, j)
+            if best_key is None or rank < best_key:
+                best_key = rank
+                best = (i, j)
+
+    return best
+
+
+def _word_forms(cache: dict, word_index) -> list:
+    """
+    단어별 (공백/문장부호를 뺀 형태, 그 자모 분해 결과, 글자 수, 자모 수) 목록
+    같은 요청 안에서는 cache에 보관하여 재사용하고, 단어별 결과는 요청 사이에도 공유합니다.
+    """
+    forms = cache.get(word_index)
+    if forms is None:
+        forms = cache[word_index] = list(map(_word_form, word_index.words))
+    return forms
+
+
+@lru_cache(maxsize=65536)
+def _word_form(word: str) -> tuple:
+    """단어 하나(또는 교정된 텍스트)의 (공백/문장부호를 뺀 형태, 그 자모 분해 결과, 글자 수, 자모 수)"""
+    stripped = normalize(word)
+    jamo = to_jamo(stripped)
+    return stripped, jamo, len(stripped), len(jamo)
+
+
+def _cached_distance(cache: dict, pattern: str, text: str, limit: int, infix: bool) -> int:
+    """
+    bounded_distance 결과를 cache에 저장하여 재사용
+    저장된 값이 당시 허용 거리를 넘었던 결과면, 이번 허용 거리가 더 작거나 같을 때만 재사용합니다.
+    """
+    key = (pattern, text, infix)
+    cached = cache.get(key)
+    if cached is not None:
+        distance, cached_limit = cached
+        if distance <= cached_limit:
+            return distance
+        if limit <= cached_limit:
+            return limit + 1
+
+    distance = bounded_distance(pattern, text, limit, infix=infix)
+    cache[key] = (distance, limit)
+    return distance
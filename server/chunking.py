@@ -0,0 +1,113 @@
+"""
+긴 텍스트 분할/병합 유틸리티
+네이버 맞춤법 검사기의 500자 제한을 넘는 텍스트를 문장/줄 경계에서 나누고,
+청크별 검사 결과를 원본 텍스트 기준 오프셋으로 다시 합칩니다.
+"""
+import re
+
+from results import ResultBuilder, SpellResult
+
+# 문장 경계: 줄바꿈, 또는 문장부호 뒤의 공백
+_BOUNDARY_PATTERN = re.compile(r'\n+|(?<=[.?!。…])[ \t]+')
+
+
+def split_segments(text: str) -> list:
+    """
+    텍스트를 문장/줄 단위 구간 (start, end) 목록으로 분리
+    구간 앞뒤의 공백은 포함하지 않으며, 구간 사이의 공백/줄바꿈은 원본에 그대로 남습니다.
+    """
+    spans = []
+    pos = 0
+    for match in _BOUNDARY_PATTERN.finditer(text):
+        spans.append((pos, match.start()))
+        pos = match.end()
+    spans.append((pos, len(text)))
+
+    segments = []
+    for start, end in spans:
+        # 구간 앞뒤 공백 제거
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            segments.append((start, end))
+    return segments
+
+
+def _split_oversized(text: str, start: int, end: int, limit: int) -> list:
+    """limit보다 긴 단일 문장을 공백 위치에서 강제로 분할"""
+    pieces = []
+    while end - start > limit:
+        cut = text.rfind(' ', start + 1, start + limit + 1)
+        if cut == -1:
+            # 공백이 없으면 limit 위치에서 자름
+            cut = start + limit
+            pieces.append((start, cut))
+            start = cut
+        else:
+            pieces.append((start, cut))
+            start = cut + 1
+        while start < end and text[start].isspace():
+            start += 1
+    if start < end:
+        pieces.append((start, end))
+    return pieces
+
+
+def split_sentences(text: str, limit: int) -> list:
+    """문장/줄 단위 구간 목록 (limit보다 긴 문장은 공백 위치에서 나눔)"""
+    sentences = []
+    for start, end in split_segments(text):
+        if end - start > limit:
+            sentences.extend(_split_oversized(text, start, end, limit))
+        else:
+            sentences.append((start, end))
+    return sentences
+
+
+def pack_chunks(text: str, limit: int) -> list:
+    """
+    문장 구간들을 limit 이하 길이의 청크 (start, end) 목록으로 묶기
+    청크는 연속된 문장을 최대한 많이 담으며, 청크 사이의 구분자는 원본에 남습니다.
+    """
+    chunks = []
+    chunk_start = None
+    chunk_end = None
+
+    for seg_start, seg_end in split_sentences(text, limit):
+        if chunk_start is None:
+            chunk_start, chunk_end = seg_start, seg_end
+        elif seg_end - chunk_start <= limit:
+            chunk_end = seg_end
+        else:
+            chunks.append((chunk_start, chunk_end))
+            chunk_start, chunk_end = seg_start, seg_end
+
+    if chunk_start is not None:
+        chunks.append((chunk_start, chunk_end))
+    return chunks
+
+
+def merge_results(text: str, spans: list, results: list) -> SpellResult:
+    """
+    구간별 검사 결과(SpellResult)를 하나의 결과로 병합
+    checked 텍스트는 구간 사이의 원본 구분자를 유지하여 이어 붙이고,
+    오류의 start/end는 원본 텍스트 기준으로 이동합니다.
+    """
+    checked_parts = []
+    builder = ResultBuilder(text)
+    error_count = 0
+    pos = 0
+
+    for (start, end), result in zip(spans, results):
+        checked_parts.append(text[pos:start])
+        checked_parts.append(result.checked)
+        pos = end
+
+        builder.extend(result, offset=start)
+        error_count += result.error_count
+
+    checked_parts.append(text[pos:])
+
+    return builder.build(''.join(checked_parts), error_count)
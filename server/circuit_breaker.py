@@ -0,0 +1,185 @@
+"""
+업스트림(네이버) 호출 서킷 브레이커
+최근 호출의 실패율이나 느린 호출 비율이 기준을 넘으면 일정 시간 동안 호출을 막고(open) 즉시 실패시킵니다.
+차단 시간이 지나면 소수의 시험 호출만 허용하며(half-open), 모두 성공하면 다시 정상(closed)으로,
+하나라도 실패하거나 느리면 다시 차단합니다.
+
+네이버가 느려지거나 요청을 제한할 때 모든 요청이 업스트림 타임아웃까지 기다리며 워커를 점유하지 않도록 합니다.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+# 0이면 서킷 브레이커를 사용하지 않음 (항상 호출 허용)
+UPSTREAM_BREAKER_ENABLED = os.environ.get('UPSTREAM_BREAKER_ENABLED', '1') == '1'
+# 실패율/느린 호출 비율을 계산할 최근 호출 수
+UPSTREAM_BREAKER_WINDOW = int(os.environ.get('UPSTREAM_BREAKER_WINDOW', '20'))
+# 비율을 판단하기 위한 최소 호출 수
+UPSTREAM_BREAKER_MIN_CALLS = int(os.environ.get('UPSTREAM_BREAKER_MIN_CALLS', '10'))
+# 이 비율 이상 실패하면 차단
+UPSTREAM_BREAKER_FAILURE_RATE = float(os.environ.get('UPSTREAM_BREAKER_FAILURE_RATE', '0.5'))
+# 이 시간(초) 이상 걸린 호출은 느린 호출
+UPSTREAM_BREAKER_SLOW_CALL_SECONDS = float(os.environ.get('UPSTREAM_BREAKER_SLOW_CALL_SECONDS', '3'))
+# 이 비율 이상이 느린 호출이면 차단
+UPSTREAM_BREAKER_SLOW_CALL_RATE = float(os.environ.get('UPSTREAM_BREAKER_SLOW_CALL_RATE', '0.8'))
+# 차단 후 시험 호출을 허용하기까지 대기 시간(초)
+UPSTREAM_BREAKER_OPEN_SECONDS = float(os.environ.get('UPSTREAM_BREAKER_OPEN_SECONDS', '30'))
+# half-open 상태에서 허용하는 시험 호출 수 (모두 성공하면 정상으로 복귀)
+UPSTREAM_BREAKER_HALF_OPEN_CALLS = int(os.environ.get('UPSTREAM_BREAKER_HALF_OPEN_CALLS', '3'))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 업스트림을 호출하지 않고 바로 실패"""
+
+
+class CircuitBreaker:
+    """
+    실패율/느린 호출 비율 기반 서킷 브레이커 (스레드 안전)
+
+    호출 전에 before_call()로 허용 여부를 확인하고(차단 중이면 CircuitOpenError),
+    호출이 끝나면 돌려받은 토큰과 함께 record()로 결과를 기록합니다.
+    상태가 바뀐 뒤에 끝난 이전 상태의 호출 결과는 무시합니다.
+    """
+
+    def __init__(self, name: str, window: int = UPSTREAM_BREAKER_WINDOW, min_calls: int = UPSTREAM_BREAKER_MIN_CALLS,
+                 failure_rate: float = UPSTREAM_BREAKER_FAILURE_RATE,
+                 slow_call_seconds: float = UPSTREAM_BREAKER_SLOW_CALL_SECONDS,
+                 slow_call_rate: float = UPSTREAM_BREAKER_SLOW_CALL_RATE,
+                 open_seconds: float = UPSTREAM_BREAKER_OPEN_SECONDS,
+                 half_open_calls: int = UPSTREAM_BREAKER_HALF_OPEN_CALLS,
+                 enabled: bool = UPSTREAM_BREAKER_ENABLED, clock=time.monotonic):
+        self.name = name
+        self.min_calls = max(1, min(min_calls, window))
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = max(1, half_open_calls)
+        self.enabled = enabled
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        # 상태가 바뀔 때마다 증가 (이전 상태에서 시작한 호출의 결과를 구분)
+        self._generation = 0
+        # 최근 호출 결과 (실패 여부, 느린 호출 여부)
+        self._outcomes = deque(maxlen=max(1, window))
+        self._failures = 0
+        self._slow_calls = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._expire_open(self._clock())
+            return self._state
+
+    def fail_fast(self):
+        """
+        지금 호출하면 거부될 상태이면 바로 CircuitOpenError 발생 (시험 호출 수는 소비하지 않음)
+        호출 전 준비 작업(passport key 발급 등)도 기다리지 않도록 호출 경로 맨 앞에서 사용합니다.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._expire_open(self._clock())
+            if self._state == OPEN or (self._state == HALF_OPEN and
+                                       self._probes_in_flight + self._probe_successes >= self.half_open_calls):
+                self.rejected += 1
+                raise CircuitOpenError(f'{self.name} 호출이 일시적으로 차단되었습니다.')
+
+    def before_call(self) -> int:
+        """호출 허용 여부 확인 (거부되면 CircuitOpenError), record()에 넘길 토큰 반환"""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            self._expire_open(self._clock())
+            if self._state == OPEN:
+                self.rejected += 1
+                raise CircuitOpenError(f'{self.name} 호출이 일시적으로 차단되었습니다.')
+            if self._state == HALF_OPEN:
+                if self._probes_in_flight + self._probe_successes >= self.half_open_calls:
+                    self.rejected += 1
+                    raise CircuitOpenError(f'{self.name} 호출이 일시적으로 차단되었습니다 (시험 호출 중).')
+                self._probes_in_flight += 1
+            return self._generation
+
+    def record(self, token: int, success: bool, duration: float):
+        """before_call()로 허용된 호출의 결과 기록 (success가 False이면 실패, duration이 길면 느린 호출)"""
+        if not self.enabled:
+            return
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            if token != self._generation:
+                return
+            now = self._clock()
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if not success or slow:
+                    self._open(now)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_calls:
+                        self._transition(CLOSED)
+                return
+            if self._state != CLOSED:
+                return
+
+            if len(self._outcomes) == self._outcomes.maxlen:
+                old_failed, old_slow = self._outcomes[0]
+                self._failures -= old_failed
+                self._slow_calls -= old_slow
+            self._outcomes.append((not success, slow))
+            self._failures += not success
+            self._slow_calls += slow
+
+            calls = len(self._outcomes)
+            if calls >= self.min_calls and (self._failures / calls >= self.failure_rate
+                                            or self._slow_calls / calls >= self.slow_call_rate):
+                self._open(now)
+
+    def _expire_open(self, now: float):
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+
+    def _open(self, now: float):
+        self._transition(OPEN)
+        self._opened_at = now
+        self.opened += 1
+
+    def _transition(self, state: str):
+        self._state = state
+        self._generation += 1
+        self._outcomes.clear()
+        self._failures = 0
+        self._slow_calls = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._expire_open(self._clock())
+            calls = len(self._outcomes)
+            return {
+                'enabled': self.enabled,
+                'state': self._state,
+                'recentCalls': calls,
+                'failureRate': round(self._failures / calls, 4) if calls else 0.0,
+                'slowCallRate': round(self._slow_calls / calls, 4) if calls else 0.0,
+                'opened': self.opened,
+                'rejected': self.rejected,
+            }
+
+
+# 네이버 맞춤법 검사기 호출에 사용하는 서킷 브레이커 (프로세스 전체에서 공유)
+upstream_breaker = CircuitBreaker('네이버 맞춤법 검사기')
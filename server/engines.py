@@ -0,0 +1,109 @@
+"""
+맞춤법 검사 엔진
+요청의 engine 값(이름 또는 별칭)으로 검사에 사용할 엔진을 고릅니다.
+- 네이버: 네이버 맞춤법 검사기 SpellerProxy를 직접 호출 (app.py)
+- hanspell: py-hanspell의 spell_checker.check로 검사 (app.py)
+- 로컬: 네트워크 없이 프로세스 안에서 규칙/사전으로 검사 (local_rules.py)
+
+엔진은 한 번에 검사할 수 있는 최대 글자 수(max_length)를 알려 주며, 서버는 이보다 긴 텍스트를
+청크로 나누어 검사합니다. max_length가 None인 엔진은 텍스트 전체를 한 번에 검사합니다.
+
+로컬 엔진은 서버 없이도 사용할 수 있습니다 (대량 검사용):
+    from engines import local_engine
+    results = [local_engine.check(text).as_dict() for text in texts]
+"""
+import asyncio
+
+from local_rules import check_locally
+from results import SpellResult
+
+
+class UnknownEngineError(ValueError):
+    """등록되지 않은 엔진 이름"""
+
+
+class Engine:
+    """
+    검사 엔진 공통 인터페이스
+    check()는 SpellResult(results.py)를 반환하며, 오류 위치(start/end)는 넘겨받은 텍스트 기준입니다.
+    응답 JSON은 SpellResult.as_dict()로 만듭니다.
+    """
+
+    # 응답과 캐시 키에 사용하는 대표 이름
+    name = None
+    # 요청에서 대표 이름 대신 사용할 수 있는 이름 (대소문자 구분 없음)
+    aliases = ()
+    # 한 번에 검사할 수 있는 최대 글자 수 (None이면 제한 없음)
+    max_length = None
+    # 업스트림을 호출하는지 여부 (차단/대기열 초과 시 로컬 규칙 결과로 대체)
+    remote = False
+    # 결과 캐시 사용 여부 (캐시 조회보다 검사가 빠른 엔진은 캐시하지 않음)
+    cacheable = True
+
+    def check(self, text: str) -> SpellResult:
+        raise NotImplementedError
+
+    async def check_async(self, text: str) -> SpellResult:
+        """check()의 비동기 버전 (기본 구현은 워커 스레드에서 check() 실행)"""
+        return await asyncio.to_thread(self.check, text)
+
+    def info(self) -> dict:
+        return {
+            'name': self.name,
+            'aliases': list(self.aliases),
+            'maxLength': self.max_length,
+            'remote': self.remote,
+        }
+
+
+class LocalEngine(Engine):
+    """
+    네트워크 없이 로컬 규칙/사전으로 검사 (local_rules.py)
+    정규식 하나로 텍스트를 한 번만 훑으므로 한 프로세스에서 초당 수천 건 이상 검사할 수 있습니다.
+    """
+
+    name = '로컬'
+    aliases = ('local', 'offline', '오프라인')
+    cacheable = False
+
+    def check(self, text: str) -> SpellResult:
+        return check_locally(text)
+
+    async def check_async(self, text: str) -> SpellResult:
+        # 충분히 빨라서 워커 스레드로 넘기는 비용이 더 큼
+        return check_locally(text)
+
+
+class EngineRegistry:
+    """이름/별칭 → 엔진 (첫 번째 엔진이 기본값)"""
+
+    def __init__(self, engines):
+        self._engines = list(engines)
+        self._by_name = {}
+        for engine in self._engines:
+            for name in (engine.name,) + tuple(engine.aliases):
+                self._by_name[name.lower()] = engine
+
+    @property
+    def default(self) -> Engine:
+        return self._engines[0]
+
+    def get(self, name) -> Engine:
+        """name(이름, 별칭 또는 엔진 객체)에 해당하는 엔진, 비어 있으면 기본 엔진 (없으면 UnknownEngineError)"""
+        if isinstance(name, Engine):
+            return name
+        key = (name or '').strip().lower() if isinstance(name, str) else name
+        if not key:
+            return self.default
+        engine = self._by_name.get(key) if isinstance(key, str) else None
+        if engine is None:
+            names = ', '.join(engine.name for engine in self._engines)
+            raise UnknownEngineError(f'지원하지 않는 엔진입니다: {name} (사용 가능: {names})')
+        return engine
+
+    def info(self) -> list:
+        return [engine.info() for engine in self._engines]
+
+
+# 프로세스 전체에서 공유하는 로컬 엔진 (상태가 없으므로 하나만 사용)
+local_engine = LocalEngine()
@@ -0,0 +1,131 @@
+"""
+업스트림(네이버) 호출용 공유 HTTP 클라이언트
+프로세스 전체에서 하나의 requests.Session을 재사용하여 TCP/TLS 연결을 유지(keep-alive)하고,
+연결이 재사용된 횟수와 새로 열린 횟수를 집계합니다.
+비동기(ASGI) 모드의 httpx.AsyncClient는 count_async_request를 이벤트 훅으로 등록하여 같은 통계에 집계합니다.
+"""
+import os
+import socket
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# 캐시할 호스트별 연결 풀 개수
+POOL_CONNECTIONS = int(os.environ.get('UPSTREAM_POOL_CONNECTIONS', '10'))
+# 호스트 하나당 유지할 최대 연결 수
+POOL_MAXSIZE = int(os.environ.get('UPSTREAM_POOL_MAXSIZE', '32'))
+# 호스트당 연결이 모두 사용 중일 때 새 연결을 열지 않고 대기할지 여부
+POOL_BLOCK = os.environ.get('UPSTREAM_POOL_BLOCK', '0') == '1'
+# 업스트림 요청 하나의 최대 대기 시간(초)
+UPSTREAM_TIMEOUT = float(os.environ.get('UPSTREAM_TIMEOUT', '10'))
+# 유휴 연결이 끊기지 않도록 TCP keep-alive 사용 여부
+TCP_KEEPALIVE = os.environ.get('UPSTREAM_TCP_KEEPALIVE', '1') == '1'
+
+
+class _ConnectionStats:
+    """업스트림 요청 수와 새로 열린 연결 수 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_new_connection(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            requests_count = self.requests
+            new_connections = self.new_connections
+        reused = max(requests_count - new_connections, 0)
+        return {
+            'requests': requests_count,
+            'newConnections': new_connections,
+            'reusedConnections': reused,
+            'reuseRatio': round(reused / requests_count, 4) if requests_count else 0.0
+        }
+
+
+_stats = _ConnectionStats()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _stats.record_new_connection()
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _stats.record_new_connection()
+        return super()._new_conn()
+
+
+class _PooledAdapter(HTTPAdapter):
+    """연결 생성/재사용 횟수를 집계하는 HTTPAdapter"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        if TCP_KEEPALIVE:
+            kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        _stats.record_request()
+        return super().send(request, **kwargs)
+
+
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    adapter = _PooledAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=POOL_BLOCK
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['connection'] = 'keep-alive'
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """모든 업스트림 호출이 공유하는 세션 반환 (최초 호출 시 생성)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+
+async def _trace_async_connection(event_name: str, info: dict):
+    if event_name == 'connection.connect_tcp.complete':
+        _stats.record_new_connection()
+
+
+async def count_async_request(request):
+    """httpx.AsyncClient의 request 이벤트 훅 (요청 수를 세고 새로 연 연결을 httpcore trace로 집계)"""
+    _stats.record_request()
+    request.extensions['trace'] = _trace_async_connection
+
+
+def get_connection_stats() -> dict:
+    """업스트림 연결 재사용 통계 (requests 세션과 비동기 클라이언트 합계)"""
+    return _stats.snapshot()
@@ -0,0 +1,91 @@
+"""
+로컬 규칙 기반 맞춤법 검사 (로컬 엔진, 업스트림을 사용할 수 없을 때의 최소 검사)
+자주 틀리는 표현을 정규식 규칙과 오탈자 사전으로 찾아 네이버 검사 결과와 같은 형식으로 돌려줍니다.
+규칙은 하나의 정규식으로 합쳐 텍스트를 한 번만 훑으며, 같은 위치에서는 앞쪽 규칙이 우선합니다.
+"""
+import re
+from collections import namedtuple
+
+from results import ResultBuilder, SpellResult
+
+Rule = namedtuple('Rule', ['pattern', 'suggestions', 'error_type'])
+
+# (정규식, 교정 후보, 오류 유형) - 긴 표현을 먼저 두어 "안되요"가 "되요"보다 먼저 맞도록 함
+RULES = (
+    Rule(r'안되요', ['안 돼요', '안 되어요'], '맞춤법'),
+    Rule(r'안돼(?=요|[.!?\s]|$)', ['안 돼'], '띄어쓰기'),
+    Rule(r'안되(?=[고는니면지])', ['안 되'], '띄어쓰기'),
+    Rule(r'않되', ['안 되'], '맞춤법'),
+    Rule(r'되요', ['돼요', '되어요'], '맞춤법'),
+    Rule(r'되서', ['돼서', '되어서'], '맞춤법'),
+    Rule(r'됬', ['됐'], '맞춤법'),
+    Rule(r'(?<=[할갈줄볼올될알살])께(?=요|[.!?\s]|$)', ['게'], '맞춤법'),
+    Rule(r'읍니다', ['습니다'], '맞춤법'),
+    Rule(r'몇일', ['며칠'], '맞춤법'),
+    Rule(r'어떻해', ['어떡해'], '맞춤법'),
+    Rule(r'웬지', ['왠지'], '맞춤법'),
+    Rule(r'금새', ['금세'], '맞춤법'),
+    Rule(r'설겆이', ['설거지'], '맞춤법'),
+)
+
+# 자주 틀리는 단어 → 올바른 표기 (틀린 표기가 다른 단어의 일부로 쓰이지 않는 것만)
+DICTIONARY = {
+    '오랫만': '오랜만',
+    '왠만하면': '웬만하면',
+    '왠만한': '웬만한',
+    '희안하': '희한하',
+    '어의없': '어이없',
+    '역활': '역할',
+    '일일히': '일일이',
+    '깨끗히': '깨끗이',
+    '곰곰히': '곰곰이',
+    '틈틈히': '틈틈이',
+    '내노라하는': '내로라하는',
+    '설레임': '설렘',
+    '뵈요': '봬요',
+    '않돼': '안 돼',
+    '할려고': '하려고',
+    '댓가': '대가',
+    '갯수': '개수',
+}
+
+RULES = RULES + tuple(Rule(re.escape(wrong), [right], '맞춤법') for wrong, right in DICTIONARY.items())
+
+_COMBINED_PATTERN = re.compile('|'.join(f'(?P<r{i}>{rule.pattern})' for i, rule in enumerate(RULES)))
+
+
+def _iter_matches(text: str):
+    """규칙에 맞는 위치마다 (match, 규칙)"""
+    for match in _COMBINED_PATTERN.finditer(text):
+        yield match, RULES[int(match.lastgroup[1:])]
+
+
+def find_errors(text: str) -> list:
+    """규칙에 맞는 모든 오류 ({'start', 'end', 'original', 'suggestions', 'errorType'}) 목록"""
+    errors = []
+    for match, rule in _iter_matches(text):
+        errors.append({
+            'start': match.start(),
+            'end': match.end(),
+            'original': match.group(),
+            'suggestions': list(rule.suggestions),
+            'errorType': rule.error_type
+        })
+    return errors
+
+
+def check_locally(text: str) -> SpellResult:
+    """
+    로컬 규칙으로 검사한 결과 (오류 딕셔너리를 만들지 않고 바로 SpellResult로 기록)
+    checked는 각 오류를 첫 번째 교정 후보로 바꾼 텍스트입니다.
+    """
+    builder = ResultBuilder(text)
+    parts = []
+    last = 0
+    for match, rule in _iter_matches(text):
+        builder.add(match.start(), match.end(), rule.error_type, rule.suggestions)
+        parts.append(text[last:match.start()])
+        parts.append(rule.suggestions[0])
+        last = match.end()
+    parts.append(text[last:])
+    return builder.build(''.join(parts), len(builder))
@@ -0,0 +1,137 @@
+"""
+서버 로깅 설정
+모든 서버 로그는 'spellcheck' 로거 아래에 기록되며, 요청 처리 스레드는 로그 레코드를 메모리 큐에 넣기만 하고
+실제 출력(stdout)은 별도 스레드(QueueListener)가 담당합니다. 큐가 가득 차면 기다리지 않고 레코드를 버립니다.
+
+요청별 상세 로그(원본/교정 텍스트, 오류 태그별 결과)는 DEBUG 수준이며 기본값(INFO)에서는 기록하지 않습니다.
+DEBUG를 켜도 LOG_DEBUG_SAMPLE_RATE 비율의 요청만 상세 로그를 남깁니다 (debug_sampled() 참고).
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# 기록할 최소 수준 (DEBUG, INFO, WARNING, ERROR)
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+# 출력 형식: text 또는 json (한 줄에 JSON 객체 하나)
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')
+# DEBUG 수준일 때 상세 로그를 남길 요청 비율 (0~1)
+LOG_DEBUG_SAMPLE_RATE = float(os.environ.get('LOG_DEBUG_SAMPLE_RATE', '1.0'))
+# 출력 대기 중인 로그 레코드 최대 개수 (넘으면 버림)
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+
+ROOT_LOGGER_NAME = 'spellcheck'
+
+# LogRecord 기본 속성 (JSON 형식에서 extra로 넘긴 필드만 골라내기 위해 사용)
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 JSON 한 줄로 변환 (logger.info(..., extra={...})의 필드 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """큐가 가득 차면 기다리지 않고 레코드를 버리는 QueueHandler (버린 개수 집계)"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_lock = threading.Lock()
+_handler = None
+_listener = None
+
+
+def _output_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    return handler
+
+
+def _start_listener():
+    """새 큐와 출력 스레드를 시작하여 _handler에 연결"""
+    global _listener
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _handler.queue = log_queue
+    _listener = QueueListener(log_queue, _output_handler())
+    _listener.start()
+
+
+def configure_logging():
+    """'spellcheck' 로거에 큐 핸들러를 연결하고 출력 스레드 시작 (여러 번 호출해도 한 번만 설정)"""
+    global _handler
+    with _lock:
+        if _handler is not None:
+            return
+        _handler = _DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+        _start_listener()
+
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        root.setLevel(LOG_LEVEL)
+        root.addHandler(_handler)
+        root.propagate = False
+
+        # 종료 시 큐에 남은 레코드를 모두 출력
+        atexit.register(_stop_listener)
+        # fork된 자식 프로세스(gunicorn 워커 등)에는 출력 스레드가 없으므로 새로 시작
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_start_listener)
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """'spellcheck.<name>' 로거"""
+    return logging.getLogger(f'{ROOT_LOGGER_NAME}.{name}')
+
+
+def debug_sampled(logger: logging.Logger) -> bool:
+    """
+    이번 작업(요청)의 상세 로그를 남길지 여부
+    DEBUG가 꺼져 있으면 바로 False이므로, 상세 로그는 이 값을 한 번 확인한 뒤에만 만들도록 합니다.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return False
+    return LOG_DEBUG_SAMPLE_RATE >= 1.0 or random.random() < LOG_DEBUG_SAMPLE_RATE
+
+
+def get_logging_stats() -> dict:
+    """로그 큐 현황 (대기 중인 레코드 수, 큐가 가득 차서 버린 레코드 수)"""
+    if _handler is None:
+        return {'queued': 0, 'dropped': 0}
+    return {'queued': _handler.queue.qsize(), 'dropped': _handler.dropped}
+
+
+configure_logging()
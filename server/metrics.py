@@ -0,0 +1,290 @@
+"""
+서버 지표 (Prometheus 텍스트 형식)
+카운터/게이지/히스토그램을 프로세스 메모리에 집계하고 GET /metrics에서 Prometheus 텍스트 형식(0.0.4)으로 내보냅니다.
+캐시 적중률이나 연결 재사용 수처럼 다른 객체가 이미 집계하는 값은 조회 시점에 콜백으로 읽습니다.
+
+주의: 지표는 워커 프로세스마다 따로 집계됩니다 (serve.py 참고).
+여러 워커로 실행할 때는 워커별 값을 합산하도록 스크레이프 대상을 구성해야 합니다.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# 업스트림 호출 시간 구간(초)
+UPSTREAM_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0, 10.0)
+# HTML 파싱/오류 추출 시간 구간(초)
+PARSE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+# 업스트림 호출 대기(속도 제한) 시간 구간(초)
+QUEUE_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
+# API 요청 처리 시간 구간(초)
+REQUEST_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+class _Metric:
+    """지표 공통 부분 (이름, 설명, 레이블 이름, 레이블 값별 값)"""
+
+    type_name = None
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children = {}
+        # 레이블이 없는 지표는 관측 전에도 0으로 내보냄
+        if not self.labelnames and type(self)._new_child is not _Metric._new_child:
+            self._children[()] = self._new_child()
+
+    def labels(self, *values):
+        """레이블 값에 해당하는 지표 (처음 사용하면 생성)"""
+        values = tuple(str(value) for value in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f'{self.name}: 레이블 값은 {len(self.labelnames)}개여야 합니다.')
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _items(self) -> list:
+        """(레이블 값, 값) 목록 (레이블 값 순)"""
+        with self._lock:
+            return sorted(self._children.items())
+
+    def _default(self):
+        """레이블이 없는 지표의 값"""
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self):
+        """(이름 접미사, 레이블 이름, 레이블 값, 값) 목록"""
+        raise NotImplementedError
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.type_name}']
+        for suffix, names, values, value in self.samples():
+            lines.append(f'{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}')
+        return lines
+
+
+class _Value:
+    """잠금으로 보호되는 숫자 하나"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = value
+
+
+class Counter(_Metric):
+    """증가만 하는 누적 값"""
+
+    type_name = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self._default().inc(amount)
+
+    def samples(self):
+        for values, child in self._items():
+            yield '', self.labelnames, values, child.value
+
+
+class Gauge(_Metric):
+    """늘거나 줄어드는 현재 값 (진행 중인 요청 수 등)"""
+
+    type_name = 'gauge'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1):
+        self._default().dec(amount)
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def samples(self):
+        for values, child in self._items():
+            yield '', self.labelnames, values, child.value
+
+
+class _HistogramValue:
+    """구간별 관측 횟수, 합계, 개수"""
+
+    def __init__(self, buckets: tuple):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        """with 블록 실행 시간(초)을 관측"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    """관측 값의 분포 (지연 시간 등), 구간은 누적(le) 형식으로 내보냄"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = REQUEST_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+    def samples(self):
+        bucket_names = self.labelnames + ('le',)
+        for values, child in self._items():
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                yield '_bucket', bucket_names, values + (_format_value(bound),), cumulative
+            yield '_sum', self.labelnames, values, total
+            yield '_count', self.labelnames, values, cumulative
+
+
+class CallbackMetric(_Metric):
+    """
+    조회 시점에 콜백으로 값을 읽는 지표
+    callback은 레이블이 없으면 숫자 하나를, 있으면 {레이블 값 튜플: 숫자} 딕셔너리를 반환합니다.
+    """
+
+    def __init__(self, name: str, help_text: str, type_name: str, callback, labelnames: tuple = ()):
+        super().__init__(name, help_text, labelnames)
+        self.type_name = type_name
+        self._callback = callback
+
+    def samples(self):
+        result = self._callback()
+        if not self.labelnames:
+            yield '', (), (), result
+            return
+        for values, value in sorted(result.items()):
+            yield '', self.labelnames, tuple(str(label) for label in values), value
+
+
+class Registry:
+    """지표 목록 (등록 순서대로 내보냄)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'이미 등록된 지표입니다: {metric.name}')
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: tuple = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: tuple = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = REQUEST_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def callback(self, name: str, help_text: str, type_name: str, callback, labelnames: tuple = ()) -> CallbackMetric:
+        return self.register(CallbackMetric(name, help_text, type_name, callback, labelnames))
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+# 텍스트 형식 응답의 Content-Type
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 프로세스 전체에서 공유하는 지표 목록
+registry = Registry()
+
+# API 요청
+REQUESTS = registry.counter(
+    'spellcheck_requests_total', 'API 요청 수 (경로, HTTP 상태 코드별)', ('endpoint', 'status'))
+REQUEST_LATENCY = registry.histogram(
+    'spellcheck_request_duration_seconds', 'API 요청 처리 시간(초)', ('endpoint',))
+IN_FLIGHT = registry.gauge(
+    'spellcheck_requests_in_flight', '처리 중인 API 요청 수', ('endpoint',))
+# 텍스트 하나의 검사 결과 (배치/스트리밍 항목 포함)
+CHECKS = registry.counter(
+    'spellcheck_checks_total', '텍스트 검사 수 (ok, degraded, invalid, error)', ('result',))
+
+# 업스트림(네이버) 호출
+UPSTREAM_LATENCY = registry.histogram(
+    'spellcheck_upstream_duration_seconds', '네이버 맞춤법 검사기 호출 시간(초)', buckets=UPSTREAM_BUCKETS)
+UPSTREAM_ERRORS = registry.counter(
+    'spellcheck_upstream_errors_total', '네이버 맞춤법 검사기 호출 실패 수 (timeout, connection, http, api)', ('reason',))
+
+UPSTREAM_QUEUE_LATENCY = registry.histogram(
+    'spellcheck_upstream_queue_seconds', '속도 제한으로 네이버 호출 전에 대기한 시간(초)', buckets=QUEUE_BUCKETS)
+
+# 응답 HTML 파싱 및 오류 추출
+PARSE_LATENCY = registry.histogram(
+    'spellcheck_parse_duration_seconds', '응답 HTML 파싱 및 오류 추출 시간(초)', buckets=PARSE_BUCKETS)
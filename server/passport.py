@@ -0,0 +1,233 @@
+"""
+네이버 맞춤법 검사기 passport key 관리
+passport key를 프로세스 안에서 발급/보관하고, 만료 전에 백그라운드에서 미리 갱신합니다.
+여러 요청이 동시에 만료된 키를 발견해도 네이버 검색 페이지는 한 번만 조회합니다(single-flight).
+"""
+import os
+import re
+import threading
+import time
+from urllib.parse import unquote
+
+from http_client import UPSTREAM_TIMEOUT, get_session
+from log import get_logger
+
+logger = get_logger('passport')
+
+# passport key 유효 시간(초)
+PASSPORT_KEY_TTL = float(os.environ.get('PASSPORT_KEY_TTL', '3600'))
+# 만료 몇 초 전에 백그라운드에서 미리 갱신할지
+PASSPORT_KEY_REFRESH_MARGIN = float(os.environ.get('PASSPORT_KEY_REFRESH_MARGIN', '300'))
+# 발급 실패 또는 빈 키를 받은 경우 다시 시도하기까지 대기 시간(초)
+PASSPORT_KEY_RETRY_INTERVAL = float(os.environ.get('PASSPORT_KEY_RETRY_INTERVAL', '30'))
+
+# passport key를 담은 검색 결과 페이지 (벤치마크에서는 benchmarks/mock_upstream.py 주소로 바꿈)
+SEARCH_URL = os.environ.get(
+    'PASSPORT_SEARCH_URL',
+    'https://search.naver.com/search.naver?where=nexearch&sm=top_hty&fbm=1&ie=utf8&query=맞춤법검사기')
+
+_SEARCH_HEADERS = {
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+}
+
+
+def fetch_passport_key() -> str:
+    """
+    네이버 검색 페이지에서 맞춤법검사기 검색 후 passport key 추출
+    키를 찾지 못하면 빈 문자열을 반환하고, 페이지 접근에 실패하면 예외를 발생시킵니다.
+    """
+    response = get_session().get(SEARCH_URL, headers=_SEARCH_HEADERS, timeout=UPSTREAM_TIMEOUT)
+
+    if response.status_code != 200:
+        raise Exception(f"네이버 검색 페이지 접근 실패: HTTP {response.status_code}")
+
+    # 응답 데이터에서 passport key 추출: /passportKey=([a-zA-Z0-9]+)/
+    response_data = response.text
+    match = re.search(r'passportKey=([a-zA-Z0-9]+)', response_data)
+
+    passport_key = None
+    if match:
+        # URI 디코딩하여 passport key 추출
+        passport_key = unquote(match.group(1))
+        logger.info("passport key 발급 성공: %s...", passport_key[:20])
+    else:
+        logger.warning("passport key를 찾지 못했습니다.")
+        # 다른 패턴도 시도
+        alternative_patterns = [
+            r'passportKey["\']?\s*[:=]\s*["\']([^"\']+)["\']',
+            r'passportKey=([^&\s"\']+)',
+        ]
+
+        for pattern in alternative_patterns:
+            alt_match = re.search(pattern, response_data, re.IGNORECASE)
+            if alt_match:
+                passport_key = alt_match.group(1)
+                logger.info("passport key 발급 성공 (대체 패턴): %s...", passport_key[:20])
+                break
+
+    # passport key를 찾지 못한 경우, 빈 문자열 사용
+    if not passport_key:
+        passport_key = ''
+        logger.warning("passport key를 찾지 못해 빈 문자열을 반환합니다.")
+
+    return passport_key
+
+
+class PassportKeyManager:
+    """
+    passport key 보관 및 갱신 관리자
+    - get_key(): 유효한 키 반환 (만료된 경우에만 동기 갱신)
+    - cached_key(): 갱신 없이 바로 쓸 수 있는 키 반환 (없으면 None)
+    - refresh(): 새 키 발급 (동시 호출은 하나의 발급을 함께 기다림)
+    - invalidate(key): 네이버가 거부한 키를 버리고 새 키 발급
+    """
+
+    def __init__(self, fetcher=fetch_passport_key, ttl=PASSPORT_KEY_TTL,
+                 refresh_margin=PASSPORT_KEY_REFRESH_MARGIN, retry_interval=PASSPORT_KEY_RETRY_INTERVAL):
+        self._fetcher = fetcher
+        self._ttl = ttl
+        self._refresh_margin = min(refresh_margin, ttl / 2)
+        self._retry_interval = retry_interval
+
+        self._cond = threading.Condition()
+        self._key = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._refreshing = False
+        self._last_error = None
+
+        # 네이버 검색 페이지를 실제로 조회한 횟수와 그중 실패한 횟수
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+        self._background = None
+        self._stop = threading.Event()
+
+    def get_key(self) -> str:
+        """
+        현재 passport key 반환
+        키가 없거나 만료된 경우 갱신하며, 갱신에 실패하면 기존 키(없으면 빈 문자열)를 반환합니다.
+        """
+        key = self.cached_key()
+        if key is not None:
+            return key
+        try:
+            return self.refresh()
+        except Exception as e:
+            logger.warning("passport key 발급 실패: %s", e)
+            with self._cond:
+                return self._key or ''
+
+    def cached_key(self):
+        """
+        보관 중인 유효한 passport key (없거나 만료되었으면 None)
+        발급을 기다리지 않으므로 이벤트 루프에서 바로 호출할 수 있으며, None이면 get_key()로 갱신합니다.
+        """
+        self._ensure_background()
+        with self._cond:
+            if self._key is not None and time.monotonic() < self._expires_at:
+                return self._key
+        return None
+
+    def invalidate(self, rejected_key: str) -> str:
+        """네이버가 거부한 키를 버리고 새 키 반환 (이미 다른 요청이 갱신했다면 그 키를 사용)"""
+        return self.refresh(stale_key=rejected_key)
+
+    def refresh(self, stale_key=None) -> str:
+        """
+        새 passport key 발급
+        다른 스레드가 이미 발급 중이면 새로 조회하지 않고 그 결과를 기다립니다.
+        stale_key가 주어졌고 현재 키가 이미 그 키와 다르면 현재 키를 그대로 반환합니다.
+        """
+        with self._cond:
+            if stale_key is not None and self._key is not None and self._key != stale_key:
+                return self._key
+
+            if self._refreshing:
+                # 진행 중인 발급 결과 대기
+                while self._refreshing:
+                    self._cond.wait()
+                if self._last_error is not None:
+                    raise self._last_error
+                return self._key or ''
+
+            self._refreshing = True
+
+        key = None
+        error = None
+        try:
+            key = self._fetcher()
+        except Exception as e:
+            error = e
+
+        with self._cond:
+            now = time.monotonic()
+            if error is None:
+                self._key = key
+                if key:
+                    self._expires_at = now + self._ttl
+                    self._refresh_at = self._expires_at - self._refresh_margin
+                else:
+                    # 빈 키를 받은 경우 짧은 간격 후 다시 시도
+                    self._expires_at = self._refresh_at = now + self._retry_interval
+                self._last_error = None
+            else:
+                self._last_error = error
+                # 실패 직후 모든 요청이 다시 조회하지 않도록 기존 키(없으면 빈 키)를 잠시 더 사용
+                if self._key is None:
+                    self._key = ''
+                self._expires_at = self._refresh_at = now + self._retry_interval
+            self._refreshing = False
+            self.refreshes += 1
+            if error is not None:
+                self.refresh_failures += 1
+            self._cond.notify_all()
+
+        if error is not None:
+            raise error
+        return key
+
+    def _ensure_background(self):
+        """만료 전 미리 갱신하는 백그라운드 스레드 시작 (최초 1회)"""
+        if self._background is not None:
+            return
+        with self._cond:
+            if self._background is not None:
+                return
+            self._background = threading.Thread(
+                target=self._refresh_loop,
+                name='passport-key-refresh',
+                daemon=True
+            )
+            self._background.start()
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            with self._cond:
+                delay = self._refresh_at - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+                continue
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.exception("passport key 백그라운드 갱신 실패: %s", e)
+
+    def stats(self) -> dict:
+        """발급 현황 (조회 횟수, 실패 횟수, 현재 키 보유 여부)"""
+        with self._cond:
+            return {
+                'refreshes': self.refreshes,
+                'refreshFailures': self.refresh_failures,
+                'hasKey': bool(self._key),
+            }
+
+    def stop(self):
+        """백그라운드 갱신 중지"""
+        self._stop.set()
+
+
+# 프로세스 전체에서 공유하는 passport key 관리자
+passport_key_manager = PassportKeyManager()
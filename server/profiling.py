@@ -0,0 +1,236 @@
+"""
+요청 단위 샘플링 프로파일러 (opt-in)
+프로파일링하는 요청이 있는 동안만 백그라운드 스레드가 일정 간격으로 그 요청을 처리 중인 스레드의 호출 스택을 기록합니다.
+벽시계 시간 기준 샘플이므로 CPU 사용(HTML 파싱, 오류 추출)뿐 아니라 네트워크 대기(소켓 읽기)와 잠금 대기도 드러납니다.
+
+요청이 끝나면 프로파일을 보관소에 넣으며, 보관소는 가장 느린 PROFILE_MAX_PROFILES개만 남깁니다.
+프로파일은 flame graph 도구(flamegraph.pl, speedscope 등)가 읽는 collapsed stack 형식
+("request;함수 (파일:줄);함수 (파일:줄) 샘플 수")으로 내보냅니다.
+
+워커 풀에 넘기는 작업은 propagate()로 감싸야 같은 프로파일에 기록됩니다 (스택 앞에 worker로 표시).
+"""
+import contextlib
+import heapq
+import hmac
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+# 관리자 토큰 (X-Admin-Token 헤더), 비어 있으면 헤더로 프로파일링을 요청하거나 프로파일을 조회할 수 없음
+PROFILE_ADMIN_TOKEN = os.environ.get('PROFILE_ADMIN_TOKEN', '')
+# 자동으로 프로파일링할 요청 비율 (0~1, 0이면 관리자 헤더로 요청한 경우만)
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+# 보관할 최대 프로파일 수 (가장 느린 요청 순)
+PROFILE_MAX_PROFILES = int(os.environ.get('PROFILE_MAX_PROFILES', '20'))
+# 스택 샘플링 간격(ms)
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', '5'))
+# 기록할 최대 스택 깊이
+PROFILE_MAX_DEPTH = int(os.environ.get('PROFILE_MAX_DEPTH', '128'))
+
+_current = ContextVar('request_profile', default=None)
+
+
+class Profile:
+    """요청 하나의 스택 샘플 (collapsed stack → 샘플 수)"""
+
+    def __init__(self, profile_id: int, endpoint: str, attributes: dict = None):
+        self.id = profile_id
+        self.endpoint = endpoint
+        self.attributes = dict(attributes or {})
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.duration = None
+        self._lock = threading.Lock()
+        self.stacks = Counter()
+
+    def add_sample(self, label: str, frame):
+        names = []
+        while frame is not None and len(names) < PROFILE_MAX_DEPTH:
+            code = frame.f_code
+            names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        names.append(label)
+        stack = ';'.join(reversed(names))
+        with self._lock:
+            self.stacks[stack] += 1
+
+    def finish(self):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._start
+
+    @property
+    def samples(self) -> int:
+        with self._lock:
+            return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        """collapsed stack 형식 (한 줄에 "스택 샘플 수", 샘플이 많은 순)"""
+        with self._lock:
+            stacks = self.stacks.most_common()
+        return ''.join(f'{stack} {count}\n' for stack, count in stacks)
+
+    def summary(self) -> dict:
+        return {
+            'id': self.id,
+            'endpoint': self.endpoint,
+            'startedAt': round(self.started_at, 3),
+            'durationMs': round((self.duration or 0.0) * 1000, 3),
+            'samples': self.samples,
+            **self.attributes,
+        }
+
+
+class _Sampler:
+    """프로파일링 중인 스레드의 스택을 주기적으로 기록하는 백그라운드 스레드 (프로세스마다 하나)"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._condition = threading.Condition()
+        # 스레드 ID → (프로파일, 스택 맨 앞 표시)
+        self._targets = {}
+        self._pid = None
+
+    def add(self, ident: int, profile: Profile, label: str):
+        with self._condition:
+            # fork된 워커에서는 부모의 샘플링 스레드가 없으므로 새로 시작
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                threading.Thread(target=self._run, name='profile-sampler', daemon=True).start()
+            self._targets[ident] = (profile, label)
+            self._condition.notify()
+
+    def remove(self, ident: int):
+        with self._condition:
+            self._targets.pop(ident, None)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._targets:
+                    self._condition.wait()
+                targets = list(self._targets.items())
+            frames = sys._current_frames()
+            for ident, (profile, label) in targets:
+                frame = frames.get(ident)
+                if frame is not None:
+                    profile.add_sample(label, frame)
+            del frames
+            time.sleep(self.interval)
+
+
+class ProfileStore:
+    """가장 느린 max_profiles개의 프로파일 보관소 (스레드 안전)"""
+
+    def __init__(self, max_profiles: int = PROFILE_MAX_PROFILES):
+        self.max_profiles = max(1, max_profiles)
+        self._lock = threading.Lock()
+        # (소요 시간, ID, 프로파일) 최소 힙: 가장 빠른 프로파일부터 밀려남
+        self._heap = []
+        self._by_id = {}
+        self.captured = 0
+        self.evicted = 0
+
+    def add(self, profile: Profile):
+        entry = (profile.duration, profile.id, profile)
+        with self._lock:
+            self.captured += 1
+            if len(self._heap) < self.max_profiles:
+                heapq.heappush(self._heap, entry)
+            elif entry[:2] > self._heap[0][:2]:
+                _, evicted_id, _ = heapq.heapreplace(self._heap, entry)
+                del self._by_id[evicted_id]
+                self.evicted += 1
+            else:
+                self.evicted += 1
+                return
+            self._by_id[profile.id] = profile
+
+    def get(self, profile_id: int):
+        with self._lock:
+            return self._by_id.get(profile_id)
+
+    def list(self) -> list:
+        """보관 중인 프로파일 요약 (느린 순)"""
+        with self._lock:
+            profiles = [profile for _, _, profile in self._heap]
+        return [profile.summary() for profile in sorted(profiles, key=lambda p: p.duration, reverse=True)]
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+            self._by_id.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'sampleRate': PROFILE_SAMPLE_RATE,
+                'intervalMs': PROFILE_INTERVAL_MS,
+                'maxProfiles': self.max_profiles,
+                'stored': len(self._heap),
+                'captured': self.captured,
+                'evicted': self.evicted,
+            }
+
+
+def is_admin(token) -> bool:
+    """token이 관리자 토큰과 같은지 여부 (관리자 토큰이 설정되지 않았으면 항상 False)"""
+    if not PROFILE_ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode('utf-8'), PROFILE_ADMIN_TOKEN.encode('utf-8'))
+
+
+def should_profile(requested: bool, admin_token) -> bool:
+    """관리자 토큰과 함께 요청했거나 PROFILE_SAMPLE_RATE 확률에 걸리면 프로파일링"""
+    if requested and is_admin(admin_token):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+_sampler = _Sampler(PROFILE_INTERVAL_MS / 1000)
+_ids = itertools.count(1)
+
+# 프로세스 전체에서 공유하는 프로파일 보관소
+profile_store = ProfileStore()
+
+
+@contextlib.contextmanager
+def profiling(enabled: bool, endpoint: str, **attributes):
+    """
+    enabled이면 with 블록 동안 현재 스레드를 샘플링하고 Profile을, 아니면 None을 돌려줌
+    블록이 끝나면 프로파일을 보관소에 넣습니다 (더 느린 프로파일이 가득 차 있으면 버려짐).
+    """
+    if not enabled:
+        yield None
+        return
+    profile = Profile(next(_ids), endpoint, attributes)
+    ident = threading.get_ident()
+    token = _current.set(profile)
+    _sampler.add(ident, profile, 'request')
+    try:
+        yield profile
+    finally:
+        _sampler.remove(ident)
+        _current.reset(token)
+        profile.finish()
+        profile_store.add(profile)
+
+
+def propagate(func):
+    """다른 스레드에서 실행해도 현재 요청의 프로파일에 기록되도록 func를 감쌈 (프로파일링 중이 아니면 func 그대로)"""
+    profile = _current.get()
+    if profile is None:
+        return func
+
+    def run(*args, **kwargs):
+        ident = threading.get_ident()
+        _sampler.add(ident, profile, 'worker')
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _sampler.remove(ident)
+    return run
@@ -0,0 +1,99 @@
+"""
+맞춤법 검사 결과 메모리 캐시
+같은 입력을 반복 검사할 때 네이버 호출 없이 이전 결과를 돌려줍니다.
+최대 항목 수를 넘으면 가장 오래 사용하지 않은 항목부터 제거(LRU)하고,
+TTL이 지난 항목은 조회 시점에 만료 처리합니다.
+저장소(result_store.py)를 넘기면 메모리에 없는 항목은 저장소에서 찾아 메모리에 올리고, 저장할 때는 둘 다에 저장합니다.
+저장소는 디스크 I/O이므로, 비동기 서버는 메모리(get_local/set_local)만 바로 사용하고 저장소(load/save)는 스레드에서 호출합니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """LRU + TTL 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries: int, ttl: float, store=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.store = store
+        self._entries = OrderedDict()  # key -> (만료 시각, 값)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """캐시된 값 반환 (없거나 만료된 경우 저장소에서 찾고, 저장소에도 없으면 None)"""
+        value = self.get_local(key)
+        if value is None:
+            value = self.load(key)
+        return value
+
+    def get_local(self, key):
+        """메모리에서만 찾은 값 반환 (없거나 만료된 경우 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            elif time.monotonic() >= entry[0]:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        return None
+
+    def load(self, key):
+        """저장소에서 찾은 값을 메모리에 올려 반환 (저장소가 없거나 저장소에도 없으면 None)"""
+        if self.store is None:
+            return None
+        # 저장소 조회는 잠금 밖에서 (다른 스레드의 메모리 캐시 조회를 막지 않도록)
+        value = self.store.get(key)
+        if value is not None:
+            self.set_local(key, value)
+        return value
+
+    def set(self, key, value):
+        """값 저장 (용량 초과 시 가장 오래 사용하지 않은 항목 제거)"""
+        self.set_local(key, value)
+        self.save(key, value)
+
+    def save(self, key, value):
+        """저장소에만 저장 (저장소가 없으면 아무것도 하지 않음)"""
+        if self.store is not None:
+            self.store.set(key, value)
+
+    def set_local(self, key, value):
+        """메모리에만 저장"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxEntries': self.max_entries,
+                'ttlSeconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hitRatio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
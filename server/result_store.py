@@ -0,0 +1,271 @@
+"""
+검사 결과 디스크 저장소 (SQLite, 선택 사항)
+메모리 결과 캐시(result_cache.py) 뒤에서 검사 결과를 파일 하나에 보관하여, 같은 서버의 워커 프로세스끼리
+결과를 공유하고 재시작 후에도 이전 결과를 바로 사용합니다. RESULT_STORE_PATH를 지정한 경우에만 사용합니다.
+
+- 키: 캐시 키(텍스트, 엔진, 파서 버전, 검사 방식)의 BLAKE2b 해시 16바이트 (기본 키 인덱스로 조회)
+- 값: SpellResult.to_bytes() (results.py)
+- WAL 모드라 읽기는 쓰기를 기다리지 않으며, 읽기는 메모리 매핑(mmap)으로 처리
+- 크기 제한: 사용 중인 페이지가 RESULT_STORE_MAX_MB를 넘으면 가장 오래 사용하지 않은 항목부터 90%가 될 때까지 제거
+  (사용 시각은 조회할 때마다가 아니라 _TOUCH_INTERVAL초에 한 번만 갱신하므로 근사 LRU)
+
+저장소는 캐시일 뿐이므로 파일을 열 수 없거나 잠금 대기가 길어지면 오류를 기록하고 저장소 없이 검사합니다.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from log import get_logger
+from results import SpellResult
+
+logger = get_logger('result_store')
+
+# 저장소 파일 경로, 비어 있으면 사용 안 함
+RESULT_STORE_PATH = os.environ.get('RESULT_STORE_PATH', '')
+# 저장소 최대 크기(MB)
+RESULT_STORE_MAX_MB = float(os.environ.get('RESULT_STORE_MAX_MB', '256'))
+# 저장한 결과의 유효 시간(초)
+RESULT_STORE_TTL = float(os.environ.get('RESULT_STORE_TTL', '604800'))
+
+# 다른 프로세스가 쓰는 중일 때 기다릴 최대 시간(초), 넘으면 조회는 미적중, 저장은 생략
+_BUSY_TIMEOUT = 0.2
+# 메모리 매핑 크기 (바이트)
+_MMAP_SIZE = 256 * 1024 * 1024
+# 사용 시각을 다시 기록하기까지의 최소 간격(초)
+_TOUCH_INTERVAL = 60.0
+# 몇 번 저장할 때마다 크기를 확인할지
+_EVICT_CHECK_EVERY = 64
+# 크기를 넘으면 최대 크기의 이 비율까지 줄임 (저장할 때마다 정리하지 않도록 여유를 둠)
+_EVICT_TARGET = 0.9
+# 실패 경고를 다시 기록하기까지의 최소 간격(초), 그 사이의 실패는 DEBUG로 기록
+_WARN_INTERVAL = 60.0
+# 항목 수와 사용 중인 크기를 다시 조회하기까지의 최소 간격(초), 그 사이에는 마지막 정리 또는 조회 때의 값을 사용
+_STATS_INTERVAL = 60.0
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS results ('
+    ' key BLOB PRIMARY KEY,'
+    ' value BLOB NOT NULL,'
+    ' expires_at REAL NOT NULL,'
+    ' used_at REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS results_used_at ON results (used_at)',
+)
+
+
+def hash_key(key) -> bytes:
+    """캐시 키 튜플의 해시 (구분 문자 0x1f로 이어 붙인 UTF-8 문자열의 BLAKE2b 16바이트)"""
+    return hashlib.blake2b('\x1f'.join(map(str, key)).encode('utf-8'), digest_size=16).digest()
+
+
+class ResultStore:
+    """
+    SQLite 검사 결과 저장소 (스레드/프로세스 안전)
+    연결은 스레드마다 따로 열며, fork된 워커에서는 부모의 연결을 쓰지 않고 새로 엽니다.
+    """
+
+    def __init__(self, path: str, max_bytes: int, ttl: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = bool(path)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+        self._warned_at = None
+        # 마지막으로 조회한 항목 수, 사용 중인 크기, 조회 시각 (통계 조회마다 전체 항목을 세지 않도록 보관)
+        self._size = 0
+        self._used = 0
+        self._measured_at = None
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.errors = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.path, timeout=_BUSY_TIMEOUT, isolation_level=None)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA mmap_size={_MMAP_SIZE}')
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _failed(self, action: str, error: Exception):
+        now = time.monotonic()
+        with self._lock:
+            self.errors += 1
+            # 다른 프로세스의 쓰기와 겹친 경우는 흔하고, 파일 문제는 요청마다 반복되므로 경고는 가끔만 기록
+            warn = 'locked' not in str(error) and (self._warned_at is None or now - self._warned_at >= _WARN_INTERVAL)
+            if warn:
+                self._warned_at = now
+        if warn:
+            logger.warning("결과 저장소 %s 실패: %s", action, error)
+        else:
+            logger.debug("결과 저장소 %s 실패: %s", action, error)
+
+    def get(self, key):
+        """저장된 결과 반환 (없거나 만료되었거나 저장소를 사용할 수 없으면 None)"""
+        if not self.enabled:
+            return None
+        digest = hash_key(key)
+        now = time.time()
+        try:
+            conn = self._connection()
+            row = conn.execute('SELECT value, used_at FROM results WHERE key = ? AND expires_at > ?',
+                               (digest, now)).fetchone()
+            if row is not None and now - row[1] >= _TOUCH_INTERVAL:
+                conn.execute('UPDATE results SET used_at = ? WHERE key = ?', (now, digest))
+        except sqlite3.Error as e:
+            self._failed('조회', e)
+            return None
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            result = SpellResult.from_bytes(row[0])
+        except (TypeError, ValueError) as e:
+            # 손상된 값은 없는 것으로 보고, 다시 검사한 결과를 저장할 때 덮어씀
+            self._failed('조회', e)
+            return None
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def set(self, key, result: SpellResult):
+        """결과 저장 (일정 횟수마다 크기를 확인하여 넘으면 오래된 항목 제거)"""
+        if not self.enabled:
+            return
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.execute('INSERT OR REPLACE INTO results (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)',
+                         (hash_key(key), result.to_bytes(), now + self.ttl, now))
+        except sqlite3.Error as e:
+            self._failed('저장', e)
+            return
+
+        with self._lock:
+            self.writes += 1
+            self._writes_since_check += 1
+            check = self._writes_since_check >= _EVICT_CHECK_EVERY
+            if check:
+                self._writes_since_check = 0
+        if check:
+            self.evict()
+
+    def _used_bytes(self, conn) -> int:
+        """사용 중인 페이지 크기 (파일 크기에서 빈 페이지 제외)"""
+        page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+        freelist_count = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        return (page_count - freelist_count) * page_size
+
+    def _measure(self, conn):
+        """항목 수와 사용 중인 크기를 조회하여 보관"""
+        size = conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        used_bytes = self._used_bytes(conn)
+        with self._lock:
+            self._size = size
+            self._used = used_bytes
+            self._measured_at = time.monotonic()
+
+    def evict(self):
+        """만료된 항목을 지우고, 크기를 넘으면 가장 오래 사용하지 않은 항목부터 제거"""
+        if not self.enabled:
+            return
+        try:
+            conn = self._connection()
+            expired = conn.execute('DELETE FROM results WHERE expires_at <= ?', (time.time(),)).rowcount
+            evicted = 0
+            excess = self._used_bytes(conn) - self.max_bytes
+            if excess > 0:
+                # 오래 사용하지 않은 순으로 값 크기를 더해 목표 크기까지 줄일 만큼만 제거
+                excess += self.max_bytes * (1 - _EVICT_TARGET)
+                keys = []
+                cursor = conn.execute('SELECT key, length(value) FROM results ORDER BY used_at')
+                for key, size in cursor:
+                    keys.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                cursor.close()
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    conn.executemany('DELETE FROM results WHERE key = ?', keys)
+                    conn.execute('COMMIT')
+                except sqlite3.Error:
+                    conn.execute('ROLLBACK')
+                    raise
+                evicted = len(keys)
+            self._measure(conn)
+        except sqlite3.Error as e:
+            self._failed('정리', e)
+            return
+        with self._lock:
+            self.expirations += expired
+            self.evictions += evicted
+
+    def clear(self):
+        if not self.enabled:
+            return
+        try:
+            conn = self._connection()
+            conn.execute('DELETE FROM results')
+            self._measure(conn)
+        except sqlite3.Error as e:
+            self._failed('삭제', e)
+
+    def stats(self) -> dict:
+        """
+        저장소 현황 (적중/저장 등은 이 프로세스의 집계)
+        항목 수와 사용 중인 크기는 정리(evict)할 때 갱신한 값을 쓰고, _STATS_INTERVAL보다 오래되었을 때만 다시 조회합니다.
+        """
+        if not self.enabled:
+            return {'enabled': False}
+        with self._lock:
+            stale = self._measured_at is None or time.monotonic() - self._measured_at >= _STATS_INTERVAL
+            if stale:
+                # 실패해도 다음 조회까지 간격을 두어 통계 조회마다 재시도하지 않음
+                self._measured_at = time.monotonic()
+        if stale:
+            try:
+                self._measure(self._connection())
+            except sqlite3.Error as e:
+                self._failed('통계 조회', e)
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': True,
+                'path': self.path,
+                'size': self._size,
+                'usedBytes': self._used,
+                'maxBytes': self.max_bytes,
+                'ttlSeconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'errors': self.errors,
+                'hitRatio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# 프로세스 전체에서 공유하는 저장소 (RESULT_STORE_PATH가 비어 있으면 아무것도 하지 않음)
+result_store = ResultStore(RESULT_STORE_PATH, int(RESULT_STORE_MAX_MB * 1024 * 1024), RESULT_STORE_TTL)
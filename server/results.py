@@ -0,0 +1,183 @@
+"""
+검사 결과 모델
+캐시에 오래 보관되는 검사 결과를 오류마다 딕셔너리를 만들지 않고 작게 저장합니다.
+- 오류 위치와 종류는 오류마다 (start, end, 오류 종류 코드) 세 개의 정수로 배열 하나에 저장 (보통 오류당 6바이트)
+- 오류 종류는 정수 코드로 저장하고 응답을 만들 때 "맞춤법", "띄어쓰기" 등으로 변환
+- 오류의 original은 원본 텍스트의 [start:end]와 같으면 따로 저장하지 않음
+- 교정 후보 문자열은 sys.intern으로 같은 문자열을 모든 결과가 공유
+- 오류가 없어 교정된 텍스트가 원본과 같으면 원본 문자열을 그대로 참조
+
+응답 JSON은 as_dict()로 만들며, 형식은 기존 응답({'original', 'checked', 'errors', 'errorCount'})과 같습니다.
+디스크 저장소(result_store.py)에는 to_bytes()로 직렬화하여 저장합니다 (오류 종류는 프로세스마다 코드가 다를 수 있으므로 이름으로 저장).
+"""
+import json
+import sys
+import threading
+from array import array
+
+# 오류 종류 코드 → 이름 (코드는 목록의 위치, 새 이름은 처음 사용할 때 뒤에 추가)
+ERROR_TYPES = ['맞춤법', '띄어쓰기', '표준어', '통계적교정', '기타']
+_ERROR_TYPE_CODES = {name: code for code, name in enumerate(ERROR_TYPES)}
+_error_types_lock = threading.Lock()
+
+# 오류 하나가 차지하는 정수 개수 (start, end, 오류 종류 코드)
+_FIELDS = 3
+# 배열 원소 크기: 모든 값이 2바이트 범위(±32767)이면 'h', 아니면 'q'
+_SMALL_MAX = 0x7FFF
+
+
+def error_type_code(name: str) -> int:
+    """오류 종류 이름의 정수 코드"""
+    code = _ERROR_TYPE_CODES.get(name)
+    if code is None:
+        with _error_types_lock:
+            code = _ERROR_TYPE_CODES.get(name)
+            if code is None:
+                code = len(ERROR_TYPES)
+                ERROR_TYPES.append(name)
+                _ERROR_TYPE_CODES[name] = code
+    return code
+
+
+def _compact_suggestions(suggestions):
+    """교정 후보 목록 → 하나면 문자열, 여러 개면 문자열 튜플 (문자열은 intern)"""
+    if isinstance(suggestions, str):
+        return sys.intern(suggestions)
+    if len(suggestions) == 1:
+        return sys.intern(suggestions[0])
+    return tuple(sys.intern(suggestion) for suggestion in suggestions)
+
+
+class SpellResult:
+    """
+    텍스트 하나의 검사 결과
+    오류 위치(start/end)는 original 기준이며, errors와 as_dict()는 호출할 때마다 딕셔너리를 새로 만듭니다.
+    """
+
+    __slots__ = ('original', 'checked', 'error_count', '_table', '_suggestions', '_originals')
+
+    def __init__(self, original: str, checked: str, error_count: int, table=None, suggestions=(), originals=None):
+        self.original = original
+        self.checked = original if checked == original else checked
+        self.error_count = error_count
+        self._table = table
+        self._suggestions = suggestions
+        self._originals = originals
+
+    @classmethod
+    def from_errors(cls, original: str, checked: str, errors: list, error_count: int) -> 'SpellResult':
+        """오류 딕셔너리 목록({'start', 'end', 'original', 'suggestions', 'errorType'})으로 결과 생성"""
+        builder = ResultBuilder(original)
+        for error in errors:
+            builder.add(error['start'], error['end'], error['errorType'], error['suggestions'], error['original'])
+        return builder.build(checked, error_count)
+
+    def __len__(self) -> int:
+        """오류 개수 (errors의 길이)"""
+        return len(self._suggestions)
+
+    def entries(self):
+        """(start, end, 오류 종류 코드, 교정 후보, original 또는 None) 목록 (병합 등 내부용)"""
+        table = self._table
+        originals = self._originals
+        for index, suggestion in enumerate(self._suggestions):
+            base = index * _FIELDS
+            yield (table[base], table[base + 1], table[base + 2], suggestion,
+                   originals.get(index) if originals else None)
+
+    @property
+    def errors(self) -> list:
+        """오류 딕셔너리 목록 (응답 형식)"""
+        errors = []
+        original = self.original
+        for start, end, code, suggestion, word in self.entries():
+            errors.append({
+                'start': start,
+                'end': end,
+                'original': original[start:end] if word is None else word,
+                'suggestions': [suggestion] if isinstance(suggestion, str) else list(suggestion),
+                'errorType': ERROR_TYPES[code]
+            })
+        return errors
+
+    def as_dict(self) -> dict:
+        """응답 JSON용 딕셔너리 {'original', 'checked', 'errors', 'errorCount'}"""
+        return {
+            'original': self.original,
+            'checked': self.checked,
+            'errors': self.errors,
+            'errorCount': self.error_count
+        }
+
+    def to_bytes(self) -> bytes:
+        """디스크 저장용 직렬화 (UTF-8 JSON 배열, from_bytes()로 복원)"""
+        checked = None if self.checked is self.original else self.checked
+        entries = [[start, end, ERROR_TYPES[code], suggestion, word]
+                   for start, end, code, suggestion, word in self.entries()]
+        return json.dumps([self.original, checked, self.error_count, entries],
+                          ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'SpellResult':
+        """to_bytes()로 직렬화한 결과 복원"""
+        original, checked, error_count, entries = json.loads(data)
+        builder = ResultBuilder(original)
+        for start, end, error_type, suggestion, word in entries:
+            builder.add(start, end, error_type, suggestion, word)
+        return builder.build(original if checked is None else checked, error_count)
+
+    def __eq__(self, other):
+        if not isinstance(other, SpellResult):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'SpellResult(original={self.original!r}, checked={self.checked!r}, errorCount={self.error_count})'
+
+
+class ResultBuilder:
+    """오류를 하나씩 추가하여 SpellResult 생성"""
+
+    __slots__ = ('original', '_table', '_suggestions', '_originals')
+
+    def __init__(self, original: str):
+        self.original = original
+        self._table = array('q')
+        self._suggestions = []
+        self._originals = None
+
+    def add(self, start: int, end: int, error_type, suggestions, word: str = None):
+        """
+        오류 추가 (error_type은 이름 또는 코드, suggestions는 문자열 목록 또는 문자열)
+        word가 원본 텍스트의 [start:end]와 다를 때만 따로 저장합니다.
+        """
+        code = error_type if isinstance(error_type, int) else error_type_code(error_type)
+        self._append(start, end, code, _compact_suggestions(suggestions),
+                     None if word is None or word == self.original[start:end] else word)
+
+    def __len__(self) -> int:
+        return len(self._suggestions)
+
+    def extend(self, result: SpellResult, offset: int = 0):
+        """다른 결과의 오류를 위치를 offset만큼 옮겨 추가 (청크 결과 병합용)"""
+        for start, end, code, suggestion, word in result.entries():
+            self._append(start + offset, end + offset, code, suggestion, word)
+
+    def _append(self, start: int, end: int, code: int, suggestion, word):
+        if word is not None:
+            if self._originals is None:
+                self._originals = {}
+            self._originals[len(self._suggestions)] = word
+        self._table.extend((start, end, code))
+        self._suggestions.append(suggestion)
+
+    def build(self, checked: str, error_count: int) -> SpellResult:
+        if not self._suggestions:
+            return SpellResult(self.original, checked, error_count)
+        # 추가하는 동안 늘려 둔 여유 공간 없이 딱 맞는 크기로 복사
+        small = -_SMALL_MAX <= min(self._table) and max(self._table) <= _SMALL_MAX
+        table = array('h' if small else 'q', self._table)
+        return SpellResult(self.original, checked, error_count,
+                           table, tuple(self._suggestions), self._originals)
@@ -0,0 +1,102 @@
+"""
+맞춤법 검사 백엔드 서버 - 운영용 실행 스크립트
+gunicorn으로 여러 워커 프로세스(와 워커당 여러 스레드)를 한 포트에서 실행합니다.
+각 워커는 시작할 때 warm_up()으로 passport key를 미리 발급받으므로 첫 요청이 발급 비용을 부담하지 않습니다.
+
+설정은 명령행 인자 또는 환경 변수로 지정합니다 (명령행 인자가 우선).
+
+    python3 serve.py --bind 0.0.0.0:5001 --workers 2 --threads 16
+    SPELL_CHECK_WORKERS=4 python3 serve.py --asgi
+
+주의: 결과 캐시, 문장 캐시, passport key, 업스트림 연결 풀은 워커 프로세스마다 따로 존재합니다.
+같은 워커 안의 스레드끼리만 공유되므로, 캐시 적중률을 높이려면 프로세스 수보다 스레드 수를 늘리는 편이 유리합니다.
+RESULT_STORE_PATH를 지정하면 검사 결과는 디스크 저장소(result_store.py)를 통해 모든 워커와 재시작 사이에 공유됩니다.
+"""
+import argparse
+import os
+import sys
+
+from gunicorn.app.base import BaseApplication
+
+from log import get_logger
+
+logger = get_logger('serve')
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='맞춤법 검사 백엔드 서버 (운영 모드)')
+    parser.add_argument('--bind', default=os.environ.get('SPELL_CHECK_BIND', '0.0.0.0:5001'),
+                        help='바인드 주소 (환경 변수 SPELL_CHECK_BIND, 기본값: 0.0.0.0:5001)')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('SPELL_CHECK_WORKERS', '2')),
+                        help='워커 프로세스 수 (환경 변수 SPELL_CHECK_WORKERS, 기본값: 2)')
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('SPELL_CHECK_THREADS', '16')),
+                        help='워커당 요청 처리 스레드 수 (환경 변수 SPELL_CHECK_THREADS, 기본값: 16)')
+    parser.add_argument('--timeout', type=int, default=int(os.environ.get('SPELL_CHECK_TIMEOUT', '30')),
+                        help='요청 하나를 처리하는 최대 시간(초), 넘으면 워커 재시작 (환경 변수 SPELL_CHECK_TIMEOUT, 기본값: 30)')
+    parser.add_argument('--upstream-timeout', type=float, default=float(os.environ.get('UPSTREAM_TIMEOUT', '10')),
+                        help='네이버 호출 하나의 최대 대기 시간(초) (환경 변수 UPSTREAM_TIMEOUT, 기본값: 10)')
+    parser.add_argument('--keep-alive', type=int, default=int(os.environ.get('SPELL_CHECK_KEEP_ALIVE', '5')),
+                        help='클라이언트 keep-alive 연결 유지 시간(초) (환경 변수 SPELL_CHECK_KEEP_ALIVE, 기본값: 5)')
+    parser.add_argument('--asgi', action='store_true', default=os.environ.get('SPELL_CHECK_ASGI', '0') == '1',
+                        help='비동기(ASGI) 모드(asgi.py)로 실행 (환경 변수 SPELL_CHECK_ASGI=1)')
+    return parser.parse_args(argv)
+
+
+def _post_worker_init(worker):
+    """워커 프로세스마다 시작 시 준비 작업 (ASGI 모드는 asgi.py의 lifespan에서 처리)"""
+    from app import warm_up
+    try:
+        warm_up()
+    except Exception as e:
+        # 준비 작업 실패는 치명적이지 않음 (첫 요청에서 다시 시도)
+        logger.warning("워커 준비 작업 실패: %s", e)
+
+
+class SpellCheckServer(BaseApplication):
+    """gunicorn 애플리케이션 (설정 파일 없이 인자로 구성)"""
+
+    def __init__(self, options: dict, asgi: bool):
+        self.options = options
+        self.asgi = asgi
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        if self.asgi:
+            from asgi import app
+        else:
+            from app import app
+        return app
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+
+    # 워커가 app 모듈을 import하기 전에 설정해야 하는 값
+    os.environ['UPSTREAM_TIMEOUT'] = str(args.upstream_timeout)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    options = {
+        'bind': args.bind,
+        'workers': args.workers,
+        'timeout': args.timeout,
+        'keepalive': args.keep_alive,
+    }
+    if args.asgi:
+        # uvicorn 패키지의 uvicorn.workers는 더 이상 사용하지 않으므로 uvicorn-worker 패키지의 워커 사용
+        options['worker_class'] = 'uvicorn_worker.UvicornWorker'
+    else:
+        options['worker_class'] = 'gthread'
+        options['threads'] = args.threads
+        options['post_worker_init'] = _post_worker_init
+
+    logger.info("맞춤법 검사 서버 시작: %s (워커 %d개, %s)", args.bind, args.workers,
+                'ASGI' if args.asgi else f'워커당 스레드 {args.threads}개')
+    SpellCheckServer(options, asgi=args.asgi).run()
+
+
+if __name__ == '__main__':
+    main()
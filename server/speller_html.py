@@ -0,0 +1,79 @@
+"""
+네이버 맞춤법 검사기 응답 HTML 파서
+응답의 html 필드를 앞에서부터 한 번만 훑어 다음을 함께 만듭니다.
+- checked: 태그를 제거하고 엔티티를 푼 교정된 텍스트 (<br>은 줄바꿈)
+- spans: 오류 태그(<em class='..._text'>)별 오류 종류와 checked 기준 시작/끝 위치
+- words: checked의 단어(공백 기준)별 오류 종류 목록 (오류가 아닌 단어는 None)
+DOM을 만들거나 태그를 바꿔 끼운 중간 문자열을 만들지 않습니다.
+"""
+import html as html_lib
+import re
+from collections import namedtuple
+from itertools import accumulate
+
+# 태그 기준 분리 (결과 목록은 텍스트, 태그, 텍스트, ... 순서)
+_TAG_SPLIT_PATTERN = re.compile(r'(<[^>]*>)')
+_WORD_PATTERN = re.compile(r'\S+')
+# 오류 태그 → 오류 종류
+_ERROR_CLASS_BY_TAG = {
+    f'<em class={quote}{error_class}{quote}>': error_class
+    for error_class in ('red_text', 'green_text', 'violet_text', 'blue_text')
+    for quote in ("'", '"')
+}
+
+ErrorSpan = namedtuple('ErrorSpan', ['error_class', 'start', 'end'])
+ParsedHtml = namedtuple('ParsedHtml', ['checked', 'spans', 'words'])
+
+
+def parse_speller_html(html: str, with_words: bool = False) -> ParsedHtml:
+    """
+    네이버 응답 HTML을 한 번 훑어 (checked, spans, words) 반환
+    words는 with_words가 True일 때만 만들며, 아니면 None입니다.
+    """
+    # <br> 태그는 줄바꿈 문자로 변환하고, XML 파서와 같이 줄바꿈을 \n으로 통일
+    html = html.replace('<br>', '\n')
+    if '\r' in html:
+        html = html.replace('\r\n', '\n').replace('\r', '\n')
+
+    pieces = _TAG_SPLIT_PATTERN.split(html)
+    texts = pieces[0::2]
+    if '&' in html:
+        texts = [html_lib.unescape(text) if '&' in text else text for text in texts]
+    # text_ends[k]: k번째 태그 바로 앞까지의 교정된 텍스트 길이
+    text_ends = list(accumulate(map(len, texts)))
+
+    spans = []
+    # 열린 <em> 태그 (오류 종류, 시작 위치), 오류 태그가 아닌 <em>은 오류 종류가 None
+    open_tags = []
+    nested = False
+    for k, tag in enumerate(pieces[1::2]):
+        if tag == '</em>':
+            if open_tags:
+                error_class, start = open_tags.pop()
+                if error_class:
+                    spans.append(ErrorSpan(error_class, start, text_ends[k]))
+                    nested = nested or bool(open_tags)
+        elif tag.startswith('<em'):
+            open_tags.append((_ERROR_CLASS_BY_TAG.get(tag), text_ends[k]))
+        # 그 밖의 태그는 제거
+
+    checked = ''.join(texts)
+    if nested:
+        # 안쪽 태그가 먼저 닫히므로 시작 위치 순으로 정렬
+        spans.sort(key=lambda span: span.start)
+    return ParsedHtml(checked, spans, _classify_words(checked, spans) if with_words else None)
+
+
+def _classify_words(checked: str, spans: list) -> list:
+    """checked의 단어마다 (단어, 겹치는 오류 태그의 오류 종류 또는 None) 목록"""
+    words = []
+    span_idx = 0
+    for match in _WORD_PATTERN.finditer(checked):
+        word_start, word_end = match.span()
+        while span_idx < len(spans) and spans[span_idx].end <= word_start:
+            span_idx += 1
+        error_class = None
+        if span_idx < len(spans) and spans[span_idx].start < word_end:
+            error_class = spans[span_idx].error_class
+        words.append((match.group(), error_class))
+    return words
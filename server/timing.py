@@ -0,0 +1,115 @@
+"""
+요청 단계별 소요 시간 측정 (opt-in)
+요청이 측정을 원할 때만 recording()으로 기록을 시작하고, 처리 중 각 단계를 stage(이름)으로 감쌉니다.
+기록 중인 요청이 없으면 stage()는 컨텍스트 변수 하나만 확인하고 아무것도 하지 않는 객체를 돌려줍니다.
+
+기록은 contextvars로 전달되므로 같은 스레드/태스크 안에서는 자동으로 이어지며,
+워커 풀에 넘기는 작업은 propagate()로 감싸야 같은 기록에 합산됩니다.
+같은 단계가 여러 번(청크 병렬 검사 등) 실행되면 소요 시간을 모두 더합니다.
+"""
+import contextlib
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+# 0이면 요청이 원해도 단계별 소요 시간을 응답에 포함하지 않음
+SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', '1') == '1'
+
+_current = ContextVar('stage_timings', default=None)
+_NO_STAGE = contextlib.nullcontext()
+
+
+class StageTimings:
+    """요청 하나의 단계별 소요 시간 합계 (스레드 안전)"""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._end = None
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            self._stages[name] = self._stages.get(name, 0.0) + seconds
+
+    def finish(self):
+        """기록 종료 (이후 전체 시간(total)은 고정)"""
+        if self._end is None:
+            self._end = time.perf_counter()
+
+    def as_dict(self) -> dict:
+        """단계 이름 → 소요 시간(ms), 처음 실행된 순서이며 마지막은 기록 시작부터 종료까지의 전체 시간(total)"""
+        total = (self._end or time.perf_counter()) - self._start
+        with self._lock:
+            stages = dict(self._stages)
+        stages['total'] = total
+        return {name: round(seconds * 1000, 3) for name, seconds in stages.items()}
+
+    def header(self) -> str:
+        """Server-Timing 응답 헤더 값 (예: passport;dur=0.01, upstream;dur=120.5, total;dur=121.3)"""
+        return ', '.join(f'{name};dur={duration}' for name, duration in self.as_dict().items())
+
+
+class _Stage:
+    __slots__ = ('_timings', '_name', '_start')
+
+    def __init__(self, timings: StageTimings, name: str):
+        self._timings = timings
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._timings.add(self._name, time.perf_counter() - self._start)
+        return False
+
+
+def stage(name: str):
+    """with 블록의 소요 시간을 현재 요청의 name 단계에 더함 (기록 중이 아니면 아무것도 하지 않음)"""
+    timings = _current.get()
+    if timings is None:
+        return _NO_STAGE
+    return _Stage(timings, name)
+
+
+def add_stage(name: str, seconds: float):
+    """이미 측정한 소요 시간을 현재 요청의 name 단계에 더함 (기록 중이 아니면 무시)"""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextlib.contextmanager
+def recording(enabled: bool):
+    """
+    enabled이면 with 블록 동안 단계별 소요 시간을 기록하고 StageTimings를, 아니면 None을 돌려줌
+    SERVER_TIMING_ENABLED가 0이면 항상 None입니다.
+    """
+    if not (enabled and SERVER_TIMING_ENABLED):
+        yield None
+        return
+    timings = StageTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        timings.finish()
+        _current.reset(token)
+
+
+def propagate(func):
+    """다른 스레드에서 실행해도 현재 요청의 기록에 합산되도록 func를 감쌈 (기록 중이 아니면 func 그대로)"""
+    timings = _current.get()
+    if timings is None:
+        return func
+
+    def run(*args, **kwargs):
+        token = _current.set(timings)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current.reset(token)
+    return run
@@ -0,0 +1,182 @@
+"""
+업스트림(네이버) 호출 스케줄러
+- 속도 제한: 토큰 버킷으로 초당 호출 수를 제한하고, 한도를 넘은 호출은 순서대로 대기시킵니다.
+  대기 중인 호출 수나 예상 대기 시간이 상한을 넘으면 기다리지 않고 UpstreamQueueFull을 발생시킵니다.
+- 요청 병합: 같은 텍스트를 동시에 검사하는 요청은 먼저 시작한 요청의 업스트림 호출 결과를 함께 사용합니다.
+
+속도 제한과 병합은 워커 프로세스마다 따로 적용됩니다 (전체 한도 = 워커 수 × UPSTREAM_RATE_LIMIT).
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+# 초당 최대 업스트림 호출 수 (0이면 제한 없음)
+UPSTREAM_RATE_LIMIT = float(os.environ.get('UPSTREAM_RATE_LIMIT', '20'))
+# 한 번에 몰아서 보낼 수 있는 최대 호출 수 (토큰 버킷 크기)
+UPSTREAM_RATE_BURST = int(os.environ.get('UPSTREAM_RATE_BURST', '40'))
+# 속도 제한으로 대기할 수 있는 최대 호출 수
+UPSTREAM_QUEUE_MAX = int(os.environ.get('UPSTREAM_QUEUE_MAX', '200'))
+# 속도 제한으로 대기할 수 있는 최대 시간(초)
+UPSTREAM_QUEUE_MAX_WAIT = float(os.environ.get('UPSTREAM_QUEUE_MAX_WAIT', '5'))
+
+
+class UpstreamQueueFull(Exception):
+    """업스트림 호출 대기열이 가득 차서 호출하지 않고 바로 실패"""
+
+
+class RateLimiter:
+    """
+    토큰 버킷 속도 제한 (스레드 안전)
+    토큰이 없으면 다음 토큰을 미리 예약(음수 잔액)하고 그만큼 기다리므로, 대기한 호출은 도착 순서대로 실행됩니다.
+    """
+
+    def __init__(self, rate: float = UPSTREAM_RATE_LIMIT, burst: int = UPSTREAM_RATE_BURST,
+                 max_queue: int = UPSTREAM_QUEUE_MAX, max_wait: float = UPSTREAM_QUEUE_MAX_WAIT, clock=time.monotonic):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self.waiting = 0
+
+        self.acquired = 0
+        self.delayed = 0
+        self.rejected = 0
+
+    def _reserve(self) -> float:
+        """토큰 하나를 예약하고 기다려야 하는 시간(초) 반환 (대기열이 가득 차면 UpstreamQueueFull)"""
+        with self._lock:
+            if self.rate <= 0:
+                self.acquired += 1
+                return 0.0
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            delay = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+            if delay > 0:
+                if self.waiting >= self.max_queue or delay > self.max_wait:
+                    self.rejected += 1
+                    raise UpstreamQueueFull(
+                        f'업스트림 호출 대기열이 가득 찼습니다 (대기 {self.waiting}개, 예상 대기 {delay:.1f}초).')
+                self.waiting += 1
+                self.delayed += 1
+            self._tokens -= 1
+            self.acquired += 1
+            return delay
+
+    def _done_waiting(self):
+        with self._lock:
+            self.waiting -= 1
+
+    def acquire(self) -> float:
+        """호출 한 번을 허용받을 때까지 대기하고 대기한 시간(초) 반환"""
+        delay = self._reserve()
+        if delay > 0:
+            try:
+                time.sleep(delay)
+            finally:
+                self._done_waiting()
+        return delay
+
+    async def acquire_async(self) -> float:
+        """acquire()의 비동기 버전 (대기하는 동안 이벤트 루프를 막지 않음)"""
+        delay = self._reserve()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._done_waiting()
+        return delay
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'ratePerSecond': self.rate,
+                'burst': self.burst,
+                'waiting': self.waiting,
+                'maxQueue': self.max_queue,
+                'acquired': self.acquired,
+                'delayed': self.delayed,
+                'rejected': self.rejected,
+            }
+
+
+class RequestCoalescer:
+    """
+    같은 키의 작업이 진행 중이면 새로 실행하지 않고 그 결과(또는 예외)를 함께 받음 (single-flight)
+    스레드용 run()과 asyncio용 run_async()는 진행 중인 작업 목록을 따로 관리합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._async_in_flight = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def run(self, key, func, *args):
+        """key의 작업이 진행 중이면 그 결과를, 아니면 func(*args)를 실행한 결과를 반환"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = func(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    async def run_async(self, key, func, *args):
+        """
+        run()의 비동기 버전 (func는 코루틴 함수)
+        작업은 요청과 별도의 태스크로 실행하므로, 먼저 시작한 요청을 포함해 기다리던 요청이 취소되어도
+        나머지 요청은 같은 결과를 받습니다.
+        """
+        task = self._async_in_flight.get(key)
+        if task is None:
+            task = self._async_in_flight[key] = asyncio.create_task(func(*args))
+            task.add_done_callback(lambda done: self._async_done(key, done))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _async_done(self, key, task: asyncio.Task):
+        if self._async_in_flight.get(key) is task:
+            del self._async_in_flight[key]
+        # 기다리던 요청이 모두 취소된 경우에도 예외를 조회하지 않았다는 경고가 남지 않도록 표시
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'inFlight': len(self._in_flight) + len(self._async_in_flight),
+                'leaders': self.leaders,
+                'coalesced': self.coalesced,
+            }
+
+
+# 네이버 맞춤법 검사기 호출에 사용하는 속도 제한과 요청 병합 (프로세스 전체에서 공유)
+upstream_rate_limiter = RateLimiter()
+upstream_coalescer = RequestCoalescer()
@@ -0,0 +1,162 @@
+"""
+원본 텍스트 단어 색인
+텍스트를 공백 기준으로 한 번만 나누어 위치 순으로 저장하고,
+단어 형태(문자열)로는 해시 조회, 위치로는 이진 탐색을 제공합니다.
+오류마다 원본을 다시 나누고 단어 목록 전체를 훑던 방식을 대체합니다.
+"""
+import re
+from bisect import bisect_left, bisect_right
+
+_WORD_PATTERN = re.compile(r'\S+')
+
+
+class WordIndex:
+    """위치 순으로 정렬된 단어 목록 (words[i]는 text[starts[i]:ends[i]])"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.words = []
+        self.starts = []
+        self.ends = []
+        # 단어 형태 → 해당 단어가 나오는 인덱스 목록 (위치 순)
+        self._positions = {}
+        # 단어 형태 → 해당 단어들의 시작 위치 목록 (처음 조회할 때 생성)
+        self._surface_starts = {}
+        # 제거할 문자 → (문자를 제거한 텍스트, 단어별 시작/끝 위치) (처음 조회할 때 생성)
+        self._normalized = {}
+
+        for match in _WORD_PATTERN.finditer(text):
+            word = match.group()
+            self._positions.setdefault(word, []).append(len(self.words))
+            self.words.append(word)
+            self.starts.append(match.start())
+            self.ends.append(match.end())
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word) -> bool:
+        return word in self._positions
+
+    def surfaces(self):
+        """서로 다른 단어 형태 (처음 나온 순서)"""
+        return self._positions.keys()
+
+    def entry(self, i: int) -> dict:
+        """i번째 단어를 {'word', 'start', 'end'} 딕셔너리로 반환"""
+        return {
+            'word': self.words[i],
+            'start': self.starts[i],
+            'end': self.ends[i]
+        }
+
+    def first_near(self, offset: int, radius: int):
+        """
+        offset을 포함하거나 시작 위치가 offset에서 radius 미만으로 떨어진 첫 번째 단어의 인덱스
+        해당하는 단어가 없으면 None
+        """
+        candidates = []
+        containing = bisect_right(self.starts, offset) - 1
+        if containing >= 0 and offset < self.ends[containing]:
+            candidates.append(containing)
+        after = bisect_right(self.starts, offset - radius)
+        if after < len(self.starts) and self.starts[after] - offset < radius:
+            candidates.append(after)
+        return min(candidates) if candidates else None
+
+    def within(self, offset: int, radius: int, containing: bool = False) -> range:
+        """
+        시작 위치가 offset에서 radius 미만으로 떨어진 단어들의 인덱스 범위 (위치 순)
+        containing이면 offset을 포함하지만 더 앞에서 시작하는 단어도 범위에 넣습니다.
+        """
+        first = bisect_right(self.starts, offset - radius)
+        # 단어는 겹치지 않으므로 범위 밖에서 offset을 포함할 수 있는 단어는 바로 앞 단어뿐
+        if containing and first and offset < self.ends[first - 1]:
+            first -= 1
+        return range(first, bisect_left(self.starts, offset + radius))
+
+    def nearest(self, offset: int, word: str = None):
+        """
+        시작 위치가 offset에 가장 가까운 단어의 (인덱스, 거리)
+        word를 주면 해당 형태의 단어 중에서만 찾습니다. 거리가 같으면 앞쪽 단어를 반환하며, 없으면 (None, inf)
+        """
+        if word is None:
+            indices = None
+            starts = self.starts
+        else:
+            indices = self._positions.get(word)
+            if not indices:
+                return None, float('inf')
+            starts = self._surface_starts.get(word)
+            if starts is None:
+                starts = self._surface_starts[word] = [self.starts[i] for i in indices]
+
+        if not starts:
+            return None, float('inf')
+
+        k = bisect_left(starts, offset)
+        best = None
+        best_distance = float('inf')
+        # 앞쪽 후보를 먼저 확인하여 거리가 같으면 앞쪽 단어 선택
+        for pos in (k - 1, k):
+            if 0 <= pos < len(starts):
+                distance = abs(starts[pos] - offset)
+                if distance < best_distance:
+                    best = pos
+                    best_distance = distance
+
+        return (best if indices is None else indices[best]), best_distance
+
+    def _normalize(self, strip_chars: str) -> tuple:
+        """strip_chars의 문자를 모두 제거한 텍스트와, 그 텍스트에서 각 단어의 시작/끝 위치"""
+        cached = self._normalized.get(strip_chars)
+        if cached is not None:
+            return cached
+
+        table = {ord(char): None for char in strip_chars}
+        parts = []
+        norm_starts = []
+        norm_ends = []
+        pos = 0
+        prev_end = 0
+        for word, start, end in zip(self.words, self.starts, self.ends):
+            gap = self.text[prev_end:start].translate(table)
+            word = word.translate(table)
+            parts.append(gap)
+            parts.append(word)
+            pos += len(gap)
+            norm_starts.append(pos)
+            pos += len(word)
+            norm_ends.append(pos)
+            prev_end = end
+
+        cached = self._normalized[strip_chars] = (''.join(parts), norm_starts, norm_ends)
+        return cached
+
+    def find_joined(self, target: str, first: int, strip_chars: str, max_words: int = 6):
+        """
+        first번째 단어부터 차례로, i번째부터 j번째(i < j < i + max_words)까지 이어진 원본 구간에서
+        strip_chars의 문자를 제거한 결과가 target과 같은 첫 번째 (i, j) (없으면 None)
+        단어마다 구간을 잘라 비교하지 않고, 문자를 제거한 텍스트에서 target이 나오는 위치만 확인합니다.
+        """
+        if first >= len(self.words):
+            return None
+
+        normalized, norm_starts, norm_ends = self._normalize(strip_chars)
+        pos = norm_starts[first]
+        while True:
+            found = normalized.find(target, pos)
+            if found == -1:
+                return None
+
+            # target이 단어 시작에서 시작해 단어 끝에서 끝나는 경우만 일치
+            end = found + len(target)
+            i = bisect_left(norm_starts, found, first)
+            while i < len(norm_starts) and norm_starts[i] == found:
+                for j in range(i + 1, min(i + max_words, len(norm_ends))):
+                    if norm_ends[j] == end:
+                        return i, j
+                    if norm_ends[j] > end:
+                        break
+                i += 1
+            pos = found + 1
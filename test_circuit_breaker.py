@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""server/circuit_breaker.py 단위 테스트 (가짜 시계 사용, 네트워크 불필요)
+
+    python3 -m pytest test_circuit_breaker.py
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def make_breaker(clock, **options):
+    params = dict(window=4, min_calls=4, failure_rate=0.5, slow_call_seconds=3.0, slow_call_rate=0.75,
+                  open_seconds=30.0, half_open_calls=2, enabled=True, clock=clock)
+    params.update(options)
+    return CircuitBreaker('테스트', **params)
+
+
+def call(breaker, success=True, duration=0.1):
+    breaker.record(breaker.before_call(), success, duration)
+
+
+def trip(breaker):
+    for _ in range(4):
+        call(breaker, success=False)
+    assert breaker.state == OPEN
+
+
+def test_stays_closed_below_min_calls():
+    breaker = make_breaker(FakeClock())
+    for _ in range(3):
+        call(breaker, success=False)
+    assert breaker.state == CLOSED
+
+
+def test_failure_rate_threshold_opens():
+    breaker = make_breaker(FakeClock())
+    call(breaker)
+    call(breaker)
+    call(breaker, success=False)
+    assert breaker.state == CLOSED
+    call(breaker, success=False)
+    assert breaker.state == OPEN
+    assert breaker.stats()['opened'] == 1
+
+
+def test_failure_rate_uses_recent_window_only():
+    breaker = make_breaker(FakeClock())
+    call(breaker, success=False)
+    for _ in range(4):
+        call(breaker)
+    # 첫 실패는 창에서 밀려나 실패율 계산에 포함되지 않음
+    call(breaker, success=False)
+    assert breaker.state == CLOSED
+    assert breaker.stats()['failureRate'] == 0.25
+
+
+def test_slow_call_rate_threshold_opens():
+    breaker = make_breaker(FakeClock())
+    for _ in range(2):
+        call(breaker, duration=3.0)
+    call(breaker)
+    call(breaker, duration=5.0)
+    assert breaker.state == OPEN
+
+
+def test_open_rejects_without_calling():
+    breaker = make_breaker(FakeClock())
+    trip(breaker)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.fail_fast()
+    assert breaker.stats()['rejected'] == 2
+
+
+def test_cooldown_moves_to_half_open():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.advance(29.9)
+    assert breaker.state == OPEN
+    clock.advance(0.1)
+    assert breaker.state == HALF_OPEN
+
+
+def test_half_open_limits_probes():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.advance(30)
+    breaker.before_call()
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.fail_fast()
+
+
+def test_fail_fast_does_not_consume_probe():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.advance(30)
+    for _ in range(3):
+        breaker.fail_fast()
+    breaker.before_call()
+    breaker.before_call()
+    assert breaker.stats()['rejected'] == 0
+
+
+def test_probe_successes_close():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.advance(30)
+    call(breaker)
+    assert breaker.state == HALF_OPEN
+    call(breaker)
+    assert breaker.state == CLOSED
+    assert breaker.stats()['recentCalls'] == 0
+
+
+@pytest.mark.parametrize('success, duration', [(False, 0.1), (True, 3.0)])
+def test_failed_or_slow_probe_reopens(success, duration):
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    trip(breaker)
+    clock.advance(30)
+    call(breaker)
+    call(breaker, success=success, duration=duration)
+    assert breaker.state == OPEN
+    assert breaker.stats()['opened'] == 2
+    # 다시 연 시점부터 차단 시간을 계산
+    clock.advance(29)
+    assert breaker.state == OPEN
+    clock.advance(1)
+    assert breaker.state == HALF_OPEN
+
+
+def test_result_from_previous_state_is_ignored():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    stale = breaker.before_call()
+    trip(breaker)
+    clock.advance(30)
+    breaker.record(stale, False, 0.1)
+    assert breaker.state == HALF_OPEN
+
+
+def test_disabled_always_allows():
+    breaker = make_breaker(FakeClock(), enabled=False)
+    for _ in range(10):
+        call(breaker, success=False)
+    breaker.fail_fast()
+    assert breaker.state == CLOSED
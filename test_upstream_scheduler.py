@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""server/upstream_scheduler.py 단위 테스트 (가짜 시계 사용, 네트워크 불필요)
+
+    python3 -m pytest test_upstream_scheduler.py
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+
+import upstream_scheduler  # noqa: E402
+from upstream_scheduler import RateLimiter, RequestCoalescer, UpstreamQueueFull  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    # acquire()의 대기는 실제로 자지 않고 가짜 시계만 진행
+    monkeypatch.setattr(upstream_scheduler.time, 'sleep', clock.advance)
+    return clock
+
+
+def make_limiter(clock, **options):
+    params = dict(rate=4.0, burst=2, max_queue=2, max_wait=1.0, clock=clock)
+    params.update(options)
+    return RateLimiter(**params)
+
+
+# --- RateLimiter ---
+
+def test_burst_passes_without_waiting(clock):
+    limiter = make_limiter(clock)
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == 0.0
+    assert limiter.stats()['delayed'] == 0
+
+
+def test_empty_bucket_waits_for_next_token(clock):
+    limiter = make_limiter(clock)
+    limiter.acquire()
+    limiter.acquire()
+    assert limiter.acquire() == pytest.approx(0.25)
+    assert clock.now == pytest.approx(1000.25)
+    stats = limiter.stats()
+    assert (stats['acquired'], stats['delayed'], stats['waiting']) == (3, 1, 0)
+
+
+def test_bucket_refills_at_rate(clock):
+    limiter = make_limiter(clock)
+    limiter.acquire()
+    limiter.acquire()
+    clock.advance(0.25)
+    assert limiter.acquire() == 0.0
+    clock.advance(0.125)
+    assert limiter.acquire() == pytest.approx(0.125)
+
+
+def test_refill_is_capped_at_burst(clock):
+    limiter = make_limiter(clock)
+    clock.advance(60)
+    assert [limiter.acquire() for _ in range(2)] == [0.0, 0.0]
+    assert limiter.acquire() == pytest.approx(0.25)
+
+
+def test_waiting_calls_are_scheduled_in_order(clock):
+    limiter = make_limiter(clock, max_wait=10)
+    limiter.acquire()
+    limiter.acquire()
+    # 대기 중인 호출은 앞선 예약 뒤로 차례대로 밀림
+    assert limiter._reserve() == pytest.approx(0.25)
+    assert limiter._reserve() == pytest.approx(0.5)
+
+
+def test_rejected_when_queue_is_full(clock):
+    limiter = make_limiter(clock, max_wait=10)
+    limiter.acquire()
+    limiter.acquire()
+    limiter._reserve()
+    limiter._reserve()
+    with pytest.raises(UpstreamQueueFull):
+        limiter._reserve()
+    stats = limiter.stats()
+    assert (stats['waiting'], stats['rejected'], stats['acquired']) == (2, 1, 4)
+
+
+def test_rejected_when_wait_exceeds_max_wait(clock):
+    limiter = make_limiter(clock, max_queue=100, max_wait=0.3)
+    limiter.acquire()
+    limiter.acquire()
+    limiter._reserve()
+    with pytest.raises(UpstreamQueueFull):
+        limiter._reserve()
+    assert limiter.stats()['rejected'] == 1
+
+
+def test_zero_rate_is_unlimited(clock):
+    limiter = make_limiter(clock, rate=0)
+    assert all(limiter.acquire() == 0.0 for _ in range(100))
+
+
+def test_acquire_async_waits_without_blocking():
+    limiter = RateLimiter(rate=100, burst=1, max_queue=5, max_wait=1, clock=FakeClock())
+
+    async def main():
+        return await asyncio.gather(*(limiter.acquire_async() for _ in range(3)))
+
+    delays = asyncio.run(main())
+    assert delays == pytest.approx([0.0, 0.01, 0.02])
+    assert limiter.stats()['waiting'] == 0
+
+
+# --- RequestCoalescer (스레드) ---
+
+def run_with_followers(coalescer, func, followers=3):
+    """func를 실행하는 요청 하나와 같은 키로 기다리는 요청 followers개를 동시에 실행하고 결과 목록 반환"""
+    release = threading.Event()
+    calls = []
+
+    def leader_func():
+        calls.append(1)
+        release.wait(5)
+        return func()
+
+    results = []
+
+    def request():
+        try:
+            results.append(coalescer.run('key', leader_func))
+        except Exception as e:
+            results.append(e)
+
+    threads = [threading.Thread(target=request) for _ in range(followers + 1)]
+    threads[0].start()
+    while coalescer.stats()['inFlight'] == 0:
+        time.sleep(0.001)
+    for thread in threads[1:]:
+        thread.start()
+    while coalescer.coalesced < followers:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    return results
+
+
+def test_followers_receive_leader_result():
+    coalescer = RequestCoalescer()
+    results = run_with_followers(coalescer, lambda: 'checked')
+    assert results == ['checked'] * 4
+    assert coalescer.stats() == {'inFlight': 0, 'leaders': 1, 'coalesced': 3}
+
+
+def test_followers_receive_leader_exception():
+    coalescer = RequestCoalescer()
+    error = ValueError('upstream')
+
+    def fail():
+        raise error
+
+    results = run_with_followers(coalescer, fail)
+    assert results == [error] * 4
+    assert coalescer.stats()['inFlight'] == 0
+    # 작업이 끝나면 같은 키로 다시 실행
+    assert coalescer.run('key', lambda: 'again') == 'again'
+
+
+# --- RequestCoalescer (asyncio) ---
+
+def test_async_followers_receive_leader_result():
+    coalescer = RequestCoalescer()
+    calls = []
+
+    async def check(text):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        return text.upper()
+
+    async def main():
+        return await asyncio.gather(*(coalescer.run_async('key', check, 'abc') for _ in range(4)))
+
+    assert asyncio.run(main()) == ['ABC'] * 4
+    assert calls == ['abc']
+    assert coalescer.stats() == {'inFlight': 0, 'leaders': 1, 'coalesced': 3}
+
+
+def test_async_followers_receive_leader_exception():
+    coalescer = RequestCoalescer()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError('upstream')
+
+    async def main():
+        return await asyncio.gather(*(coalescer.run_async('key', fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert results[0] is results[1] is results[2]
+    assert coalescer.stats()['inFlight'] == 0
+
+
+def test_async_cancelled_leader_does_not_cancel_followers():
+    coalescer = RequestCoalescer()
+    calls = []
+
+    async def check():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return 'checked'
+
+    async def main():
+        leader = asyncio.create_task(coalescer.run_async('key', check))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(coalescer.run_async('key', check)) for _ in range(2)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    assert asyncio.run(main()) == ['checked', 'checked']
+    assert calls == [1]
+    assert coalescer.stats()['inFlight'] == 0